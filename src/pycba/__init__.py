@@ -13,3 +13,4 @@ from .utils import *
 from .bridge import *
 from .vehicle import *
 from .pattern import *
+from .wim import *
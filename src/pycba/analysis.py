@@ -5,12 +5,17 @@ An OO Python adaptation of the CBA, originally written for Matlab here:
 http://www.colincaprani.com/programming/matlab/
 """
 
-from typing import Union, Optional
+from typing import Union, Optional, List
 import numpy as np
 import matplotlib.pyplot as plt
+from scipy.linalg import lapack
 from .beam import Beam, LoadMatrix
-from .results import BeamResults
-from .load import add_LM
+from .results import BeamResults, BatchResults
+from .load import add_LM, LoadTable
+
+# Half-bandwidth of the global stiffness matrix: each member couples 4 DOFs
+BANDWIDTH = 3
+SOLVERS = ("dense", "banded")
 
 
 class BeamAnalysis:
@@ -25,6 +30,7 @@ class BeamAnalysis:
         R: np.ndarray,
         LM: Optional[LoadMatrix] = None,
         eletype: Optional[np.ndarray] = None,
+        solver: str = "dense",
     ):
         """
         Constructs a beam analysis object given the structural information necessary.
@@ -42,14 +48,32 @@ class BeamAnalysis:
             The load matrix: a list of loads on the beam; each load with several parameters.
         eletype : Optional[np.ndarray]
             A vector of the member types. Defaults to a fixed-fixed element.
+        solver : str
+            The linear solver backend, one of:
+
+                - **dense**: full `nDOF x nDOF` stiffness matrix (default)
+                - **banded**: LAPACK banded storage, O(n) in time and memory,
+                  suitable for beams with very many spans
+
+        Raises
+        ------
+        ValueError
+            If the solver is not recognised.
 
         Returns
         -------
         None.
 
         """
+        if solver not in SOLVERS:
+            raise ValueError(f"Solver must be one of {SOLVERS}")
+        self.solver = solver
         self.npts = 100
         self._beam_results = None
+        # Cached factorization of the free-free stiffness, and its key
+        self._kff_lu = None
+        self._k_react = None
+        self._factor_key = None
 
         if eletype is None:
             self.eletype = np.ones((len(L), 1))
@@ -175,7 +199,12 @@ class BeamAnalysis:
         load = [i_span, 4, m, a]
         self._beam.add_load(load)
 
-    def analyze(self, npts: Optional[int] = None) -> int:
+    def analyze(
+        self,
+        npts: Optional[int] = None,
+        ends: bool = True,
+        spans: Optional[List[int]] = None,
+    ) -> int:
         """
         Conducts the analysis on the constructed BeamAnalysis object
 
@@ -183,6 +212,19 @@ class BeamAnalysis:
         ----------
         npts : Optional[int]
             The number of evaluation points along a member for load effects.
+        ends : bool, optional
+            Whether or not to keep the duplicated sample points at each member end
+            in the results. The default is True.
+        spans : Optional[List[int]], optional
+            The indices (0-based) of the members for which the load effects are to
+            be calculated, when they are first accessed. The nodal displacements
+            and reactions are always found for the whole beam. The default is None,
+            for all members.
+
+        Raises
+        ------
+        ValueError
+            If a span index is not on the beam, or is repeated.
 
         Returns
         -------
@@ -192,17 +234,138 @@ class BeamAnalysis:
         if npts and npts > 3:
             self.npts = npts
 
-        fU = self._forces()
-        f = np.copy(fU)
-        ksysU = self._assemble()
-        ksys = np.copy(ksysU)
-        ksys, f = self._apply_bc(ksys, f)
-        d = self._solver(ksys, f)
-        r = self._reactions(ksysU, d, fU)
+        f = self._forces()
+        self._factorize()
+        d = self._solve_free(f)
+        r = self._reactions(d, f)
 
-        self._beam_results = BeamResults(self._beam, d, r, self.npts)
+        self._beam_results = BeamResults(
+            self._beam, d, r, self.npts, spans=spans, ends=ends
+        )
         return 0
 
+    def analyze_many(
+        self, LMs: List[LoadMatrix], npts: Optional[int] = None
+    ) -> BatchResults:
+        """
+        Conducts the analysis of many load cases on the constructed BeamAnalysis
+        object at once: the force vectors of all cases are solved as one
+        multiple right-hand side system with the cached stiffness factorization.
+
+        The loads of the beam itself are not changed, and the results are not
+        stored in :attr:`beam_results`.
+
+        Parameters
+        ----------
+        LMs : List[LoadMatrix]
+            The load matrices, one for each load case.
+        npts : Optional[int]
+            The number of evaluation points along a member for load effects.
+
+        Raises
+        ------
+        ValueError
+            If no load cases are given.
+
+        Returns
+        -------
+        BatchResults
+            The stacked results of all load cases; a
+            :class:`pycba.results.BatchResults` object.
+        """
+        if len(LMs) == 0:
+            raise ValueError("At least one load case is required")
+        if npts and npts > 3:
+            self.npts = npts
+
+        self._factorize()
+        table = LoadTable(LMs, self._n)
+        F = self._case_forces(table)
+        D = self._solve_free(F)
+        R = self._reactions(D, F)
+
+        return BatchResults(self._beam, D.T, R.T, table, self.npts)
+
+    def _case_forces(self, table: LoadTable) -> np.ndarray:
+        """
+        Construct the nodal force vectors for each load case of a load table,
+        independently of the loads defined on the beam
+
+        Parameters
+        ----------
+        table : LoadTable
+            The compiled loads of the load cases
+
+        Returns
+        -------
+        F : np.ndarray
+            The `(nDOF, ncases)` matrix of global nodal force vectors
+        """
+        ncases = table.no_cases
+        ref = table.get_ref(self._beam.mbr_lengths, self._beam.mbr_eletype)
+        # Scatter-add to the DOFs of the span of each load, for its load case
+        dof = 2 * table.span[:, np.newaxis] + np.arange(4)
+        idx = (dof * ncases + table.case[:, np.newaxis]).ravel()
+        F = np.bincount(idx, weights=ref.ravel(), minlength=self._nDOF * ncases)
+        # Cumulatively apply forces in opposite direction
+        return -F.reshape(self._nDOF, ncases)
+
+    def _factorize(self):
+        """
+        Assemble and factor (LU) the free-free block of the stiffness matrix,
+        unless the cached factorization is still valid. The cache is keyed on the
+        solver and the :attr:`pycba.beam.Beam.fingerprint`, so it is invalidated
+        by any change to the spans, EI, restraints, or element types; a change of
+        loads only requires a forward/back substitution.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        """
+        key = (self.solver, self._beam.fingerprint)
+        if key == self._factor_key:
+            return
+
+        self._n = self._beam.no_spans
+        self._no_nodes = self._n + 1
+        self._nDOF = 2 * self._no_nodes
+
+        # The partition from the same restraints as the fingerprint, in case
+        # these were changed in place rather than through the setter
+        self._beam._set_dof_partition()
+
+        if self.solver == "banded":
+            ksys = self._assemble_banded()
+            kff = self._partition_banded(ksys)
+            # gbtrf needs BANDWIDTH extra rows for the fill-in of the LU factors
+            ab = np.zeros((3 * BANDWIDTH + 1, kff.shape[1]))
+            ab[BANDWIDTH:] = kff
+            # Unrestricted stiffness is retained for the reactions
+            self._k_react = ksys
+        else:
+            ksys = self._assemble()
+            kff, krf = self._partition(ksys)
+            self._k_react = krf
+
+        # With no free DOFs there is nothing to factorize (or solve)
+        lu, piv, info = np.zeros((0, 0)), np.zeros(0, dtype=np.int32), 0
+        if len(self._beam.free_dofs) > 0:
+            if self.solver == "banded":
+                lu, piv, info = lapack.dgbtrf(ab, BANDWIDTH, BANDWIDTH)
+            else:
+                lu, piv, info = lapack.dgetrf(kff)
+        if info > 0:
+            raise np.linalg.LinAlgError("Singular matrix")
+        elif info < 0:
+            raise ValueError(f"Illegal argument {-info} to the LU factorization")
+
+        self._kff_lu = (lu, piv)
+        self._factor_key = key
+
     def _forces(self) -> np.ndarray:
         """
         Construct the nodal force vector
@@ -218,15 +381,7 @@ class BeamAnalysis:
 
         """
         self._beam._set_loads()
-
-        f = np.zeros(self._nDOF)
-
-        for i in range(self._n):
-            dof_i = 2 * i
-            fmbr = self._beam.get_ref(i)
-            # Cumulatively apply forces in opposite direction
-            f[dof_i : dof_i + 4] -= fmbr
-        return f
+        return self._case_forces(self._beam.load_table)[:, 0]
 
     def _assemble(self) -> np.ndarray:
         """
@@ -242,56 +397,130 @@ class BeamAnalysis:
             The global stiffness matrix
 
         """
-        ksys = np.zeros((self._nDOF, self._nDOF))
-
-        for i in range(self._n):
-            kb = self._beam.get_span_k(i)
-            dof_i = 2 * i
-            ksys[dof_i : dof_i + 4, dof_i : dof_i + 4] += kb
+        n = self._nDOF
+
+        # Flat global index of each member matrix entry, to scatter-add them all
+        dof = 2 * np.arange(self._n)[:, np.newaxis, np.newaxis]
+        ii, jj = np.indices((4, 4))
+        idx = ((dof + ii) * n + dof + jj).ravel()
+        kb = self._beam.get_element_k().ravel()
+        ksys = np.bincount(idx, weights=kb, minlength=n * n).reshape(n, n)
         return ksys
 
-    def _apply_bc(self, k: np.ndarray, f: np.ndarray) -> (np.ndarray, np.ndarray):
+    def _assemble_banded(self) -> np.ndarray:
+        """
+        Construct the unrestricted global stiffness matrix directly in LAPACK
+        banded storage, so that `ab[u + i - j, j] = k[i, j]`, where `u` is the
+        half-bandwidth.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        ab : np.ndarray
+            The global stiffness matrix in banded storage, `(2u + 1) x nDOF`
+        """
+        u = BANDWIDTH
+        n = self._nDOF
+
+        # Flat banded index of each member matrix entry, to scatter-add them all
+        dof = 2 * np.arange(self._n)[:, np.newaxis, np.newaxis]
+        ii, jj = np.indices((4, 4))
+        idx = ((u + ii - jj) * n + dof + jj).ravel()
+        kb = self._beam.get_element_k().ravel()
+        ab = np.bincount(idx, weights=kb, minlength=(2 * u + 1) * n)
+        return ab.reshape(2 * u + 1, n)
+
+    def _partition(self, k: np.ndarray) -> (np.ndarray, np.ndarray):
         """
-        Apply the boundary conditions
+        Partition the unrestricted global stiffness matrix into the blocks
+        needed to solve for the free DOFs and recover the reactions, adding any
+        spring supports to the free-free block.
 
         Parameters
         ----------
         k : np.ndarray
             The unrestricted global stiffness matrix
-        f : np.ndarray
-            The global force vector
 
         Returns
         -------
-        k : np.ndarray
-            The restricted global stiffness matrix
+        kff : np.ndarray
+            The free-free block of the stiffness matrix, including springs
+        krf : np.ndarray
+            The restrained-free block of the stiffness matrix
+        """
+        free = self._beam.free_dofs
+        fixed = self._beam.fixed_dofs
+
+        kff = k[np.ix_(free, free)]
+        kff[np.diag_indices_from(kff)] += self._beam.springs
+        krf = k[np.ix_(fixed, free)]
+        return kff, krf
+
+    def _partition_banded(self, ab: np.ndarray) -> np.ndarray:
+        """
+        Extract the free-free block of a stiffness matrix in banded storage,
+        adding any spring supports. Removing restrained DOFs cannot increase the
+        bandwidth, so the block is returned in the same banded storage.
+
+        Parameters
+        ----------
+        ab : np.ndarray
+            The unrestricted global stiffness matrix in banded storage
+
+        Returns
+        -------
+        ab_ff : np.ndarray
+            The free-free block of the stiffness matrix in banded storage
+        """
+        u = BANDWIDTH
+        free = self._beam.free_dofs
+        nf = len(free)
+        ab_ff = np.zeros((2 * u + 1, nf))
+
+        for offset in range(-u, u + 1):
+            # Entry (q + offset, q) of the block, in the full matrix diagonal...
+            q = np.arange(max(0, -offset), min(nf, nf - offset))
+            diag = free[q + offset] - free[q]
+            # ... which is only stored if within the band
+            valid = np.abs(diag) <= u
+            q = q[valid]
+            ab_ff[u + offset, q] = ab[u + diag[valid], free[q]]
+
+        ab_ff[u] += self._beam.springs
+        return ab_ff
+
+    def _solve_free(self, f: np.ndarray) -> np.ndarray:
+        """
+        Solve for the free DOFs using the cached factorization, and expand to the
+        global nodal displacement vector, in which the fully-restrained DOFs are
+        zero.
+
+        Parameters
+        ----------
         f : np.ndarray
-            The force vector with boundary conditions imposed
-        """
-        r = self._beam.restraints
-        for i in range(self._nDOF):
-            # Negative means fully restrained
-            if r[i] < 0:
-                # Set off diagonals to zero
-                for j in range(self._nDOF):
-                    k[i][j] = 0
-                    k[j][i] = 0
-                # Set diagonal to 1 and the force to 0
-                k[i][i] = 1
-                f[i] = 0
-            elif r[i] > 0:
-                # Positive means spring support so add the stiffness
-                k[i][i] += r[i]
-        return k, f
-
-    def _reactions(self, k: np.ndarray, d: np.ndarray, f: np.ndarray) -> np.ndarray:
-        """
-        Calculate the reactions
+            The global nodal force vector, or a matrix of force vectors in columns
+
+        Returns
+        -------
+        d : np.ndarray
+            The global nodal displacement vector, or matrix of vectors
+        """
+        free = self._beam.free_dofs
+        d = np.zeros(f.shape)
+        if len(free) == 0:
+            return d
+        d[free] = self._solver(f[free])
+        return d
+
+    def _reactions(self, d: np.ndarray, f: np.ndarray) -> np.ndarray:
+        """
+        Calculate the reactions, :math:`K_{rf} d_f - f_r`
 
         Parameters
         ----------
-        k : np.ndarray
-            The unrestricted global stiffness matrix
         d : np.ndarray
             The global nodal displacement vector
         f : np.ndarray
@@ -301,34 +530,39 @@ class BeamAnalysis:
         -------
         r : np.ndarray
             The reactions corresponding to full restraints
-        """
-        r = k @ d
-        r -= f
-        r2 = []
 
-        # Report reactions corresponding to full restraints
-        for i in range(self._nDOF):
-            if self._beam.restraints[i] < 0:
-                r2.append(r[i])
-        return np.array(r2)
+        Both `d` and `f` may also be matrices of vectors in columns, in which case
+        so are the reactions.
+        """
+        free = self._beam.free_dofs
+        fixed = self._beam.fixed_dofs
+        if self.solver == "banded":
+            # Since d is zero at the restraints, this is K_rf @ d_f at those rows
+            r = banded_matvec(self._k_react, d, BANDWIDTH, BANDWIDTH)[fixed]
+        else:
+            r = self._k_react @ d[free]
+        return r - f[fixed]
 
-    def _solver(self, A: np.ndarray, b: np.ndarray) -> np.ndarray:
+    def _solver(self, b: np.ndarray) -> np.ndarray:
         """
-        Solves the matrix equation
+        Solves the matrix equation for the free DOFs by forward/back substitution
+        with the cached factorization
 
         Parameters
         ----------
-        A : np.ndarray
-            The restricted global stiffness matrix
         b : np.ndarray
-            The restricted force vector
+            The force vector for the free DOFs
 
         Returns
         -------
         x : np.ndarray
-            The nodal displacements
+            The nodal displacements of the free DOFs
         """
-        x = np.linalg.solve(A, b)
+        lu, piv = self._kff_lu
+        if self.solver == "banded":
+            x, info = lapack.dgbtrs(lu, BANDWIDTH, BANDWIDTH, b, piv)
+        else:
+            x, info = lapack.dgetrs(lu, piv, b)
         return x
 
     def plot_results(self):
@@ -370,3 +604,39 @@ class BeamAnalysis:
         ax.set_xlabel("Distance along beam (m)")
 
         plt.show()
+
+
+def banded_matvec(ab: np.ndarray, x: np.ndarray, l: int, u: int) -> np.ndarray:
+    """
+    Multiplies a matrix in LAPACK banded storage by a vector, without forming
+    the dense matrix.
+
+    Parameters
+    ----------
+    ab : np.ndarray
+        The matrix in banded storage, `(l + u + 1) x n`, so that
+        `ab[u + i - j, j] = a[i, j]`.
+    x : np.ndarray
+        The vector of length `n`, or a matrix of `n` rows.
+    l : int
+        The number of sub-diagonals.
+    u : int
+        The number of super-diagonals.
+
+    Returns
+    -------
+    y : np.ndarray
+        The product `a @ x`.
+    """
+    n = ab.shape[1]
+    y = np.zeros(x.shape)
+    for offset in range(-u, l + 1):
+        # Diagonal `offset` holds a[j + offset, j]
+        band = ab[u + offset]
+        if x.ndim > 1:
+            band = band[:, np.newaxis]
+        if offset >= 0:
+            y[offset:] += band[: n - offset] * x[: n - offset]
+        else:
+            y[: n + offset] += band[-offset:] * x[-offset:]
+    return y
@@ -1,9 +1,50 @@
 """
 PyCBA - Beam Class definition
 """
-from typing import Optional
+from typing import Optional, List
+import hashlib
 import numpy as np
-from .load import parse_LM, LoadType, LoadMatrix, LoadCNL
+from .load import LoadTable, Load, LoadType, LoadMatrix, LoadCNL
+
+# Element stiffness matrices are assembled as sum_j c_j * EI / L**p_j * T_j, with
+# the coefficients c_j and 4x4 templates T_j for each element type (1-4), and
+# j indexing the shear-translation, shear-rotation, moment-rotation, and
+# carry-over moment-rotation terms respectively.
+_K_POWERS = np.array([3, 2, 1, 1])
+_K_COEFFS = np.array(
+    [
+        [0, 0, 0, 0],  # unused
+        [12, 6, 4, 2],  # fixed-fixed
+        [3, 3, 3, 0],  # fixed-pinned
+        [3, 3, 3, 0],  # pinned-fixed
+        [0, 0, 0, 0],  # pinned-pinned
+    ]
+)
+_K_FV = np.array([[1, 0, -1, 0], [0, 0, 0, 0], [-1, 0, 1, 0], [0, 0, 0, 0]])
+_K_TEMPLATES = np.array(
+    [
+        np.zeros((4, 4, 4)),
+        [
+            _K_FV,
+            [[0, 1, 0, 1], [1, 0, -1, 0], [0, -1, 0, -1], [1, 0, -1, 0]],
+            [[0, 0, 0, 0], [0, 1, 0, 0], [0, 0, 0, 0], [0, 0, 0, 1]],
+            [[0, 0, 0, 0], [0, 0, 0, 1], [0, 0, 0, 0], [0, 1, 0, 0]],
+        ],
+        [
+            _K_FV,
+            [[0, 1, 0, 0], [1, 0, -1, 0], [0, -1, 0, 0], [0, 0, 0, 0]],
+            [[0, 0, 0, 0], [0, 1, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0]],
+            np.zeros((4, 4)),
+        ],
+        [
+            _K_FV,
+            [[0, 0, 0, 1], [0, 0, 0, 0], [0, 0, 0, -1], [1, 0, -1, 0]],
+            [[0, 0, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0], [0, 0, 0, 1]],
+            np.zeros((4, 4)),
+        ],
+        np.zeros((4, 4, 4)),
+    ]
+)
 
 
 class Beam:
@@ -44,27 +85,31 @@ class Beam:
         self._no_spans = 0
         self._no_restraints = 0
         self._length = 0
-        self.mbr_lengths = []
-        self.mbr_EIs = []
-        self.mbr_eletype = []
+        self.mbr_lengths = np.array([], dtype=float)
+        self.mbr_EIs = np.array([], dtype=float)
+        self.mbr_eletype = np.array([], dtype=int)
         self._restraints = []
-        self._loads = []
+        self._free_dofs = np.array([], dtype=int)
+        self._fixed_dofs = np.array([], dtype=int)
+        self._load_table = LoadTable([], 0)
         self.LM = []
-        self._terminal_coords = [0.0]
+        self._terminal_coords = np.zeros(1)
 
         if L is not None and eletype is not None:
+            L = np.asarray(L, dtype=float).ravel()
             # scalar EI - same for all spans
-            if isinstance(EI, float):
-                for l, et in zip(L, eletype):
-                    self.add_span(l, EI, et)
-            else:
-                if len(L) == len(EI):
-                    for l, ei, et in zip(L, EI, eletype):
-                        self.add_span(l, ei, et)
-                else:
-                    raise ValueError("Define EI for each span")
+            if np.ndim(EI) == 0:
+                EI = EI * np.ones(len(L))
+            elif len(L) != len(EI):
+                raise ValueError("Define EI for each span")
+            self.mbr_lengths = L
+            self.mbr_EIs = np.asarray(EI, dtype=float).ravel()
+            self.mbr_eletype = np.asarray(eletype).ravel().astype(int)
+            self._no_spans = len(L)
+            self._terminal_coords = np.concatenate(([0.0], np.cumsum(L)))
+            self._length = self._terminal_coords[-1]
             if len(R) == 2 * len(L) + 2:
-                self._restraints = R
+                self.restraints = R
             else:
                 raise ValueError("Insufficient restraints defined")
         if LM is not None:
@@ -88,12 +133,14 @@ class Beam:
         None.
 
         """
-        self.mbr_lengths.append(L)
-        self.mbr_EIs.append(EI)
-        self.mbr_eletype.append(eletype)
+        self.mbr_lengths = np.append(self.mbr_lengths, L)
+        self.mbr_EIs = np.append(self.mbr_EIs, EI)
+        self.mbr_eletype = np.append(self.mbr_eletype, np.asarray(eletype, dtype=int))
         self._no_spans = len(self.mbr_lengths)
         self._length += L
-        self._terminal_coords.append(self._terminal_coords[-1] + L)
+        self._terminal_coords = np.append(
+            self._terminal_coords, self._terminal_coords[-1] + L
+        )
 
     @property
     def loads(self) -> LoadMatrix:
@@ -145,19 +192,57 @@ class Beam:
 
     def _set_loads(self):
         """
-        Explicit internal setter for loads
+        Explicit internal setter for loads: compiles the load matrix into a
+        :class:`pycba.load.LoadTable`
 
         Parameters
         -------
-        LM : LoadMatrix
-            The load matrix for the beam
+        None
 
         Returns
         -------
         None
 
         """
-        self._loads = parse_LM(self.LM)
+        self._load_table = LoadTable.from_LM(self.LM, self.no_spans)
+
+    @property
+    def load_table(self) -> LoadTable:
+        """
+        Returns the compiled load table of the most recent analysis
+
+        Returns
+        -------
+        load_table : LoadTable
+            The :class:`pycba.load.LoadTable` of the beam loads
+        """
+        return self._load_table
+
+    @property
+    def _loads(self) -> List[Load]:
+        """
+        The :class:`pycba.load.Load` objects of all the compiled loads, grouped
+        by span
+        """
+        return [
+            load for i in range(self.no_spans) for load in self.get_span_loads(i)
+        ]
+
+    def get_span_loads(self, i_span: int) -> List[Load]:
+        """
+        Returns the :class:`pycba.load.Load` objects for the loads on a span
+
+        Parameters
+        ----------
+        i_span : int
+            The index (0-based) of the span
+
+        Returns
+        -------
+        loads : List[Load]
+            A list of Load objects
+        """
+        return self._load_table.get_loads(i_span)
 
     @property
     def restraints(self) -> np.ndarray:
@@ -188,7 +273,65 @@ class Beam:
 
         """
         self._restraints = r
-        pass
+        self._set_dof_partition()
+
+    def _set_dof_partition(self):
+        """
+        Partitions the degrees of freedom into those that are free (including
+        spring supports) and those that are fully restrained.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        """
+        r = np.asarray(self._restraints, dtype=float)
+        # Negative means fully restrained
+        self._fixed_dofs = np.flatnonzero(r < 0)
+        self._free_dofs = np.flatnonzero(r >= 0)
+
+    @property
+    def free_dofs(self) -> np.ndarray:
+        """
+        Returns the indices of the free degrees of freedom, including those with
+        spring supports
+
+        Returns
+        -------
+        free_dofs : np.ndarray
+            The indices of the unrestrained DOFs
+        """
+        return self._free_dofs
+
+    @property
+    def fixed_dofs(self) -> np.ndarray:
+        """
+        Returns the indices of the fully-restrained degrees of freedom, in the
+        order of the reactions vector
+
+        Returns
+        -------
+        fixed_dofs : np.ndarray
+            The indices of the fully-restrained DOFs
+        """
+        return self._fixed_dofs
+
+    @property
+    def springs(self) -> np.ndarray:
+        """
+        Returns the spring stiffness at each of the free degrees of freedom,
+        zero where there is no spring
+
+        Returns
+        -------
+        springs : np.ndarray
+            The vector of spring stiffnesses for the free DOFs
+        """
+        r = np.asarray(self._restraints, dtype=float)[self._free_dofs]
+        return r
 
     def _set_element_type(self, i_span):
         """
@@ -196,6 +339,25 @@ class Beam:
         """
         raise NotImplementedError("Changing element type not supported")
 
+    @property
+    def fingerprint(self) -> str:
+        """
+        Returns a stable hash of the stiffness definition of the beam: the span
+        lengths, flexural rigidities, element types, and restraints. Loads are
+        not included. The hash is the same across processes and sessions.
+
+        Returns
+        -------
+        fingerprint : str
+            The hexadecimal digest identifying the beam stiffness
+        """
+        h = hashlib.blake2b(digest_size=16)
+        for v in (self.mbr_lengths, self.mbr_EIs, self.mbr_eletype, self._restraints):
+            v = np.asarray(v, dtype=float).ravel()
+            h.update(np.int64(v.size).tobytes())
+            h.update(v.tobytes())
+        return h.hexdigest()
+
     @property
     def no_spans(self):
         """
@@ -260,24 +422,47 @@ class Beam:
             The local coordinate along the member of the point of interest
 
         """
-        if pos < 0.0 or pos > self.length:
+        ispan, pos_in_span = self.get_local_span_coords_array(np.array([pos]))
+        if ispan[0] == -1:
             return -1, 0
+
+        return int(ispan[0]), float(pos_in_span[0])
+
+    def get_local_span_coords_array(self, pos: np.ndarray) -> (np.ndarray, np.ndarray):
         """
-        # more basic algorithim
-        ispan = 0
-        pos_in_span = pos
-        while ispan < self.no_spans and pos_in_span > self.mbr_lengths[ispan]:
-            pos_in_span -= self.mbr_lengths[ispan]
-            ispan += 1
-            if ispan > self.no_spans:
-                ispan = -1
-        """
-        try:
-            ispan = next(i - 1 for i, x in enumerate(self._terminal_coords) if x > pos)
-        except StopIteration:  # at the end of the beam
-            ispan = self._no_spans - 1
+        Returns the span indices and positions in span for a vector of positions
+        given in global coordinates on the beam, using a single binary search.
+
+        Positions at an internal node are located at the start of the following
+        span, while a position at the end of the beam is located at the end of
+        the last span.
+
+        Parameters
+        ----------
+        pos : np.ndarray
+            The positions of interest in global coordinates along the length of
+            the beam
+
+        Returns
+        -------
+        ispan : np.ndarray
+            The index (0-based) of the span in which each point of interest falls,
+            or -1 for points off the beam
+        pos_in_span : np.ndarray
+            The local coordinate along the member of each point of interest, or 0
+            for points off the beam
+
+        """
+        pos = np.asarray(pos, dtype=float)
+        ispan = np.searchsorted(self._terminal_coords, pos, side="right") - 1
+        # The end of the beam is in the last span
+        ispan = np.minimum(ispan, self._no_spans - 1)
         pos_in_span = pos - self._terminal_coords[ispan]
 
+        off_beam = (pos < 0.0) | (pos > self.length)
+        ispan[off_beam] = -1
+        pos_in_span[off_beam] = 0.0
+
         return ispan, pos_in_span
 
     def get_ref(self, i_span: int) -> LoadCNL:
@@ -296,14 +481,9 @@ class Beam:
             The totalled CNL object for the member, considering all loads.
 
         """
-        ref = np.zeros(4)
-        L = self.mbr_lengths[i_span]
-        eType = self.mbr_eletype[i_span]
-
-        for load in self._loads:
-            if load.i_span == i_span:
-                ref += load.get_ref(L, eType)
-        return ref
+        sl = self._load_table.span_slice(i_span)
+        ref = self._load_table.get_ref(self.mbr_lengths, self.mbr_eletype, sl)
+        return ref.sum(axis=0)
 
     def get_span_k(self, i_span: int) -> np.ndarray:
         """
@@ -333,6 +513,29 @@ class Beam:
             kb = self.k_FF(EI, L)
         return kb
 
+    def get_element_k(self) -> np.ndarray:
+        """
+        Returns the stiffness matrices of all spans at once, computed from the
+        arrays of member properties with a mask for each element type
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        k : np.ndarray
+            The `(no_spans, 4, 4)` tensor of member stiffness matrices
+
+        """
+        et = self.mbr_eletype
+        # Any other element type is treated as fixed-fixed, as in get_span_k
+        et = np.where(np.isin(et, [2, 3, 4]), et, 1)
+        EI = self.mbr_EIs[:, np.newaxis]
+        L = self.mbr_lengths[:, np.newaxis]
+        coeffs = _K_COEFFS[et] * EI / L**_K_POWERS
+        return np.einsum("nj,njab->nab", coeffs, _K_TEMPLATES[et])
+
     def k_FF(self, EI: float, L: float) -> np.ndarray:
         """
         Stiffness matrix for a fixed-fixed element
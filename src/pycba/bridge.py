@@ -2,13 +2,19 @@
 PyCBA - Continuous Beam Analysis - Bridge Crossing Module
 """
 from __future__ import annotations  # https://bit.ly/3KYiL2o
-from typing import Optional, Union, Dict, List
+from typing import Optional, Union, Dict, List, Tuple, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+from collections import OrderedDict
+from multiprocessing import shared_memory
 import numpy as np
 import matplotlib.pyplot as plt
+from scipy import signal
 from .analysis import BeamAnalysis
-from .results import Envelopes, BeamResults
-from .vehicle import Vehicle
-from .load import add_LM
+from .results import Envelopes, BeamResults, BatchResults, FleetEnvelopes
+from .vehicle import Vehicle, VehicleFleet
+from .load import add_LM, MemberResults, LoadMaMb
+from .inf_lines import InfluenceLines, InfluenceFunction
 
 
 class BridgeAnalysis:
@@ -22,7 +28,11 @@ class BridgeAnalysis:
     """
 
     def __init__(
-        self, ba: Optional[BeamAnalysis] = None, veh: Optional[Vehicle] = None
+        self,
+        ba: Optional[BeamAnalysis] = None,
+        veh: Optional[Vehicle] = None,
+        cache_size: int = 0,
+        cache_quantum: float = 1e-6,
     ):
         """
         Can instantiate with nothing and later add or define the objects, or
@@ -37,6 +47,15 @@ class BridgeAnalysis:
             A :class:`pycba.analysis.BeamAnalysis` object. The default is None.
         veh : Optional[Vehicle], optional
             A :class:`pycba.bridge.Vehicle` object. The default is None.
+        cache_size : int, optional
+            The number of vehicle crossings whose envelopes are kept by
+            :meth:`run_vehicle`, to be returned for a repeated crossing instead
+            of analysing it again. The least recently used are dropped. The
+            default is 0, for no cache.
+        cache_quantum : float, optional
+            The resolution to which axle spacings are rounded for the cache, so
+            that vehicles whose spacings differ by less share an entry. The
+            default is 1e-6.
 
         Returns
         -------
@@ -47,6 +66,13 @@ class BridgeAnalysis:
         self.vResults = []
         self.pos = []
 
+        self.cache_size = cache_size
+        self.cache_quantum = cache_quantum
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._cache = OrderedDict()
+        self._il = None
+
         self.static_LM = []
 
         if self.ba:
@@ -192,15 +218,19 @@ class BridgeAnalysis:
 
         axle_positions = pos - self.veh.axle_coords
 
-        # Create the CBA Load Matrix, checking axle positions, etc
-        LM = []
-        for iaxle in range(self.veh.NoAxles):
-            load = self.veh.axw[iaxle]
-            ispan, pos_in_span = self.ba.beam.get_local_span_coords(
-                axle_positions[iaxle]
-            )
-            if ispan != -1:
-                LM.append([ispan + 1, 2, load, pos_in_span, 0])
+        # Create the CBA Load Matrix for the axles on the bridge
+        ispan, pos_in_span = self.ba.beam.get_local_span_coords_array(axle_positions)
+        on = ispan != -1
+        n_on = on.sum()
+        LM = np.column_stack(
+            [
+                ispan[on] + 1,
+                2 * np.ones(n_on),
+                self.veh.axw[on],
+                pos_in_span[on],
+                np.zeros(n_on),
+            ]
+        ).tolist()
 
         # Now add any pre-existing loads on the beam
         LM = add_LM(self.static_LM, LM)
@@ -209,7 +239,15 @@ class BridgeAnalysis:
         return self.ba.analyze()
 
     def run_vehicle(
-        self, step: float, plot_env: bool = False, plot_all: bool = False
+        self,
+        step: float,
+        plot_env: bool = False,
+        plot_all: bool = False,
+        method: str = "static",
+        keep_results: bool = True,
+        workers: Optional[int] = None,
+        chunksize: Optional[int] = None,
+        tol: float = 1e-3,
     ) -> Envelopes:
         """
         Runs the vehicle over the bridge performing a static analysis at each point
@@ -222,13 +260,57 @@ class BridgeAnalysis:
             Whether or not to plot the results envelope. The default is False.
         plot_all : bool, optional
             Whether or not to plot the results for each position as an animation.
-            The default is False.
+            The default is False. Only available for the static method.
+        method : str, optional
+            Either **static** (default), for an analysis at each vehicle position,
+            stored in :attr:`vResults`; or **influence**, for which the results
+            of unit loads at the ends and third points of each span are found
+            once, and the results at all vehicle positions are the sums of the
+            axle weights times the influence ordinates interpolated exactly from
+            these; or **fft**, for which these sums are found point by point as
+            convolutions along the positions using FFTs, for long trains of many
+            axles; or **adaptive**, for static analyses at the positions of a
+            coarse traverse of increment `step`, which are then added to by
+            bisecting only the intervals over which an extreme could be exceeded,
+            until the envelopes are found to within `tol`. The positions are then
+            not evenly spaced. For the influence and fft methods,
+            :attr:`vResults` is empty.
+        keep_results : bool, optional
+            For the static and adaptive methods, whether or not to keep the
+            results of each vehicle position in :attr:`vResults`. If False, for
+            the static method the envelopes are updated with each position as it
+            is analyzed (see :meth:`pycba.results.Envelopes.streaming`), so that
+            memory does not grow with the number of positions. The default is
+            True.
+        workers : Optional[int], optional
+            For the static method, the number of processes over which to share
+            the vehicle positions. Each process analyzes its own copy of the
+            bridge, and the envelopes of each are merged, giving exactly the
+            serial envelopes. The results of each position are then not kept in
+            :attr:`vResults`, but if `keep_results`, the reactions of each
+            position are returned through shared memory. The default is None, for
+            a serial analysis.
+        chunksize : Optional[int], optional
+            The number of consecutive vehicle positions in each task given to the
+            processes. The default is None, for about four tasks per process to
+            balance the load.
+        tol : float, optional
+            For the adaptive method, the accuracy of the envelopes of moment,
+            shear, and reaction, relative to the greatest magnitude of each. The
+            default is 1e-3.
+
+        If the bridge analysis has a cache (see `cache_size`), the envelopes of
+        a crossing already in it are returned, as a copy, without analysis,
+        along with the vehicle positions and any results of each position.
+        Crossings of vehicles that differ only by a factor on the axle weights
+        share an entry, scaled by the factor, unless there are static loads or
+        the results of each position are kept.
 
         Raises
         ------
         ValueError
             If a static beam analysis does not succeed, usually due to a beam
-            configuration error.
+            configuration error, or for an unknown method or option.
 
         Returns
         -------
@@ -237,9 +319,59 @@ class BridgeAnalysis:
 
         """
         self._check_objects()
+        if self.cache_size > 0 and not plot_all:
+            parallel = workers is not None and workers > 1
+            key, weight = self._cache_key(step, method, keep_results, parallel, tol)
+            env = self._cache_get(key, weight)
+            if env is None:
+                env = self._run_vehicle(
+                    step, False, method, keep_results, workers, chunksize, tol
+                )
+                self._cache_put(key, weight, env)
+        else:
+            env = self._run_vehicle(
+                step, plot_all, method, keep_results, workers, chunksize, tol
+            )
+
+        if plot_env:
+            self.plot_envelopes(env)
+
+        return env
+
+    def _run_vehicle(
+        self,
+        step: float,
+        plot_all: bool,
+        method: str,
+        keep_results: bool,
+        workers: Optional[int],
+        chunksize: Optional[int],
+        tol: float,
+    ) -> Envelopes:
+        """
+        Runs the vehicle over the bridge by the chosen method, as for
+        :meth:`run_vehicle`, but without the cache or plotting the envelopes.
+        """
+        if method in ("influence", "fft", "adaptive") and plot_all:
+            raise ValueError("plot_all requires the static method")
+        if method == "influence":
+            return self._run_influence(step)
+        elif method == "fft":
+            return self._run_convolution(step)
+        elif method == "adaptive":
+            return self._run_adaptive(step, tol, keep_results)
+        elif method != "static":
+            raise ValueError(f"Unknown method {method}")
+
+        if workers is not None and workers > 1:
+            if plot_all:
+                raise ValueError("plot_all requires a serial analysis")
+            return self._run_parallel(step, workers, chunksize, keep_results)
+
         self.pos = []
         self.vResults = []
         npts = round((self.ba.beam.length + self.veh.L) / step) + 1
+        env = None
 
         if plot_all:
             fig, axs = plt.subplots(2, 1, sharex=True)
@@ -255,17 +387,1178 @@ class BridgeAnalysis:
             if plot_all:
                 self.plot_static(pos, axs)
                 plt.pause(0.01)
-            self.vResults.append(self.ba.beam_results)
+            res = self.ba.beam_results
+            if keep_results:
+                self.vResults.append(res)
+            else:
+                if env is None:
+                    env = Envelopes.streaming(res.results.x, len(res.R))
+                env.update(res)
 
-        env = Envelopes(self.vResults)
+        if keep_results:
+            env = Envelopes(self.vResults)
 
-        if plot_env:
-            self.plot_envelopes(env)
+        return env
+
+    def _run_adaptive(self, step: float, tol: float, keep_results: bool) -> Envelopes:
+        """
+        Runs the vehicle over the bridge with static analyses at adaptively
+        chosen positions, rather than at a fine uniform increment.
+
+        A coarse traverse of increment `step` is first analyzed. Then, in each
+        pass, every ordinate of the load effects (the moments and shears at each
+        point, and the reactions) is bounded over each interval between the
+        analyzed positions, from the slopes of the neighbouring intervals (see
+        :func:`_interval_bound`). Only the intervals over which an ordinate
+        could exceed its running extreme by more than the tolerance are
+        bisected, so that the refinement stops when the envelopes are found to
+        within the tolerance. Most of the traverse, which does not govern any
+        ordinate, is only analyzed at the coarse step. Only the results about the
+        intervals still being refined are kept for this, so that, without
+        `keep_results`, the whole history of results is not held.
+
+        Parameters
+        ----------
+        step : float
+            The distance increment of the coarse traverse.
+        tol : float
+            The accuracy of the envelopes of moment, shear, and reaction,
+            relative to the greatest magnitude of each.
+        keep_results : bool
+            Whether or not to keep the results of each vehicle position, in
+            order of position, in :attr:`vResults`.
+
+        Raises
+        ------
+        ValueError
+            If a static beam analysis does not succeed, usually due to a beam
+            configuration error, or the tolerance is not positive.
+
+        Returns
+        -------
+        Envelopes
+            The load effect envelopes for the traverse; a `pycba.Envelopes` object.
+        """
+        if tol <= 0:
+            raise ValueError("The tolerance must be positive")
+
+        vResults = []
+        allpos = []
+        reactions = []
+
+        def analyze(positions: np.ndarray) -> np.ndarray:
+            rows = []
+            for pos in positions:
+                if self._single_analysis(pos) != 0:
+                    raise ValueError(f"Bridge analysis did not succeed at {pos=}")
+                res = self.ba.beam_results
+                rows.append(np.concatenate([res.results.M, res.results.V, res.R]))
+                reactions.append(res.R)
+                if keep_results:
+                    vResults.append(res)
+            allpos.extend(positions)
+            return np.array(rows)
+
+        def slope(
+            p: np.ndarray, v: np.ndarray, dl: np.ndarray, dr: np.ndarray, k: int
+        ) -> np.ndarray:
+            # The slope of the interval from the position `k` of a run, or of
+            # those either side of it
+            if k < 0:
+                return dl[k + 2]
+            if k >= len(p) - 1:
+                return dr[k - len(p) + 1]
+            return (v[k + 1] - v[k]) / (p[k + 1] - p[k])
+
+        npos = round((self.ba.beam.length + self.veh.L) / step) + 1
+        p = step * np.arange(npos)
+        v = analyze(p)
+        npts = len(self.ba.beam_results.results.x)
+        groups = [slice(0, npts), slice(npts, 2 * npts), slice(2 * npts, None)]
+
+        # The running extremes of each ordinate, and the number of the analysis
+        # at which each is found
+        emax, emin = v.max(axis=0), v.min(axis=0)
+        imax, imin = v.argmax(axis=0), v.argmin(axis=0)
+
+        # The runs of consecutive positions still being refined, with their
+        # results and the slopes of the intervals either side of each
+        zero = np.zeros((2, v.shape[1]))
+        runs = [(p, v, zero, zero)]
+        hmin = step * 2.0**-20
+        block = 64
+        while True:
+            # The tolerance of each ordinate, from the magnitude of its effect
+            tolv = np.empty(len(emax))
+            for g in groups:
+                tolv[g] = tol * max(emax[g].max(), -emin[g].min(), 1e-300)
+
+            # Bisect the intervals over which an ordinate could exceed its
+            # running extremes by more than the tolerance, bounding a block of
+            # ordinates at a time over each interval between positions
+            bisect = []
+            for p, v, dl, dr in runs:
+                over = np.zeros(len(p) - 1, dtype=bool)
+                for c in range(0, v.shape[1], block):
+                    g = slice(c, c + block)
+                    hi = _interval_bound(p, v[:, g], dl[:, g], dr[:, g])
+                    lo = -_interval_bound(p, -v[:, g], -dl[:, g], -dr[:, g])
+                    over |= (hi > emax[g] + tolv[g]).any(axis=1)
+                    over |= (lo < emin[g] - tolv[g]).any(axis=1)
+                bisect.append(np.nonzero(over & (np.diff(p) > hmin))[0])
+            if not any(len(ends) for ends in bisect):
+                break
+
+            # Only these intervals and their neighbours, with the slopes of the
+            # two intervals either side of these, bound the next intervals, so
+            # the rest of each run is dropped
+            refined = []
+            for (p, v, dl, dr), ends in zip(runs, bisect):
+                if len(ends) == 0:
+                    continue
+                keep = np.zeros(len(p), dtype=bool)
+                for k in range(-1, 3):
+                    keep[np.clip(ends + k, 0, len(p) - 1)] = True
+                kept = np.nonzero(keep)[0]
+                for sub in np.split(kept, np.nonzero(np.diff(kept) > 1)[0] + 1):
+                    i, j = sub[0], sub[-1] + 1
+                    d = [slope(p, v, dl, dr, k) for k in (i - 2, i - 1, j - 1, j)]
+                    sends = ends[(ends >= i) & (ends < j - 1)] - i
+                    refined.append((p[i:j], v[i:j], d[:2], d[2:], sends))
+
+            mids = [0.5 * (p[ends] + p[ends + 1]) for p, v, dl, dr, ends in refined]
+            mid = np.concatenate(mids)
+            vmid = analyze(mid)
+            first = len(allpos) - len(mid)
+            prev = np.array(allpos)
+            for sign, ext, iext in [(1, emax, imax), (-1, emin, imin)]:
+                # Of equal extremes, that at the first position is kept
+                arg = (sign * vmid).argmax(axis=0)
+                val = sign * vmid[arg, np.arange(len(arg))]
+                cur = sign * ext
+                upd = (val > cur) | ((val == cur) & (mid[arg] < prev[iext]))
+                ext[upd] = sign * val[upd]
+                iext[upd] = first + arg[upd]
+
+            # Each midpoint follows the start of its interval in its run
+            runs = []
+            vmids = np.split(vmid, np.cumsum([len(m) for m in mids])[:-1])
+            for (p, v, dl, dr, ends), m, vm in zip(refined, mids, vmids):
+                n = len(p) + len(m)
+                at = ends + np.arange(1, len(ends) + 1)
+                rest = np.ones(n, dtype=bool)
+                rest[at] = False
+                pn = np.empty(n)
+                pn[at], pn[rest] = m, p
+                vn = np.empty((n, v.shape[1]))
+                vn[at], vn[rest] = vm, v
+                runs.append((pn, vn, np.array(dl), np.array(dr)))
+
+        allpos = np.array(allpos)
+        order = np.argsort(allpos, kind="stable")
+        self.pos = allpos[order].tolist()
+        if keep_results:
+            self.vResults = [vResults[i] for i in order]
+            return Envelopes(self.vResults)
+
+        # The extremes are indexed by the analyses in order of position
+        self.vResults = []
+        rank = np.empty_like(order)
+        rank[order] = np.arange(len(order))
+        idx = {}
+        for key, g in [("M", groups[0]), ("V", groups[1])]:
+            idx[key + "max"] = np.where(emax[g] > 0, rank[imax[g]], -1)
+            idx[key + "min"] = np.where(emin[g] < 0, rank[imin[g]], -1)
+        x = self.ba.beam_results.results.x
+        R = np.array(reactions)[order]
+        M, V = groups[:2]
+        return Envelopes.from_arrays(x, emax[V], emin[V], emax[M], emin[M], R, idx)
+
+    def _cache_key(
+        self,
+        step: float,
+        method: str,
+        keep_results: bool,
+        parallel: bool,
+        tol: float,
+    ) -> (Tuple, float):
+        """
+        Returns the key of the crossing of the current vehicle in the cache, and
+        the weight by which the axle weights of the key are normalized.
+
+        Since the results are linear in the axle weights, vehicles whose weights
+        differ only by a factor share a key. This is not so if there are static
+        loads, nor if the results of each position are to be kept.
+
+        Parameters
+        ----------
+        step : float
+            The distance increment to move the vehicle.
+        method : str
+            The method of the analysis.
+        keep_results : bool
+            Whether or not the results of each position are kept.
+        parallel : bool
+            Whether or not the analysis is shared over processes.
+        tol : float
+            The accuracy of the adaptive method.
+
+        Returns
+        -------
+        key : Tuple
+            The key of the crossing.
+        weight : float
+            The total weight of the vehicle if its weights are normalized, or
+            one.
+        """
+        axw = np.asarray(self.veh.axw, dtype=float)
+        weight = 1.0
+        kept = method in ("static", "adaptive") and keep_results and not parallel
+        if axw.sum() > 0 and not self.static_LM and not kept:
+            weight = axw.sum()
+        axs = np.round(np.asarray(self.veh.axs) / self.cache_quantum).astype(np.int64)
+        reverse = bool(self.veh.axle_coords[0] > self.veh.axle_coords[-1])
+        key = (
+            self.ba.beam.fingerprint,
+            self.ba.npts,
+            repr(self.static_LM),
+            tuple(axs.tolist()),
+            tuple(np.round(axw / weight, 12).tolist()),
+            reverse,
+            step,
+            method,
+            keep_results,
+            parallel,
+            tol if method == "adaptive" else None,
+        )
+        return (key, weight)
+
+    def _cache_get(self, key: Tuple, weight: float) -> Optional[Envelopes]:
+        """
+        Returns a copy of the cached envelopes of a crossing, scaled to the
+        weight of the vehicle, and restores the vehicle positions and results.
+
+        Parameters
+        ----------
+        key : Tuple
+            The key of the crossing, from :meth:`_cache_key`.
+        weight : float
+            The weight by which the axle weights of the key are normalized.
+
+        Returns
+        -------
+        Optional[Envelopes]
+            The envelopes, or None if the crossing is not cached.
+        """
+        entry = self._cache.get(key)
+        if entry is None:
+            self.cache_misses += 1
+            return None
+        self._cache.move_to_end(key)
+        self.cache_hits += 1
+        env, pos, cached_weight = entry
+        env = env.scaled(weight / cached_weight)
+        self.pos = list(pos)
+        self.vResults = env.vResults
+        return env
+
+    def _cache_put(self, key: Tuple, weight: float, env: Envelopes):
+        """
+        Stores a copy of the envelopes of a crossing in the cache, dropping the
+        least recently used crossings beyond the cache size.
+
+        Parameters
+        ----------
+        key : Tuple
+            The key of the crossing, from :meth:`_cache_key`.
+        weight : float
+            The weight by which the axle weights of the key are normalized.
+        env : Envelopes
+            The envelopes of the crossing.
+
+        Returns
+        -------
+        None.
+        """
+        self._cache[key] = (env.scaled(1.0), list(self.pos), weight)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def clear_cache(self):
+        """
+        Empties the cache of vehicle crossings and resets its counters.
+
+        Returns
+        -------
+        None.
+        """
+        self._cache.clear()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def iter_run(
+        self, step: float, chunk: Optional[int] = None
+    ) -> Iterator[Tuple[Union[float, np.ndarray], BatchResults]]:
+        """
+        Runs the vehicle over the bridge, yielding the results at each vehicle
+        position in turn instead of keeping them, for consumers that stream them
+        elsewhere.
+
+        The results are found as for the **influence** method of
+        :meth:`run_vehicle`, into an output buffer that is allocated once: the
+        results yielded are views of this buffer, and so are overwritten by the
+        next results. Copy any results that are to be kept.
+
+        Parameters
+        ----------
+        step : float
+            The distance increment to move the vehicle.
+        chunk : Optional[int]
+            If given, blocks of up to this many vehicle positions are yielded at a
+            time, with the results of each position as the rows of matrices. The
+            default is None, for one position at a time.
+
+        Raises
+        ------
+        ValueError
+            If the static beam analysis does not succeed, usually due to a beam
+            configuration error, or if the chunk is less than one.
+
+        Yields
+        ------
+        pos : Union[float, np.ndarray]
+            The vehicle position, or the vector of the positions of the block.
+        res : BatchResults
+            The results at the position, as vectors of the load effects along the
+            beam, nodal displacements :attr:`D` and reactions :attr:`R`; or for a
+            block, as `(nblock, n)` matrices of these.
+        """
+        self._check_objects()
+        if chunk is not None and chunk < 1:
+            raise ValueError("The chunk must be at least one position")
+
+        npos = round((self.ba.beam.length + self.veh.L) / step) + 1
+        try:
+            ils = self._unit_load_grid()
+        except np.linalg.LinAlgError:
+            raise ValueError("Bridge analysis did not succeed")
+        pos = step * np.arange(npos)
+
+        # The unit load results side by side, so each block is a single product
+        x = ils.results.x
+        parts = [ils.results.M, ils.results.V, ils.results.R, ils.results.D]
+        A = np.hstack(parts + [ils.D, ils.R])
+        bounds = np.cumsum([0] + [a.shape[1] for a in parts + [ils.D, ils.R]])
+
+        # The results of any static loads are superimposed on every position
+        base = np.zeros(A.shape[1])
+        if self.static_LM:
+            self.ba.set_loads(self.static_LM)
+            self.ba.analyze()
+            static = self.ba.beam_results
+            r = static.results
+            base = np.concatenate([r.M, r.V, r.R, r.D, static.D, static.R])
+
+        # The buffers of the weights, the results, and the parts of them that
+        # are not smooth in the load positions, allocated once for all blocks
+        nblock = 1 if chunk is None else min(chunk, npos)
+        buf = np.empty((nblock, A.shape[1]))
+        wbuf = np.empty((nblock, A.shape[0]))
+        kbuf = tuple(np.empty((nblock, j - i)) for i, j in zip(bounds[:4], bounds[1:5]))
+
+        def view(rows: Union[int, slice]) -> BatchResults:
+            d, r = (buf[rows, i:j] for i, j in zip(bounds[4:-1], bounds[5:]))
+            vals = tuple(buf[rows, i:j] for i, j in zip(bounds[:4], bounds[1:5]))
+            return BatchResults.from_arrays(
+                d, r, MemberResults(vals=(x,) + vals), ils.npts
+            )
 
+        res = view(0) if chunk is None else view(slice(None))
+        for i in range(0, npos, nblock):
+            m = min(nblock, npos - i)
+            ispan, a = self.ba.beam.get_local_span_coords_array(
+                pos[i : i + m, np.newaxis] - self.veh.axle_coords
+            )
+            w = np.where(ispan >= 0, self.veh.axw, 0.0)
+            if m < nblock:
+                # The last block is shorter
+                buf, wbuf = (buf[:m], wbuf[:m])
+                kbuf = tuple(k[:m] for k in kbuf)
+            W = self._grid_weights(ispan, a, w, out=wbuf)
+            np.matmul(W, A, out=buf)
+            buf += base
+            kinks = self._load_kinks(ispan, a, w, ils.npts, out=kbuf)
+            for k, j in zip(kinks, bounds):
+                buf[:, j : j + k.shape[1]] -= k
+            if chunk is None:
+                yield pos[i], res
+            elif m == nblock:
+                yield pos[i : i + m], res
+            else:
+                yield pos[i : i + m], view(slice(m))
+
+    def _run_parallel(
+        self,
+        step: float,
+        workers: int,
+        chunksize: Optional[int] = None,
+        keep_results: bool = True,
+    ) -> Envelopes:
+        """
+        Runs the vehicle over the bridge with a static analysis at each point,
+        sharing consecutive chunks of the positions over a pool of processes.
+
+        Parameters
+        ----------
+        step : float
+            The distance increment to move the vehicle.
+        workers : int
+            The number of processes.
+        chunksize : Optional[int], optional
+            The number of positions in each chunk. The default is None, for about
+            four chunks per process.
+        keep_results : bool, optional
+            Whether or not to return the reactions of each position, through
+            shared memory. The default is True.
+
+        Raises
+        ------
+        ValueError
+            If a static beam analysis does not succeed, usually due to a beam
+            configuration error, or if the chunk size is less than one.
+
+        Returns
+        -------
+        Envelopes
+            The load effect envelopes for the traverse; a `pycba.Envelopes` object.
+        """
+        npos = round((self.ba.beam.length + self.veh.L) / step) + 1
+        if chunksize is None:
+            chunksize = -(-npos // (4 * workers))
+        if chunksize < 1:
+            raise ValueError("The chunk size must be at least one position")
+        self.pos = [i * step for i in range(npos)]
+        self.vResults = []
+
+        # The history of the reactions
+        shape = (len(self.ba.beam.fixed_dofs), npos)
+        shm = None
+        if keep_results:
+            # Shared memory cannot be empty, even with no reactions
+            size = max(8 * shape[0] * shape[1], 1)
+            shm = shared_memory.SharedMemory(create=True, size=size)
+        name = shm.name if shm is not None else None
+
+        tasks = [
+            (step, i, min(i + chunksize, npos), name, shape)
+            for i in range(0, npos, chunksize)
+        ]
+        try:
+            with ProcessPoolExecutor(
+                workers,
+                initializer=_init_worker,
+                initargs=(self.ba, self.veh, self.static_LM),
+            ) as executor:
+                parts = list(executor.map(_run_chunk, tasks))
+            if keep_results:
+                hist = np.ndarray(shape, buffer=shm.buf).copy()
+        finally:
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+
+        env = reduce(_merge_envelopes, parts)
+        if keep_results:
+            env = Envelopes.from_arrays(
+                env.x, env.Vmax, env.Vmin, env.Mmax, env.Mmin, hist.T, env.idx
+            )
         return env
 
+    def _run_positions(
+        self,
+        step: float,
+        start: int,
+        stop: int,
+        name: Optional[str] = None,
+        shape: Optional[Tuple[int, int]] = None,
+    ) -> Envelopes:
+        """
+        Runs the vehicle over a range of its positions, as a task of
+        :meth:`_run_parallel`.
+
+        Parameters
+        ----------
+        step : float
+            The distance increment to move the vehicle.
+        start : int
+            The index of the first position.
+        stop : int
+            The index after the last position.
+        name : Optional[str], optional
+            The name of the shared memory of the reaction history of all
+            positions, to which those of this range are written. The default is
+            None, for none.
+        shape : Optional[Tuple[int, int]], optional
+            The shape of the history. The default is None.
+
+        Raises
+        ------
+        ValueError
+            If a static beam analysis does not succeed.
+
+        Returns
+        -------
+        Envelopes
+            The streaming envelopes of the range of positions.
+        """
+        env = None
+        R = []
+        for i in range(start, stop):
+            pos = i * step
+            if self._single_analysis(pos) != 0:
+                raise ValueError(f"Bridge analysis did not succeed at {pos=}")
+            res = self.ba.beam_results
+            if env is None:
+                env = Envelopes.streaming(res.results.x, len(res.R))
+            env.update(res)
+            if name is not None:
+                R.append(res.R)
+
+        if name is not None:
+            shm = shared_memory.SharedMemory(name=name)
+            try:
+                hist = np.ndarray(shape, buffer=shm.buf)
+                hist[:, start:stop] = np.array(R).T
+                del hist
+            finally:
+                shm.close()
+        return env
+
+    def _run_influence(self, step: float) -> Envelopes:
+        """
+        Runs the vehicle over the bridge using influence lines: the results at
+        the vehicle positions are sums of the axle weights times the results of
+        unit loads at the axle positions, as interpolated from those of the
+        unit loads of :meth:`_unit_load_grid`.
+
+        The envelopes are those of the static method, to within rounding: the
+        interpolation is exact, and a shear at a point under an axle takes the
+        axle as before the point, as for the static analyses.
+
+        Parameters
+        ----------
+        step : float
+            The distance increment to move the vehicle.
+
+        Raises
+        ------
+        ValueError
+            If the static beam analysis does not succeed, usually due to a beam
+            configuration error.
+
+        Returns
+        -------
+        Envelopes
+            The load effect envelopes for the traverse; a `pycba.Envelopes` object.
+        """
+        npos = round((self.ba.beam.length + self.veh.L) / step) + 1
+        self.pos = (step * np.arange(npos)).tolist()
+        self.vResults = []
+
+        try:
+            ils = self._unit_load_grid()
+        except np.linalg.LinAlgError:
+            raise ValueError("Bridge analysis did not succeed")
+        grid = self._grid_increments(ils)
+        x = ils.results.x
+        npts = len(x)
+
+        # The results of any static loads are superimposed on every position
+        M0 = np.zeros(npts)
+        V0 = np.zeros(npts)
+        R0 = 0.0
+        if self.static_LM:
+            self.ba.set_loads(self.static_LM)
+            self.ba.analyze()
+            static = self.ba.beam_results
+            M0, V0, R0 = static.results.M, static.results.V, static.R
+
+        env = {
+            "Mmax": np.full(npts, -np.inf),
+            "Mmin": np.full(npts, np.inf),
+            "Vmax": np.full(npts, -np.inf),
+            "Vmin": np.full(npts, np.inf),
+        }
+        idx = {key: np.full(npts, -1) for key in env}
+
+        R = np.zeros((npos, ils.R.shape[1]))
+
+        # Bound the memory of the dense results by working in blocks of positions
+        chunk = max(1, 2**20 // npts)
+        for i0 in range(0, npos, chunk):
+            rows = slice(i0, i0 + chunk)
+            ispan, a = self.ba.beam.get_local_span_coords_array(
+                step * np.arange(npos)[np.newaxis, rows, np.newaxis]
+                - self.veh.axle_coords
+            )
+            w = np.where(ispan >= 0, self.veh.axw, 0.0)
+            M, V, Rb = self._traverse_effects(ispan, a, w, grid, ils.npts)
+            R[rows] = Rb[0].T + R0
+            # Only a later block's strictly greater extreme replaces the first
+            for key, vals, base in [
+                ("Mmax", M[0], M0),
+                ("Mmin", M[0], M0),
+                ("Vmax", V[0], V0),
+                ("Vmin", V[0], V0),
+            ]:
+                if key.endswith("max"):
+                    i = vals.argmax(axis=1)
+                else:
+                    i = vals.argmin(axis=1)
+                ext = np.take_along_axis(vals, i[:, np.newaxis], axis=1)[:, 0] + base
+                if key.endswith("max"):
+                    mask = ext > env[key]
+                else:
+                    mask = ext < env[key]
+                env[key][mask] = ext[mask]
+                idx[key][mask] = i[mask] + i0
+
+        return Envelopes.from_arrays(
+            x, env["Vmax"], env["Vmin"], env["Mmax"], env["Mmin"], R, idx
+        )
+
+    def _run_convolution(self, step: float) -> Envelopes:
+        """
+        Runs the vehicle over the bridge as for :meth:`_run_influence`, but with
+        the results at all the vehicle positions found at once, point by point,
+        as the convolution of the axle weights with the influence lines sampled
+        at the step, using FFTs. The cost is then of order `n log n` in the
+        number of positions `n`, rather than the positions times the axles, as
+        for long trains of many axles at a fine step.
+
+        Each axle is a whole number of steps behind the front axle, and a
+        fraction of a step more, which is shared by the axles of a group. The
+        influence lines are sampled once for each such fraction, so that the
+        axles of a train spaced at multiples of the step are one group. The
+        positions of the axles are then exact, and so an axle exactly at a point
+        of the results, or at an end of the beam, is taken as there, rather than
+        either side of it by the rounding of the positions of the static
+        analyses.
+
+        Parameters
+        ----------
+        step : float
+            The distance increment to move the vehicle.
+
+        Raises
+        ------
+        ValueError
+            If the static beam analysis does not succeed, usually due to a beam
+            configuration error.
+
+        Returns
+        -------
+        Envelopes
+            The load effect envelopes for the traverse; a `pycba.Envelopes` object.
+        """
+        npos = round((self.ba.beam.length + self.veh.L) / step) + 1
+        self.pos = (step * np.arange(npos)).tolist()
+        self.vResults = []
+
+        try:
+            ils = self._unit_load_grid()
+        except np.linalg.LinAlgError:
+            raise ValueError("Bridge analysis did not succeed")
+        grid = self._grid_increments(ils)
+        x = ils.results.x
+        npts = len(x)
+
+        # The results of any static loads are superimposed on every position
+        static = self._static_results()
+        base = np.zeros(2 * npts + ils.R.shape[1])
+        if static is not None:
+            base = np.concatenate([static.results.M, static.results.V, static.R])
+
+        # The axle weights at the whole steps of each group, and the influence
+        # lines of the group, of the moments, shears, and reactions in turn, for
+        # a unit load at each step from the fraction of a step before the beam
+        shift = self.veh.axle_coords / step
+        whole = np.floor(shift + 1e-9)
+        frac = np.round(np.maximum(shift - whole, 0.0), 9)
+        nsample = int(self.ba.beam.length / step) + 2
+        groups = []
+        for f in np.unique(frac):
+            axles = frac == f
+            weights = np.zeros(int(whole[axles].max()) + 1)
+            np.add.at(weights, whole[axles].astype(int), self.veh.axw[axles])
+            s = step * (np.arange(nsample) - f)
+            ispan, a = self.ba.beam.get_local_span_coords_array(
+                s[np.newaxis, :, np.newaxis]
+            )
+            w = np.where(ispan >= 0, 1.0, 0.0)
+            M, V, R = self._traverse_effects(ispan, a, w, grid, ils.npts)
+            groups.append((weights, np.vstack([M[0], V[0], R[0]])))
+
+        # Bound the memory of the convolutions by working in blocks of points,
+        # keeping only the extremes of each, and the history of the reactions
+        ext = np.empty((4, len(base)))
+        R = np.empty((npos, len(base) - 2 * npts))
+        nconv = nsample + max(len(weights) for weights, _ in groups)
+        chunk = max(1, 2**20 // nconv)
+        for i0 in range(0, len(base), chunk):
+            rows = slice(i0, i0 + chunk)
+            vals = np.empty((len(base[rows]), npos))
+            vals[:] = base[rows, np.newaxis]
+            for weights, lines in groups:
+                conv = signal.fftconvolve(
+                    lines[rows], weights[np.newaxis, :npos], axes=1
+                )[:, :npos]
+                vals[:, : conv.shape[1]] += conv
+            ext[:, rows] = [
+                vals.max(axis=1),
+                vals.min(axis=1),
+                vals.argmax(axis=1),
+                vals.argmin(axis=1),
+            ]
+            sup = np.arange(len(base))[rows] - 2 * npts
+            R[:, sup[sup >= 0]] = vals[sup >= 0].T
+
+        vmax, vmin, imax, imin = ext
+        M, V = slice(0, npts), slice(npts, 2 * npts)
+        idx = {}
+        for key, g in [("M", M), ("V", V)]:
+            idx[key + "max"] = np.where(vmax[g] > 0, imax[g], -1).astype(int)
+            idx[key + "min"] = np.where(vmin[g] < 0, imin[g], -1).astype(int)
+        return Envelopes.from_arrays(x, vmax[V], vmin[V], vmax[M], vmin[M], R, idx)
+
+    def _unit_load_grid(self) -> BatchResults:
+        """
+        Finds the results of unit loads at the ends and third points of each
+        span, from which those of a load anywhere on the beam are interpolated
+        by :meth:`_grid_weights`.
+
+        The moments and shears of a load on its own span have a kink and a step
+        under it, which are removed from these results (see
+        :meth:`_load_kinks`), so that every result is a cubic in the position of
+        the load along each span, and the interpolation is exact.
+
+        Returns
+        -------
+        BatchResults
+            The results of the unit loads, span by span, without their kinks.
+        """
+        beam = self.ba.beam
+        ispan = np.repeat(np.arange(beam.no_spans), 4)
+        a = np.array(beam.mbr_lengths, dtype=float)[ispan] * np.tile(
+            np.arange(4) / 3, beam.no_spans
+        )
+        LMs = [[[i + 1, 2, 1.0, ai, 0]] for i, ai in zip(ispan.tolist(), a.tolist())]
+        ils = self.ba.analyze_many(LMs)
+
+        kinks = self._load_kinks(
+            ispan[:, np.newaxis], a[:, np.newaxis], np.ones((len(a), 1)), ils.npts
+        )
+        res = ils.results
+        res.M, res.V, res.R, res.D = (
+            vals + k for vals, k in zip((res.M, res.V, res.R, res.D), kinks)
+        )
+        return ils
+
+    def _grid_weights(
+        self,
+        ispan: np.ndarray,
+        a: np.ndarray,
+        w: np.ndarray,
+        out: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        Returns the weights on each unit load of :meth:`_unit_load_grid` of sets
+        of point loads, from the cubic through the four unit loads of the span of
+        each point load.
+
+        Parameters
+        ----------
+        ispan : np.ndarray
+            The `(n, nloads)` matrix of the span index of each point load of each
+            of the `n` sets, or -1 for loads off the beam.
+        a : np.ndarray
+            The `(n, nloads)` matrix of the position of each load along its span.
+        w : np.ndarray
+            The `(n, nloads)` matrix of the weight of each load.
+        out : Optional[np.ndarray], optional
+            The contiguous `(n, nunit)` matrix to write the weights into. The
+            default is None, for a new matrix.
+
+        Returns
+        -------
+        np.ndarray
+            The `(n, nunit)` matrix of weights on the unit loads.
+        """
+        L = np.array(self.ba.beam.mbr_lengths, dtype=float)
+        n = ispan.shape[0]
+        nunit = 4 * len(L)
+        on = ispan >= 0
+        s = np.where(on, ispan, 0)
+
+        # The Lagrange polynomials of the unit loads at t = 0, 1, 2, 3
+        t = 3 * a / L[s]
+        w = np.where(on, w, 0.0)
+        cols = (nunit * np.arange(n)[:, np.newaxis] + 4 * s).ravel()
+        W = np.zeros((n, nunit)) if out is None else out
+        W.fill(0.0)
+        for k in range(4):
+            lag = w.copy()
+            for j in range(4):
+                if j != k:
+                    lag *= (t - j) / (k - j)
+            np.add.at(W.reshape(-1), cols + k, lag.ravel())
+        return W
+
+    def _load_kinks(
+        self,
+        ispan: np.ndarray,
+        a: np.ndarray,
+        w: np.ndarray,
+        npts: int,
+        out: Optional[Tuple[np.ndarray, ...]] = None,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns the parts of the results along the beam of sets of point loads
+        that are not smooth in the load positions: the moment `w (x - a)` and
+        shear `w` at the points `x` of the span of each load past it (see
+        :meth:`_first_past`), which are subtracted in the results, and the
+        rotations and deflections of these moments, as integrated along each
+        member for the results.
+
+        Parameters
+        ----------
+        ispan : np.ndarray
+            The `(n, nloads)` matrix of the span index of each point load of each
+            of the `n` sets, or -1 for loads off the beam.
+        a : np.ndarray
+            The `(n, nloads)` matrix of the position of each load along its span.
+        w : np.ndarray
+            The `(n, nloads)` matrix of the weight of each load.
+        npts : int
+            The number of points along each member of the results.
+        out : Optional[Tuple[np.ndarray, ...]], optional
+            The contiguous `(n, m)` matrices to write the moments, shears,
+            rotations, and deflections into. The default is None, for new
+            matrices.
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+            The `(n, m)` matrices of these moments, shears, rotations, and
+            deflections at the `m` points of the results.
+        """
+        beam = self.ba.beam
+        L = np.array(beam.mbr_lengths, dtype=float)
+        nspans = len(L)
+        n = ispan.shape[0]
+        nint = npts + 1
+        nx = npts + 3
+        w = np.broadcast_to(w, ispan.shape)
+        on = (ispan >= 0) & (w != 0)
+        rows = np.broadcast_to(np.arange(n)[:, np.newaxis], ispan.shape)[on]
+        s, a, w = ispan[on], a[on], w[on]
+        j = self._first_past(s, a, npts)
+
+        # Each load adds to the points from there to the end of its span, as
+        # laid out in the member results, with a closing point at each end
+        start = (rows * nspans + s) * nx + 1
+        steps = np.concatenate([start + j, start + nint])
+        if out is None:
+            out = tuple(np.empty((n, nspans * nx)) for _ in range(4))
+        M, V, R, D = out
+        for vals, wa in ((V, w), (M, w * a)):
+            vals.fill(0.0)
+            np.add.at(vals.reshape(-1), steps, np.concatenate([wa, -wa]))
+            vals = vals.reshape(n, nspans, nx)
+            np.cumsum(vals, axis=2, out=vals)
+            vals[:, :, [0, -1]] = 0.0
+        x = np.zeros((nspans, nx))
+        x[:, 1:-1] = (L[:, np.newaxis] / npts) * np.arange(nint)
+        np.multiply(V, x.ravel(), out=R)
+        np.subtract(R, M, out=M)
+
+        # Rotations and deflections by the trapezoidal rule, as for the results
+        for i in range(nspans):
+            sl = slice(i * nx + 1, (i + 1) * nx - 1)
+            h = L[i] / npts
+            for f, F, c in (
+                (M[:, sl], R[:, sl], beam.mbr_EIs[i]),
+                (R[:, sl], D[:, sl], 1),
+            ):
+                F[:, 0] = 0.0
+                np.add(f[:, :-1], f[:, 1:], out=F[:, 1:])
+                np.cumsum(F, axis=1, out=F)
+                F *= 0.5 * h / c
+            for F in (R, D):
+                F[:, i * nx] = F[:, i * nx + 1]
+                F[:, (i + 1) * nx - 1] = F[:, (i + 1) * nx - 2]
+        return M, V, R, D
+
+    def _first_past(self, ispan: np.ndarray, a: np.ndarray, npts: int) -> np.ndarray:
+        """
+        Returns the index along its span of the first point of the member
+        results past each point load, or `npts + 1` if there is none.
+
+        The positions of the points are found exactly as they are for the member
+        results, and a point at a load is not past it, as for
+        :meth:`pycba.load.LoadPL.add_mbr_results_into`.
+
+        Parameters
+        ----------
+        ispan : np.ndarray
+            The span index of each point load.
+        a : np.ndarray
+            The position of each load along its span.
+        npts : int
+            The number of points along each member of the results.
+
+        Returns
+        -------
+        np.ndarray
+            The index of the point past each load.
+        """
+        dx = np.array(self.ba.beam.mbr_lengths, dtype=float)[ispan] / npts
+        j = np.clip(np.floor(a / dx).astype(int) + 1, 1, npts + 1)
+        j -= dx * (j - 1) > a
+        j += (j <= npts) & (dx * np.minimum(j, npts) <= a)
+        return j
+
+    def _grid_increments(
+        self, ils: BatchResults
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns the results of the unit loads of :meth:`_unit_load_grid` as the
+        increments from point to point along each span, from which
+        :meth:`_traverse_effects` sums the results of sets of point loads.
+
+        The shears are the first values and then the increments along each
+        span. The moments are the same, but less the shear at the previous point
+        times the distance between the points, which is added back in the sums,
+        so that the kinks of the loads are only at the points past them.
+
+        Parameters
+        ----------
+        ils : BatchResults
+            The results of the unit loads.
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray, np.ndarray]
+            The `(m, nunit)` matrices of the increments of the moments and shears
+            at the `m` points of the results, and the `(nsup, nunit)` matrix of
+            the reactions.
+        """
+        L = np.array(self.ba.beam.mbr_lengths, dtype=float)
+        nx = ils.npts + 3
+        nunit = len(ils.R)
+        dx = np.diff((L[:, np.newaxis] / ils.npts) * np.arange(ils.npts + 1))
+        M = ils.results.M.reshape(nunit, len(L), nx)
+        V = ils.results.V.reshape(nunit, len(L), nx)
+        dM = M.copy()
+        dV = V.copy()
+        dM[:, :, 2:-1] = np.diff(M[:, :, 1:-1], axis=2) - dx * V[:, :, 1:-2]
+        dV[:, :, 2:-1] = np.diff(V[:, :, 1:-1], axis=2)
+        return dM.reshape(nunit, -1).T, dV.reshape(nunit, -1).T, ils.R.T
+
+    def _traverse_effects(
+        self,
+        ispan: np.ndarray,
+        a: np.ndarray,
+        w: np.ndarray,
+        grid: Tuple[np.ndarray, np.ndarray, np.ndarray],
+        npts: int,
+        out: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns the moments and shears along the beam, and the reactions, of
+        sets of positions of point loads, with the positions along the last
+        axis, as one product of the weights on the unit loads for all of them.
+
+        Parameters
+        ----------
+        ispan : np.ndarray
+            The `(nsets, npos, nloads)` array of the span index of each point
+            load at each position of each set, or -1 for loads off the beam.
+        a : np.ndarray
+            The `(nsets, npos, nloads)` array of the position of each load along
+            its span.
+        w : np.ndarray
+            The `(nsets, npos, nloads)` array of the weight of each load.
+        grid : Tuple[np.ndarray, np.ndarray, np.ndarray]
+            The unit load results, from :meth:`_grid_increments`.
+        npts : int
+            The number of points along each member of the results.
+        out : Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]], optional
+            The arrays in which to place the results, which saves allocating them
+            for each call. The default is None, for new arrays.
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray, np.ndarray]
+            The `(nsets, m, npos)` arrays of the moments and shears at the `m`
+            points of the results, and the `(nsets, nsup, npos)` array of the
+            reactions.
+        """
+        L = np.array(self.ba.beam.mbr_lengths, dtype=float)
+        nspans = len(L)
+        nx = npts + 3
+        nsets, npos, nloads = ispan.shape
+        W = self._grid_weights(
+            ispan.reshape(-1, nloads), a.reshape(-1, nloads), w.reshape(-1, nloads)
+        )
+        W = np.ascontiguousarray(W.reshape(nsets, npos, -1).transpose(0, 2, 1))
+        if out is None:
+            out = (None, None, None)
+        M, V, R = (np.matmul(A, W, out=o) for A, o in zip(grid, out))
+
+        # The step in the shear and the change of slope of the moment at the
+        # first point past each load
+        on = (ispan >= 0) & (w != 0)
+        iset, ipos, _ = np.nonzero(on)
+        s, a, w = ispan[on], a[on], w[on]
+        j = self._first_past(s, a, npts)
+        past = j <= npts
+        at = ((iset * nspans + s) * nx + 1 + j)[past] * npos + ipos[past]
+        np.add.at(V.reshape(-1), at, -w[past])
+        np.add.at(M.reshape(-1), at, -(w * (L[s] / npts * j - a))[past])
+
+        # Sum the increments along each span, of the moment by the shears
+        dx = np.diff((L[:, np.newaxis] / npts) * np.arange(npts + 1))
+        Ms = M.reshape(nsets, nspans, nx, npos)
+        Vs = V.reshape(nsets, nspans, nx, npos)
+        for k in range(2, nx - 1):
+            Vs[:, :, k] += Vs[:, :, k - 1]
+        Ms[:, :, 2:-1] += dx[:, :, np.newaxis] * Vs[:, :, 1:-2]
+        for k in range(2, nx - 1):
+            Ms[:, :, k] += Ms[:, :, k - 1]
+        return M, V, R
+
+    def run_fleet(
+        self, fleet: VehicleFleet, step: float, chunk: Optional[int] = None
+    ) -> FleetEnvelopes:
+        """
+        Runs each vehicle of a fleet over the bridge, finding the envelopes of
+        each vehicle in a batch.
+
+        As for the **influence** method of :meth:`run_vehicle`, the results of
+        unit loads at the ends and third points of each span are found once with
+        one factorization, and are shared by all the vehicles. The results of
+        each chunk of vehicles, for all of their positions, are then found
+        together as a single product of the axle weights interpolated onto
+        these unit loads.
+
+        Any loads already defined on the bridge are superimposed on every
+        position of every vehicle. The vehicle of the bridge analysis is not
+        used, nor are :attr:`pos` and :attr:`vResults` set.
+
+        Parameters
+        ----------
+        fleet : VehicleFleet
+            The :class:`pycba.vehicle.VehicleFleet` of the vehicles to run.
+        step : float
+            The distance increment to move each vehicle.
+        chunk : Optional[int], optional
+            The number of vehicles whose results are found together. The default
+            is None, for chunks whose results are about 32 MB.
+
+        Raises
+        ------
+        ValueError
+            If the static beam analysis does not succeed, usually due to a beam
+            configuration error, if no bridge is defined, or if the chunk is less
+            than one.
+
+        Returns
+        -------
+        FleetEnvelopes
+            The load effect envelopes of each vehicle.
+        """
+        if not self.ba:
+            raise ValueError("A bridge must be defined in advance")
+        L = self.ba.beam.length
+        try:
+            ils = self._unit_load_grid()
+        except np.linalg.LinAlgError:
+            raise ValueError("Bridge analysis did not succeed")
+
+        # The unit load results, and those of any static loads
+        grid = self._grid_increments(ils)
+        x = ils.results.x
+        npts = len(x)
+        nsup = ils.R.shape[1]
+        base = {"M": np.zeros(npts), "V": np.zeros(npts), "R": np.zeros(nsup)}
+        if self.static_LM:
+            self.ba.set_loads(self.static_LM)
+            self.ba.analyze()
+            static = self.ba.beam_results
+            base = {"M": static.results.M, "V": static.results.V, "R": static.R}
+
+        nveh = len(fleet)
+        npos = np.round((L + fleet.L) / step).astype(int) + 1
+        if chunk is None:
+            chunk = max(1, 2**22 // (npos.max() * (2 * npts + nsup)))
+        if chunk < 1:
+            raise ValueError("The chunk must be at least one vehicle")
+
+        env = {}
+        idx = {}
+        for key, n in [("M", npts), ("V", npts), ("R", nsup)]:
+            for ext in ["max", "min"]:
+                env[key + ext] = np.zeros((nveh, n))
+                idx[key + ext] = np.full((nveh, n), -1)
+
+        # Vehicles of similar lengths are chunked together, and positions past
+        # the end of a vehicle's traverse repeat its last one
+        order = np.argsort(npos, kind="stable")
+        bufs = [np.empty(min(chunk, nveh) * n * npos.max()) for n in (npts, npts, nsup)]
+        for v0 in range(0, nveh, chunk):
+            v = order[v0 : v0 + chunk]
+            ipos = np.minimum(np.arange(npos[v].max()), npos[v, np.newaxis] - 1)
+            ispan, a = self.ba.beam.get_local_span_coords_array(
+                step * ipos[:, :, np.newaxis] - fleet.axle_coords[v, np.newaxis]
+            )
+            w = np.where(ispan >= 0, fleet.axw[v, np.newaxis], 0.0)
+            out = tuple(
+                b[: len(v) * n * ipos.shape[1]].reshape(len(v), n, ipos.shape[1])
+                for b, n in zip(bufs, (npts, npts, nsup))
+            )
+            res = self._traverse_effects(ispan, a, w, grid, ils.npts, out)
+
+            # The first position of each extreme beyond zero, to which the
+            # static results, the same for every position, are then added
+            for key, vals in zip("MVR", res):
+                for ext in ["max", "min"]:
+                    if ext == "max":
+                        i = vals.argmax(axis=2)
+                    else:
+                        i = vals.argmin(axis=2)
+                    e = np.take_along_axis(vals, i[:, :, np.newaxis], axis=2)[:, :, 0]
+                    e += base[key]
+                    beyond = e > 0 if ext == "max" else e < 0
+                    env[key + ext][v] = np.where(beyond, e, 0.0)
+                    idx[key + ext][v] = np.where(beyond, i, -1)
+
+        pos = [step * np.arange(n) for n in npos]
+        return FleetEnvelopes(
+            x,
+            pos,
+            env["Vmax"],
+            env["Vmin"],
+            env["Mmax"],
+            env["Mmin"],
+            env["Rmax"],
+            env["Rmin"],
+            idx,
+        )
+
     def critical_values(
-        self, env: Envelopes
+        self, env: Envelopes, ties: bool = False
     ) -> Dict[str, Dict[str, Union[float, np.ndarray]]]:
         """
         From the envelopes output, returns the extreme values, their locations,
@@ -276,6 +1569,10 @@ class BridgeAnalysis:
         env : Envelopes
             An `pycba.Envelopes` object containing the results of a moving load
             analysis.
+        ties : bool, optional
+            Whether or not to find every vehicle position giving each extreme to
+            within tolerance, by searching the results of each position in
+            :attr:`vResults`. The default is False, for the first position only.
 
         Raises
         ------
@@ -287,77 +1584,271 @@ class BridgeAnalysis:
         -------
         crit_values : Dict[str, Dict[str, Union[float, np.ndarray]]]
             A dictionary of dictionaries containing the critical values (i.e. extremes)
-            of each of the load effects, both maximum and minimum.
+            of each of the load effects, both maximum and minimum. The vehicle
+            position of each is the first to give it, as found from the indices
+            :attr:`pycba.results.Envelopes.idx`, which also give the critical
+            vehicle positions for every point along the beam. If `ties`, or the
+            envelopes have no indices (such as after
+            :meth:`pycba.results.Envelopes.augment`), the positions are all those
+            giving it, found from the results of each position.
         """
 
         crit_values = {}
         indx = {}
-
-        Mmax = env.Mmax.max()
-        Mmin = env.Mmin.min()
-        Vmax = env.Vmax.max()
-        Vmin = env.Vmin.min()
+        keys = ["Mmax", "Mmin", "Vmax", "Vmin"]
+        envs = [env.Mmax, env.Mmin, env.Vmax, env.Vmin]
+        at = {
+            key: vals.argmax() if key.endswith("max") else vals.argmin()
+            for key, vals in zip(keys, envs)
+        }
 
         # Find the indices of the critical vehicle positions
-        indx["Mmax"] = [
-            i
-            for i, res in enumerate(self.vResults)
-            if np.isclose(res.results.M.max(), Mmax)
-        ]
-        indx["Mmin"] = [
-            i
-            for i, res in enumerate(self.vResults)
-            if np.isclose(res.results.M.min(), Mmin)
-        ]
-        indx["Vmax"] = [
-            i
-            for i, res in enumerate(self.vResults)
-            if np.isclose(res.results.V.max(), Vmax)
-        ]
-        indx["Vmin"] = [
-            i
-            for i, res in enumerate(self.vResults)
-            if np.isclose(res.results.V.min(), Vmin)
-        ]
-
-        # Now check for any errors
-        if [] in indx.values():
-            raise ValueError("Envelope not from the current bridge analysis")
+        if ties or env.idx is None:
+            for key, vals in zip(keys, envs):
+                res_vals = [getattr(res.results, key[0]) for res in self.vResults]
+                ext = [v.max() if key.endswith("max") else v.min() for v in res_vals]
+                indx[key] = np.nonzero(np.isclose(ext, vals[at[key]]))[0].tolist()
+            # Now check for any errors
+            if [] in indx.values():
+                raise ValueError("Envelope not from the current bridge analysis")
+        else:
+            if env.nres != len(self.pos):
+                raise ValueError("Envelope not from the current bridge analysis")
+            for key in keys:
+                i = env.idx[key][at[key]]
+                indx[key] = [i] if i >= 0 else []
 
         # Good to proceed
-        crit_values["Mmax"] = {
-            "val": Mmax,
-            "at": env.x[env.Mmax.argmax()],
-            "pos": [self.pos[i] for i in indx["Mmax"]],
-        }
-        crit_values["Mmin"] = {
-            "val": Mmin,
-            "at": env.x[env.Mmin.argmin()],
-            "pos": [self.pos[i] for i in indx["Mmin"]],
-        }
-        crit_values["Vmax"] = {
-            "val": Vmax,
-            "at": env.x[env.Vmax.argmax()],
-            "pos": [self.pos[i] for i in indx["Vmax"]],
-        }
-        crit_values["Vmin"] = {
-            "val": Vmin,
-            "at": env.x[env.Vmin.argmin()],
-            "pos": [self.pos[i] for i in indx["Vmin"]],
-        }
+        for key, vals in zip(keys, envs):
+            crit_values[key] = {
+                "val": vals[at[key]],
+                "at": env.x[at[key]],
+                "pos": [self.pos[i] for i in indx[key]],
+            }
         crit_values["nsup"] = env.nsup
         for i in range(env.nsup):
+            if env.idx is not None:
+                # The first position if a reaction is never non-zero
+                imax = max(env.idx["Rmax"][i], 0)
+                imin = max(env.idx["Rmin"][i], 0)
+            elif env.Rmax.shape[1] == len(self.pos):
+                imax = env.Rmax[i, :].argmax()
+                imin = env.Rmin[i, :].argmin()
+            else:
+                raise ValueError("Envelope not from the current bridge analysis")
             crit_values[f"Rmax{i}"] = {
-                "val": env.Rmax[i, :].max(),
-                "pos": self.pos[env.Rmax[i, :].argmax()],
+                "val": env.Rmaxval[i],
+                "pos": self.pos[imax],
             }
             crit_values[f"Rmin{i}"] = {
-                "val": env.Rmin[i, :].min(),
-                "pos": self.pos[env.Rmin[i, :].argmin()],
+                "val": env.Rminval[i],
+                "pos": self.pos[imin],
             }
 
         return crit_values
 
+    def critical_positions(
+        self, poi: float, load_effect: str
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        Finds the exact extremes of a load effect at a point of interest over the
+        traverse of the vehicle, and the vehicle positions giving them, without
+        stepping the vehicle.
+
+        The influence line of the effect is piecewise cubic (see
+        :meth:`pycba.inf_lines.InfluenceLines.get_il_function`), and so the effect
+        of the vehicle is also a piecewise cubic of its position, with
+        breakpoints where an axle is over a breakpoint of the influence line.
+        The extremes are then at these candidate positions or at the stationary
+        points of the cubics between them, which are all that is evaluated.
+
+        Parameters
+        ----------
+        poi : float
+            The position of interest in global coordinates along the length of the
+            beam. A `poi` at an internal node is taken at the start of the
+            following span.
+        load_effect : str
+            A single character to identify the load effect of interest, as for
+            :meth:`pycba.inf_lines.InfluenceLines.get_il_mb`.
+
+        Raises
+        ------
+        ValueError
+            If the `poi` is not on the beam or the load effect is not supported.
+
+        Returns
+        -------
+        Dict[str, Dict[str, float]]
+            For the keys **max** and **min**, the extreme value of the effect,
+            including any static loads, as "val", and the position of the front
+            axle giving it as "pos". Where the effect steps as an axle passes the
+            `poi`, the extreme limiting value is given.
+        """
+        self._check_objects()
+        f = self._influence_lines().get_il_function(poi, load_effect)
+        static = self._static_effect(self._static_results(), poi, load_effect)
+        return self._critical_positions(f, static)
+
+    def _critical_positions(
+        self, f: InfluenceFunction, static: float
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        Finds the extremes of the effect of the vehicle over its traverse from the
+        influence function of the effect, superimposing a static effect.
+        """
+        coords = self.veh.axle_coords
+        w = np.asarray(self.veh.axw, dtype=float)
+        Ltot = self.ba.beam.length + self.veh.L
+
+        # The vehicle positions with an axle over a breakpoint of the IL
+        breaks = (f.breaks[:, np.newaxis] + coords).ravel()
+        breaks = np.unique(np.clip(np.concatenate(([0.0, Ltot], breaks)), 0.0, Ltot))
+        breaks = breaks[np.concatenate(([True], np.diff(breaks) > 1e-9 * Ltot))]
+        breaks[-1] = Ltot
+        h = np.diff(breaks)
+
+        # The effect is a cubic between these, fitted as for the IL itself
+        pos = breaks[:-1, np.newaxis] + h[:, np.newaxis] * InfluenceFunction.U_FIT
+        eta = f(pos[..., np.newaxis] - coords) @ w
+        effect = InfluenceFunction(breaks, eta @ InfluenceFunction.V_FIT_INV.T)
+
+        (pmax, vmax), (pmin, vmin) = effect.extrema()
+        return {
+            "max": {"val": vmax + static, "pos": pmax},
+            "min": {"val": vmin + static, "pos": pmin},
+        }
+
+    def _influence_lines(self) -> InfluenceLines:
+        """
+        Returns the influence lines object of the bridge, created again only if
+        the beam has changed.
+        """
+        beam = self.ba.beam
+        if self._il is None or self._il[0] != beam.fingerprint:
+            il = InfluenceLines(
+                beam.mbr_lengths, beam.mbr_EIs, beam.restraints, beam.mbr_eletype
+            )
+            self._il = (beam.fingerprint, il)
+        return self._il[1]
+
+    def _static_results(self) -> Optional[BeamResults]:
+        """
+        Returns the results of the static loads alone, or None if there are none.
+        """
+        if not self.static_LM:
+            return None
+        self.ba.set_loads(self.static_LM)
+        self.ba.analyze()
+        return self.ba.beam_results
+
+    def _static_effect(
+        self, static: Optional[BeamResults], poi: float, load_effect: str
+    ) -> float:
+        """
+        Returns the effect of the static loads at a point of interest from their
+        results, evaluated exactly at the `poi` rather than on the results grid.
+        """
+        if static is None:
+            return 0.0
+        load_effect = load_effect.upper()
+        beam = self.ba.beam
+        if load_effect in ("R", "MR"):
+            il = self._influence_lines()
+            return float(static.R[il._reaction_index(poi, load_effect)])
+
+        # The member results at the poi, as in the BeamResults, between the
+        # member end points that the loads leave unchanged
+        i_span, a0 = beam.get_local_span_coords(poi)
+        L = beam.mbr_lengths[i_span]
+        d = static.D[2 * i_span : 2 * i_span + 4]
+        fmbr = beam.get_span_k(i_span) @ d + beam.get_ref(i_span)
+        res = MemberResults(n=3)
+        x = np.array([0.0, a0, L])
+        LoadMaMb(i_span=i_span, Ma=fmbr[1], Mb=fmbr[3]).add_mbr_results_into(res, x, L)
+        for load in beam.get_span_loads(i_span):
+            load.add_mbr_results_into(res, x, L)
+        return float(res.M[1] if load_effect == "M" else res.V[1])
+
+    def refine_envelopes(
+        self, env: Envelopes, points: Optional[np.ndarray] = None
+    ) -> Envelopes:
+        """
+        Refines the envelopes of a stepped traverse, from :meth:`run_vehicle`, to
+        the exact extremes at their points, as found by
+        :meth:`critical_positions`, so that extremes between the vehicle
+        positions are not missed.
+
+        Parameters
+        ----------
+        env : Envelopes
+            The envelopes of the traverse of the vehicle over this bridge.
+        points : Optional[np.ndarray]
+            The indices of the points of the envelopes to refine. The default is
+            all of them. The duplicated points closing each member, and the
+            shears at the ends of each member but the last (since a `poi` at a
+            node is taken at the start of the following span), are not refined.
+
+        Raises
+        ------
+        ValueError
+            If the envelopes are not of this bridge.
+
+        Returns
+        -------
+        Envelopes
+            A copy of the envelopes with the refined moments and shears at the
+            points, and the refined extreme reactions :attr:`Rmaxval` and
+            :attr:`Rminval`. The indices of the analyses giving the extremes,
+            and the results of each analysis, are not kept.
+        """
+        self._check_objects()
+        beam = self.ba.beam
+        nmbr = env.npts // beam.no_spans
+        if nmbr * beam.no_spans != env.npts or env.nsup != beam.no_fixed_restraints:
+            raise ValueError("Envelopes not of the current bridge")
+
+        # The points of each member closing the diagrams, and at its end
+        j = np.arange(env.npts) % nmbr
+        ends = nmbr == self.ba.npts + 3
+        closing = (j == 0) | (j == nmbr - 1) if ends else np.zeros(env.npts, bool)
+        at_end = (j == nmbr - 2) if ends else (j == nmbr - 1)
+        at_end[-nmbr:] = False
+
+        refine = np.zeros(env.npts, bool)
+        refine[np.arange(env.npts) if points is None else points] = True
+        refine &= ~closing
+
+        env = env.scaled(1.0)
+        env.vResults = []
+        env.idx = None
+        il = self._influence_lines()
+        static = self._static_results()
+
+        def refined(poi: float, load_effect: str) -> Dict[str, Dict[str, float]]:
+            f = il.get_il_function(poi, load_effect)
+            return self._critical_positions(
+                f, self._static_effect(static, poi, load_effect)
+            )
+
+        for load_effect, vmax, vmin, on in [
+            ("M", env.Mmax, env.Mmin, refine),
+            ("V", env.Vmax, env.Vmin, refine & ~at_end),
+        ]:
+            for k in np.nonzero(on)[0]:
+                crit = refined(env.x[k], load_effect)
+                vmax[k] = max(vmax[k], crit["max"]["val"])
+                vmin[k] = min(vmin[k], crit["min"]["val"])
+
+        # The reactions at the supports in the order of the restrained DOFs
+        nodes = np.array(beam._terminal_coords, dtype=float)
+        for i, dof in enumerate(beam.fixed_dofs):
+            crit = refined(nodes[dof // 2], "R" if dof % 2 == 0 else "MR")
+            env.Rmaxval[i] = max(env.Rmaxval[i], crit["max"]["val"])
+            env.Rminval[i] = min(env.Rminval[i], crit["min"]["val"])
+
+        return env
+
     def envelopes_ratios(
         self, trial_env: Envelopes, ref_env: Envelopes
     ) -> Dict[str, np.ndarray]:
@@ -618,3 +2109,69 @@ class BridgeAnalysis:
             raise ValueError("A bridge must be defined in advance")
         if not self.veh:
             raise ValueError("A vehicle must be defined in advance")
+
+
+# The bridge analysis of each worker process of a parallel traverse
+_worker = None
+
+
+def _init_worker(ba: BeamAnalysis, veh: Vehicle, static_LM: List):
+    """
+    Creates the bridge analysis of a worker process, once for all of its tasks.
+    """
+    global _worker
+    _worker = BridgeAnalysis(ba, veh)
+    _worker.static_LM = static_LM
+
+
+def _run_chunk(task: Tuple) -> Envelopes:
+    """
+    Runs a task of a parallel traverse in a worker process.
+    """
+    return _worker._run_positions(*task)
+
+
+def _merge_envelopes(a: Envelopes, b: Envelopes) -> Envelopes:
+    """
+    Merges the streaming envelopes of consecutive parts of a traverse.
+    """
+    a.merge(b)
+    return a
+
+
+def _interval_bound(
+    p: np.ndarray,
+    v: np.ndarray,
+    dl: Optional[np.ndarray] = None,
+    dr: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Bounds from above the ordinates `v` of each row of positions `p` over each
+    interval between the positions, from the slopes of its neighbouring
+    intervals. A rise then a fall about an interval is a peak or a kink within
+    it, bounded by where the neighbouring slopes meet, each steepened by as much
+    again as it steepens from the slope beyond it. An interval steeper than
+    both its neighbours holds a jump, as when an axle passes a point, and the
+    higher end is continued across it at the steeper neighbouring slope. The
+    slopes `dl` of the two intervals before the positions, and `dr` of the two
+    after them, are zero by default, as at the ends of a traverse.
+    """
+    a, b = v[:-1], v[1:]
+    h = np.diff(p)[:, np.newaxis]
+    d = (b - a) / h
+    zero = np.zeros((2,) + v.shape[1:])
+    dl = zero if dl is None else dl
+    dr = zero if dr is None else dr
+    dpad = np.vstack([dl, d, dr])
+    sl, sr = dpad[1:-3], -dpad[3:-1]
+    bound = np.maximum(a, b)
+
+    peak = (sl > 0) & (sr > 0)
+    kl = sl + np.maximum(sl - dpad[:-4], 0.0)
+    kr = sr + np.maximum(sr + dpad[4:], 0.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        meet = (a * kr + b * kl + kl * kr * h) / (kl + kr)
+    bound = np.where(peak, np.maximum(bound, meet), bound)
+
+    steep = np.maximum(np.abs(sl), np.abs(sr))
+    return np.where(np.abs(d) > steep, bound + h * steep, bound)
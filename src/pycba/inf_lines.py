@@ -1,10 +1,18 @@
 """
 PyCBA - Continuous Beam Analysis - Influence Lines Module
 """
-from typing import Optional, Union
+from __future__ import annotations
+from typing import Optional, Union, List, Tuple, Dict, Iterable
+import os
+import shutil
+import hashlib
+import tempfile
 import numpy as np
 import matplotlib.pyplot as plt
 from .analysis import BeamAnalysis
+from .beam import Beam
+from .load import LoadTable, MemberResults
+from .results import BatchResults, BeamResults
 
 
 class InfluenceLines:
@@ -40,14 +48,23 @@ class InfluenceLines:
         """
         self.ba = BeamAnalysis(L=L, EI=EI, R=R, eletype=eletype)
         self.L = self.ba.beam.length
-        self.vResults = []
+        self.il_results = None
         self.pos = []
+        self._load_val = 1.0
+        self._vResults = None
 
-    def create_ils(self, step: Optional[float] = None, load_val: float = 1.0):
+    def create_ils(
+        self,
+        step: Optional[float] = None,
+        load_val: float = 1.0,
+        cache: Optional[ILCache] = None,
+    ):
         """
         Creates the influence lines by marching the unit load (`load_val`) across
-        the defined beam configuration in `step` distance increments, storing the
-        static analysis results in a vector of :class:`pycba.results.BeamResults`.
+        the defined beam configuration in `step` distance increments. Each load
+        position is a load case of a single analysis of many load cases, and the
+        results are stored in a :class:`pycba.results.BatchResults` object, in
+        which each row of the load effects is for a load position.
 
         Parameters
         ----------
@@ -55,6 +72,10 @@ class InfluenceLines:
             The distance increment to move the unit load; defaults to beam length / 100.
         load_val : float, optional
             The nominal value of the "unit load". The default is 1.0.
+        cache : Optional[ILCache]
+            An on-disk cache of influence lines: if it has the influence lines of
+            this beam, they are opened from it instead of being calculated, and
+            otherwise they are calculated and stored in it. The default is None.
 
         Raises
         ------
@@ -66,31 +87,124 @@ class InfluenceLines:
         -------
         None.
         """
-        self.vResults = []  # reset
-
         if step is None:
             step = self.L / 100
 
         npts = round(self.L / step) + 1
-
-        for i in range(npts):
-            # load position
-            pos = i * step
-            self.pos.append(pos)
-            # locate load on span
-            ispan, pos_in_span = self.ba.beam.get_local_span_coords(pos)
-            if ispan == -1:
-                load_val = 0.0
-            # assemble and set load matrix
-            self.ba.set_loads([[ispan + 1, 2, load_val, pos_in_span, 0]])
-            # analyze
-            out = self.ba.analyze()
-            if out != 0:
-                raise ValueError("IL analysis did not succeed")
+        self._load_val = load_val
+        self._vResults = None
+
+        if cache is not None:
+            key = cache.key(self.ba.beam, step, self.ba.npts, load_val)
+            names = ("pos", "x", "M", "V", "R", "D", "d", "r")
+            arrays = cache.load(key, names)
+            if arrays is not None:
+                self.pos = arrays["pos"].tolist()
+                vals = tuple(arrays[k] for k in ("x", "M", "V", "R", "D"))
+                self.il_results = BatchResults.from_arrays(
+                    arrays["d"], arrays["r"], MemberResults(vals=vals), self.ba.npts
+                )
                 return
-            self.vResults.append(self.ba.beam_results)
 
-    def get_il(self, poi: float, load_effect: str) -> (np.ndarray, np.ndarray):
+        # load positions, and located on the spans
+        self.pos = (step * np.arange(npts)).tolist()
+        vspan, vpos_in_span = self.ba.beam.get_local_span_coords_array(self.pos)
+
+        # A load case for each position, unloaded when off the beam
+        LMs = [
+            [[ispan + 1, 2, load_val, pos_in_span, 0]] if ispan != -1 else []
+            for ispan, pos_in_span in zip(vspan.tolist(), vpos_in_span.tolist())
+        ]
+        try:
+            self.il_results = self.ba.analyze_many(LMs)
+        except np.linalg.LinAlgError:
+            raise ValueError("IL analysis did not succeed")
+
+        if cache is not None:
+            res = self.il_results
+            cache.save(
+                key,
+                {
+                    "pos": np.array(self.pos),
+                    "x": res.results.x,
+                    "M": res.results.M,
+                    "V": res.results.V,
+                    "R": res.results.R,
+                    "D": res.results.D,
+                    "d": res.D,
+                    "r": res.R,
+                },
+            )
+
+    @property
+    def vResults(self) -> List[BeamResults]:
+        """
+        The :class:`pycba.results.BeamResults` of the unit load at each position,
+        as a list, for compatibility with code written before the results were
+        kept as a single :attr:`il_results` batch. These are created on first
+        access and then kept, so :attr:`il_results` should be preferred.
+        """
+        if self.il_results is None:
+            return []
+        if self._vResults is not None:
+            return self._vResults
+        beam = self.ba.beam
+        ispan, a = beam.get_local_span_coords_array(self.pos)
+        vResults = []
+        for i, (d, r) in enumerate(zip(self.il_results.D, self.il_results.R)):
+            LM = []
+            if ispan[i] != -1:
+                LM = [[int(ispan[i]) + 1, 2, self._load_val, float(a[i]), 0]]
+            self.ba.set_loads(LM)
+            beam._set_loads()
+            vResults.append(BeamResults(beam, d, r, self.il_results.npts))
+        self._vResults = vResults
+        return vResults
+
+    def get_il_matrix(self, load_effect: str) -> (np.ndarray, np.ndarray, np.ndarray):
+        """
+        Returns the influence ordinates for a load effect at all points along the
+        beam for all load positions.
+
+        Parameters
+        ----------
+        load_effect : str
+            A single character to identify the load effect of interest, currently
+            one of:
+
+                - **V**: shear force
+                - **M**: bending moment
+                - **D**: deflection
+                - **R**: reactions at the restrained degrees of freedom
+
+        Returns
+        -------
+        (pos,x,eta) : tuple(np.ndarray,np.ndarray,np.ndarray)
+            A tuple of the vector of load positions, the vector of points along the
+            beam, and the `(n_positions, n_points)` matrix of influence ordinates.
+            For reactions, `x` is the vector of restrained degrees of freedom and
+            the matrix is `(n_positions, nsup)`.
+        """
+        if self.il_results is None:
+            self.create_ils()
+
+        res = self.il_results
+        load_effect = load_effect.upper()
+        if load_effect == "R":
+            x = np.array(self.ba.beam.fixed_dofs)
+            eta = res.R
+        elif load_effect == "V":
+            x, eta = res.results.x, res.results.V
+        elif load_effect == "D":
+            x, eta = res.results.x, res.results.D
+        else:
+            x, eta = res.results.x, res.results.M
+
+        return (np.asarray(self.pos), x, eta)
+
+    def get_il(
+        self, poi: float, load_effect: str, method: str = "matrix"
+    ) -> (np.ndarray, np.ndarray):
         """
         Returns the influence line at a point of interest for a load effect.
 
@@ -105,68 +219,254 @@ class InfluenceLines:
 
                 - **V**: shear force
                 - **M**: bending moment
+                - **D**: deflection
                 - **R**: vertical reaction at a fully restrained support
 
             The vertical reaction nearest the `poi` is used. For moment reactions
             use a poi at or just beside the support.
+        method : str, optional
+            Either **matrix** (default), to slice the influence matrices from
+            :meth:`create_ils`, for which the `poi` must be on the results grid;
+            or **muller-breslau**, for a single analysis at any `poi` using
+            :meth:`get_il_mb`.
+
+        Raises
+        ------
+        ValueError
+            For the matrix method, if the `poi` is not on the results grid.
 
         Returns
         -------
         (x,eta) : tuple(np.ndarray,np.ndarray)
             A tuple of the vectors of abcissa and influence ordinates.
         """
-        if not self.vResults:
+        if method == "muller-breslau":
+            return self.get_il_mb(poi, load_effect)
+
+        if self.il_results is None:
             self.create_ils()
 
-        x = self.vResults[0].results.x
-        npts = len(self.vResults)
-        eta = np.zeros(npts)
+        res = self.il_results
+        load_effect = load_effect.upper()
+        if load_effect in ("R", "MR"):
+            eta = res.R[:, self._reaction_index(poi, load_effect)]
+        elif load_effect == "V":
+            eta = res.results.V[:, self._point_index(poi)]
+        elif load_effect == "D":
+            eta = res.results.D[:, self._point_index(poi)]
+        else:
+            eta = res.results.M[:, self._point_index(poi)]
 
-        # Preparations for reaction ILs
-        #
+        return (np.asarray(self.pos), eta)
+
+    def _point_index(self, poi: float) -> int:
+        """
+        Returns the index of a point of interest in the results grid, directly
+        from the sample spacing of its span. A point at an internal node is the
+        end of the span to its left.
+
+        Parameters
+        ----------
+        poi : float
+            The position of interest in global coordinates along the length of the
+            beam.
+
+        Raises
+        ------
+        ValueError
+            If the `poi` is not on the results grid.
+
+        Returns
+        -------
+        int
+            The index of the point in the results grid
+        """
+        L = np.array(self.ba.beam.mbr_lengths, dtype=float)
+        npts = self.il_results.npts
+        x = self.il_results.results.x
+        tol = (x[2] - x[1]) * 1e-6
+
+        ispan = int(np.searchsorted(np.cumsum(L), poi - tol))
+        if ispan < len(L):
+            k = round((poi - (L[:ispan].sum())) / (L[ispan] / npts))
+            idx = ispan * (npts + 3) + (k + 1 if k > 0 else 0)
+            if 0 <= k <= npts and abs(x[idx] - poi) <= tol:
+                return idx
+        raise ValueError(f"The point of interest {poi} is not on the results grid")
+
+    def get_il_mb(
+        self, poi: float, load_effect: str, pos: Optional[np.ndarray] = None
+    ) -> (np.ndarray, np.ndarray):
+        """
+        Returns the influence line at an arbitrary point of interest for a load
+        effect using the Müller-Breslau principle: the influence line is the
+        deflected shape of the beam due to a unit discontinuity for the load
+        effect at the `poi` (a relative rotation for moment, a relative
+        translation for shear, or a unit displacement of the support for a
+        reaction). This requires a single solution of the stiffness equations,
+        using the cached stiffness factorization, rather than an analysis for
+        each load position.
+
+        Parameters
+        ----------
+        poi : float
+            The position of interest in global coordinates along the length of the
+            beam. It need not be on the results grid. A `poi` at an internal node
+            is taken at the start of the following span.
+        load_effect : str
+            A single character to identify the load effect of interest, currently
+            one of:
+
+                - **V**: shear force
+                - **M**: bending moment
+                - **R**: vertical reaction at a fully restrained support
+                - **MR**: moment reaction at a fully restrained support
+
+            The reaction nearest the `poi` is used.
+        pos : Optional[np.ndarray]
+            The positions of the unit load along the beam at which the influence
+            ordinates are required. The default is the positions of the created
+            influence lines, if any, or otherwise 101 points along the beam.
+
+        Raises
+        ------
+        ValueError
+            If the `poi` is not on the beam or the load effect is not supported.
+
+        Returns
+        -------
+        (x,eta) : tuple(np.ndarray,np.ndarray)
+            A tuple of the vectors of abcissa and influence ordinates.
+        """
+        beam = self.ba.beam
+        if pos is None:
+            pos = self.pos if len(self.pos) else np.linspace(0, self.L, 101)
+        pos = np.asarray(pos, dtype=float)
+
+        load_effect = load_effect.upper()
+        nDOF = 2 * (beam.no_spans + 1)
+        c = np.zeros(nDOF)  # the effect as a linear function of the displacements
+
+        if load_effect in ("M", "V"):
+            i_span, a0 = beam.get_local_span_coords(poi)
+            if i_span == -1:
+                raise ValueError("The POI must be on the beam")
+            L = beam.mbr_lengths[i_span]
+            # The effect at a0 from the member end forces: g.(kb.d + ref)
+            if load_effect == "M":
+                g = np.array([0.0, a0 / L - 1, 0.0, a0 / L])
+            else:
+                g = np.array([0.0, 1 / L, 0.0, 1 / L])
+            c[2 * i_span : 2 * i_span + 4] = beam.get_span_k(i_span).T @ g
+        elif load_effect in ("R", "MR"):
+            # The reaction is the row of the stiffness matrix for its DOF
+            k = beam.fixed_dofs[self._reaction_index(poi, load_effect)]
+            for i in range(max(k // 2 - 1, 0), min(k // 2, beam.no_spans - 1) + 1):
+                c[2 * i : 2 * i + 4] += beam.get_span_k(i)[k - 2 * i]
+        else:
+            raise ValueError(f"Unsupported load effect {load_effect}")
+
+        # The deflected shape for the unit discontinuity, by reciprocity
+        self.ba._factorize()
+        z = self.ba._solve_free(c)
+
+        # The nodal loads of the unit load at each position
+        ispan, a = beam.get_local_span_coords_array(pos)
+        LMs = [
+            [[i + 1, 2, 1.0, ai, 0]] if i != -1 else []
+            for i, ai in zip(ispan.tolist(), a.tolist())
+        ]
+        table = LoadTable(LMs, beam.no_spans)
+        ref = table.get_ref(beam.mbr_lengths, beam.mbr_eletype)
+        dof = 2 * table.span[:, np.newaxis] + np.arange(4)
+        eta = np.zeros(len(pos))
+
+        # The nodal loads are the negative of the released end forces
+        np.add.at(eta, table.case, -np.sum(z[dof] * ref, axis=1))
+
+        if load_effect in ("M", "V"):
+            # The released end forces and simple span effects of loads in the span
+            on = table.span == i_span
+            cases = table.case[on]
+            np.add.at(eta, cases, ref[on] @ g)
+            al = table.a[on]
+            Va = (L - al) / L
+            if load_effect == "M":
+                np.add.at(eta, cases, Va * a0 - np.maximum(a0 - al, 0.0))
+            else:
+                np.add.at(eta, cases, Va - (a0 > al))
+        else:
+            # Less the nodal load applied directly at the support
+            on = dof == k
+            np.add.at(eta, table.case[on.any(axis=1)], ref[on])
+
+        return (pos, eta)
+
+    def get_il_function(self, poi: float, load_effect: str) -> InfluenceFunction:
+        """
+        Returns the exact influence line at a point of interest for a load effect,
+        as an :class:`pycba.inf_lines.InfluenceFunction` object.
+
+        The influence lines of prismatic beams are cubic between the nodes and the
+        `poi`, so the cubic of each of these segments is found exactly from the
+        Müller-Breslau ordinates (see :meth:`get_il_mb`) at four points within it.
+
+        Parameters
+        ----------
+        poi : float
+            The position of interest in global coordinates along the length of the
+            beam.
+        load_effect : str
+            A single character to identify the load effect of interest, as for
+            :meth:`get_il_mb`.
+
+        Returns
+        -------
+        InfluenceFunction
+            The piecewise-cubic influence line.
+        """
+        breaks = np.array(self.ba.beam._terminal_coords, dtype=float)
+        if load_effect.upper() in ("M", "V"):
+            breaks = np.union1d(breaks, [poi])
+        h = np.diff(breaks)
+        breaks = breaks[np.concatenate(([True], h > 0))]
+        h = np.diff(breaks)
+
+        # Sample within each segment, avoiding any step at its ends
+        pos = breaks[:-1, np.newaxis] + h[:, np.newaxis] * InfluenceFunction.U_FIT
+        (_, eta) = self.get_il_mb(poi, load_effect, pos=pos.ravel())
+        coeffs = eta.reshape(-1, 4) @ InfluenceFunction.V_FIT_INV.T
+
+        return InfluenceFunction(breaks, coeffs)
+
+    def _reaction_index(self, poi: float, load_effect: str) -> int:
+        """
+        Returns the index in the reactions vector of the support nearest the `poi`.
+
+        Parameters
+        ----------
+        poi : float
+            The position of interest in global coordinates along the length of the
+            beam.
+        load_effect : str
+            Either **R** for a vertical reaction or **MR** for a moment reaction.
+
+        Returns
+        -------
+        int
+            The index of the reaction in the reactions vector
+        """
         # Get vector of the node locations
         node_locations = np.cumsum(np.insert(self.ba.beam.mbr_lengths, 0, 0))
         # Link the supported DOF to the index in the BeamAnalysis reactions vector
-        idx_mask = np.zeros_like(self.ba._beam.restraints)
+        idx_mask = np.zeros(len(self.ba._beam.restraints), dtype=int)
         idx_mask[np.where(np.array(self.ba._beam.restraints) == -1)] = np.arange(
             self.ba.beam.no_fixed_restraints
         )
 
-        # idx = np.abs(x - poi).argmin()
-
-        if load_effect.upper() == "V":
-            dx = x[2] - x[1]
-            idx = np.where(np.abs(x - poi) <= dx * 1e-6)[0][0]
-            for i, res in enumerate(self.vResults):
-                eta[i] = res.results.V[idx]
-
-        elif load_effect.upper() == "R":
-            #
-            # Getting the correct reaction is tricky
-            #
-            # The indices of the supported DOFs wrt the node locations vector
-            vert_sups_dof_idx = np.where(np.array(self.ba._beam.restraints)[::2] == -1)[
-                0
-            ]
-            # The locations then of these supports
-            vert_sups_locs = node_locations[vert_sups_dof_idx]
-            # The index of the closest support
-            closest_vert_sup_idx = np.abs(vert_sups_locs - poi).argmin()
-            # And its value
-            closest_vert_sup = vert_sups_locs[closest_vert_sup_idx]
-            # And now the index of this support in the node locations vector
-            vert_sup_node_idx = np.where(node_locations == closest_vert_sup)[0][0]
-            # And hence its index in the overall DOFs vector
-            vert_sup_dof_idx = 2 * vert_sup_node_idx
-            # And finally the index of the support nearest the POI in the reactions vector
-            vert_sup_idx = idx_mask[vert_sup_dof_idx]
-
-            for i, res in enumerate(self.vResults):
-                eta[i] = res.R[vert_sup_idx]
-
-        elif load_effect.upper() == "MR":
+        if load_effect.upper() == "MR":
             #
-            # Follows the same logic for the vertical reaction
+            # Follows the same logic as for the vertical reaction below
             #
             mt_sups_dof_idx = np.where(np.array(self.ba._beam.restraints)[1::2] == -1)[
                 0
@@ -178,16 +478,27 @@ class InfluenceLines:
             mt_sup_dof_idx = 2 * mt_sup_node_idx + 1
             mt_sup_idx = idx_mask[mt_sup_dof_idx]
 
-            for i, res in enumerate(self.vResults):
-                eta[i] = res.R[mt_sup_idx]
+            return mt_sup_idx
 
-        else:
-            dx = x[2] - x[1]
-            idx = np.where(np.abs(x - poi) <= dx * 1e-6)[0][0]
-            for i, res in enumerate(self.vResults):
-                eta[i] = res.results.M[idx]
-
-        return (np.array(self.pos), eta)
+        #
+        # Getting the correct reaction is tricky
+        #
+        # The indices of the supported DOFs wrt the node locations vector
+        vert_sups_dof_idx = np.where(np.array(self.ba._beam.restraints)[::2] == -1)[0]
+        # The locations then of these supports
+        vert_sups_locs = node_locations[vert_sups_dof_idx]
+        # The index of the closest support
+        closest_vert_sup_idx = np.abs(vert_sups_locs - poi).argmin()
+        # And its value
+        closest_vert_sup = vert_sups_locs[closest_vert_sup_idx]
+        # And now the index of this support in the node locations vector
+        vert_sup_node_idx = np.where(node_locations == closest_vert_sup)[0][0]
+        # And hence its index in the overall DOFs vector
+        vert_sup_dof_idx = 2 * vert_sup_node_idx
+        # And finally the index of the support nearest the POI in the reactions vector
+        vert_sup_idx = idx_mask[vert_sup_dof_idx]
+
+        return vert_sup_idx
 
     def plot_il(self, poi: float, load_effect: str, ax: Optional[plt.Axes] = None):
         """
@@ -225,3 +536,331 @@ class InfluenceLines:
         ax.set_xlabel("Distance along beam (m)")
         ax.set_title(f"IL for {load_effect} at {poi}")
         plt.tight_layout()
+
+
+class InfluenceFunction:
+    """
+    An exact influence line, stored as a cubic polynomial for each segment of the
+    beam between breakpoints (the nodes, and the point of interest)
+    """
+
+    # Local coordinates at which the segment cubics are fitted
+    U_FIT = np.array([0.125, 0.375, 0.625, 0.875])
+    V_FIT_INV = np.linalg.inv(np.vander(U_FIT, 4, increasing=True))
+
+    def __init__(self, breaks: np.ndarray, coeffs: np.ndarray):
+        """
+        Constructs the influence function from its segment polynomials.
+
+        Parameters
+        ----------
+        breaks : np.ndarray
+            The `nseg+1` increasing global coordinates of the segment ends.
+        coeffs : np.ndarray
+            The `(nseg, 4)` matrix of the coefficients of the cubic of each
+            segment, in increasing powers of the local coordinate
+            `u = (x - breaks[i]) / (breaks[i+1] - breaks[i])`.
+
+        Raises
+        ------
+        ValueError
+            If the numbers of breakpoints and segments are inconsistent.
+
+        Returns
+        -------
+        None.
+        """
+        self.breaks = np.asarray(breaks, dtype=float)
+        self.coeffs = np.asarray(coeffs, dtype=float)
+        if self.coeffs.shape != (len(self.breaks) - 1, 4):
+            raise ValueError("Inconsistent breakpoints and coefficients")
+        self.h = np.diff(self.breaks)
+        self.L = self.breaks[-1] - self.breaks[0]
+
+    def __call__(self, x: np.ndarray) -> np.ndarray:
+        """
+        Evaluates the influence ordinates at any positions.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            The positions of the load in global coordinates. A position at a
+            breakpoint takes the value of the following segment.
+
+        Returns
+        -------
+        np.ndarray
+            The influence ordinates, which are zero for positions off the beam.
+        """
+        x = np.asarray(x, dtype=float)
+        nseg = len(self.h)
+        iseg = np.searchsorted(self.breaks, x, side="right") - 1
+        iseg = np.clip(iseg, 0, nseg - 1)
+        u = (x - self.breaks[iseg]) / self.h[iseg]
+        c = self.coeffs[iseg]
+        eta = ((c[..., 3] * u + c[..., 2]) * u + c[..., 1]) * u + c[..., 0]
+        return np.where((x < self.breaks[0]) | (x > self.breaks[-1]), 0.0, eta)
+
+    def _segment_roots(self, c: np.ndarray) -> np.ndarray:
+        """
+        Returns the sorted real roots in `(0, 1)` of a polynomial given by its
+        coefficients in increasing powers.
+        """
+        if not np.any(c):
+            return np.array([])
+        r = np.roots(c[::-1])
+        r = r[np.abs(r.imag) < 1e-10].real
+        return np.sort(r[(r > 0) & (r < 1)])
+
+    def _segment_pieces(self, i: int) -> List[Tuple[float, float, float]]:
+        """
+        Splits a segment at the zeros of its cubic, returning the local limits
+        and the integral (in global coordinates) of each piece of constant sign.
+        """
+        c = self.coeffs[i]
+        cint = np.concatenate(([0.0], c / np.arange(1, 5)))  # antiderivative
+        u = np.concatenate(([0.0], self._segment_roots(c), [1.0]))
+        F = np.polynomial.polynomial.polyval(u, cint) * self.h[i]
+        return list(zip(u[:-1], u[1:], np.diff(F)))
+
+    def integrate(self) -> float:
+        """
+        Returns the exact area under the influence line, i.e. the effect of a unit
+        uniformly distributed load over the whole beam.
+        """
+        return float(np.sum(self.coeffs / np.arange(1, 5), axis=1) @ self.h)
+
+    def areas(self) -> Tuple[float, float]:
+        """
+        Returns the exact positive and negative areas under the influence line,
+        i.e. the effects of a unit uniformly distributed load over the parts of
+        the beam that respectively increase and decrease the effect.
+
+        Returns
+        -------
+        (pos, neg) : tuple(float, float)
+            The positive and (negative-valued) negative areas.
+        """
+        pos = 0.0
+        neg = 0.0
+        for i in range(len(self.h)):
+            for _, _, area in self._segment_pieces(i):
+                if area > 0:
+                    pos += area
+                else:
+                    neg += area
+        return (pos, neg)
+
+    def extrema(self) -> Tuple[Tuple[float, float], Tuple[float, float]]:
+        """
+        Returns the exact maximum and minimum influence ordinates and their
+        positions, considering the segment ends and the stationary points of
+        each segment cubic. At a step in the influence line, the extreme limiting
+        value is returned at the step position.
+
+        Returns
+        -------
+        ((xmax, etamax), (xmin, etamin)) : tuple
+            The positions and values of the maximum and minimum ordinates.
+        """
+        x = []
+        eta = []
+        for i, c in enumerate(self.coeffs):
+            u = np.concatenate(([0.0, 1.0], self._segment_roots(c[1:] * [1, 2, 3])))
+            x.append(self.breaks[i] + u * self.h[i])
+            eta.append(np.polynomial.polynomial.polyval(u, c))
+        x = np.concatenate(x)
+        eta = np.concatenate(eta)
+        imax = eta.argmax()
+        imin = eta.argmin()
+        return ((x[imax], eta[imax]), (x[imin], eta[imin]))
+
+
+class ILCache:
+    """
+    A persistent on-disk cache of influence lines, shared between processes and
+    sessions. Each entry is a directory of `.npy` files named by a hash of the
+    beam and discretization, and is opened memory-mapped so that processes share
+    the same pages. The least recently used entries are evicted to keep within
+    size limits.
+    """
+
+    VERSION = 1  # of the stored format, part of the key
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: Optional[int] = None,
+        max_entries: Optional[int] = None,
+    ):
+        """
+        Constructs the cache in a directory, creating it if necessary.
+
+        Parameters
+        ----------
+        path : str
+            The cache directory.
+        max_bytes : Optional[int]
+            The maximum total size of the cached files. The default is None, for
+            no limit.
+        max_entries : Optional[int]
+            The maximum number of cached entries. The default is None, for no
+            limit.
+
+        Returns
+        -------
+        None.
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(path, exist_ok=True)
+
+    def key(self, beam: Beam, step: float, npts: int, load_val: float = 1.0) -> str:
+        """
+        Returns the stable key of the influence lines of a beam.
+
+        Parameters
+        ----------
+        beam : Beam
+            The :class:`pycba.beam.Beam` object of the influence lines, of which the
+            span lengths, flexural rigidities, restraints and element types are used.
+        step : float
+            The distance increment of the unit load.
+        npts : int
+            The number of evaluation points along each member.
+        load_val : float, optional
+            The nominal value of the "unit load". The default is 1.0.
+
+        Returns
+        -------
+        str
+            The hexadecimal key.
+        """
+        h = hashlib.blake2b(digest_size=16)
+        h.update(beam.fingerprint.encode())
+        h.update(np.array([step, npts, load_val, self.VERSION], dtype=float).tobytes())
+        return h.hexdigest()
+
+    def load(
+        self, key: str, names: Optional[Iterable[str]] = None
+    ) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Opens a cached entry, memory-mapped and read-only, marking it as used.
+
+        Parameters
+        ----------
+        key : str
+            The key of the entry.
+        names : Optional[Iterable[str]], optional
+            The names of the arrays the entry must have; an entry missing any of
+            them, such as one partly evicted by another process, is not cached.
+            The default is None, for any arrays.
+
+        Returns
+        -------
+        Optional[Dict[str, np.ndarray]]
+            The arrays of the entry by name, or None if it is not cached.
+        """
+        entry = os.path.join(self.path, key)
+        try:
+            arrays = {
+                os.path.splitext(f)[0]: np.load(
+                    os.path.join(entry, f), mmap_mode="r", allow_pickle=False
+                )
+                for f in os.listdir(entry)
+                if f.endswith(".npy")
+            }
+            if names is not None and not set(names) <= arrays.keys():
+                # Left partial, so removed to be stored again when calculated
+                shutil.rmtree(entry, ignore_errors=True)
+                raise FileNotFoundError(entry)
+            os.utime(entry)
+        except (OSError, EOFError, ValueError):
+            # Not cached, or evicted by another process while opening
+            self.misses += 1
+            return None
+        self.hits += 1
+        return arrays
+
+    def save(self, key: str, arrays: Dict[str, np.ndarray]):
+        """
+        Stores an entry, atomically so that other processes never see a partial
+        entry, and then evicts entries to keep within the size limits.
+
+        Parameters
+        ----------
+        key : str
+            The key of the entry.
+        arrays : Dict[str, np.ndarray]
+            The arrays of the entry by name.
+
+        Returns
+        -------
+        None.
+        """
+        tmp = tempfile.mkdtemp(prefix=".tmp-", dir=self.path)
+        for name, a in arrays.items():
+            np.save(os.path.join(tmp, name + ".npy"), np.asarray(a))
+        try:
+            os.replace(tmp, os.path.join(self.path, key))
+        except OSError:
+            # Already stored by another process
+            shutil.rmtree(tmp, ignore_errors=True)
+        self.evict()
+
+    def _entries(self) -> List[Tuple[float, int, str]]:
+        """
+        Returns the last used time, size, and path of each entry.
+        """
+        entries = []
+        for e in os.scandir(self.path):
+            if not e.is_dir() or e.name.startswith(".tmp-"):
+                continue
+            try:
+                size = sum(f.stat().st_size for f in os.scandir(e.path))
+                entries.append((e.stat().st_mtime, size, e.path))
+            except FileNotFoundError:
+                pass
+        return entries
+
+    @property
+    def nbytes(self) -> int:
+        """
+        The total size of the cached entries.
+        """
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self):
+        """
+        Removes the least recently used entries until the cache is within its
+        size limits.
+
+        Returns
+        -------
+        None.
+        """
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        n = len(entries)
+        for _, size, path in entries:
+            over_bytes = self.max_bytes is not None and total > self.max_bytes
+            over_entries = self.max_entries is not None and n > self.max_entries
+            if not (over_bytes or over_entries):
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+            n -= 1
+
+    def clear(self):
+        """
+        Removes all entries from the cache.
+
+        Returns
+        -------
+        None.
+        """
+        for _, _, path in self._entries():
+            shutil.rmtree(path, ignore_errors=True)
@@ -50,6 +50,8 @@ class MemberResults:
     Class for storing the results for a single member
     """
 
+    __slots__ = ("n", "x", "M", "V", "R", "D")
+
     def __init__(
         self,
         vals: Optional[
@@ -133,9 +135,8 @@ class MemberResults:
         """
 
         # Test they are the same member
-        np.testing.assert_equal(
-            self.x, o.x, err_msg="Cannot superimpose results of different members"
-        )
+        if self.x is not o.x and not np.array_equal(self.x, o.x):
+            raise ValueError("Cannot superimpose results of different members")
 
         # Do not superimpose distance
         x = self.x
@@ -143,11 +144,61 @@ class MemberResults:
         # Superimpose load effects
         M = self.M + o.M
         V = self.V + o.V
-        R = self.R + o.V
+        R = self.R + o.R
         D = self.D + o.D
 
         return MemberResults(vals=(x, M, V, R, D))
 
+    def __iadd__(self, o: MemberResults):
+        """
+        Overload in-place addition of :class:`pycba.load.MemberResults` objects to
+        superimpose load effects without creating new arrays.
+
+        Parameters
+        ----------
+        o : MemberResults
+            The other set of results for the member to be added to the current set
+
+        Raises
+        ------
+        ValueError
+            The results must be for the same member.
+
+        Returns
+        -------
+        MemberResults
+            This object, containing the superimposed set of results
+        """
+
+        if self.x is not o.x and not np.array_equal(self.x, o.x):
+            raise ValueError("Cannot superimpose results of different members")
+
+        self.M += o.M
+        self.V += o.V
+        self.R += o.R
+        self.D += o.D
+        return self
+
+    def accumulate(self, loads: List[Load], L: float):
+        """
+        Superimposes the results of loads on the member in place.
+
+        Parameters
+        ----------
+        loads : List[Load]
+            The :class:`pycba.load.Load` objects on the member
+        L : float
+            The length of the member
+
+        Returns
+        -------
+        MemberResults
+            This object, containing the superimposed set of results
+        """
+        for load in loads:
+            load.add_mbr_results_into(self, self.x, L)
+        return self
+
     def apply_EI(self, EI: float):
         """
         Factors results by flexural rigidity after numerical integration of the
@@ -186,9 +237,60 @@ class Load:
         # Enforce virtual base class
         raise NotImplementedError
 
-    def get_mbr_results(self, x, L):
+    def get_mbr_results(self, x: np.ndarray, L: float) -> MemberResults:
+        """
+        Results along the member from this load
+
+        Parameters
+        ----------
+        x : np.ndarray
+            Vector of points along the length of the member
+        L : float
+            The length of the member
+
+        Returns
+        -------
+        res : MemberResults
+            A populated :class:`pycba.load.MemberResults` object
+        """
+        res = MemberResults(vals=None, n=len(x))
+        res.x = x
+        self.add_mbr_results_into(res, x, L)
+        return res
+
+    def add_mbr_results_into(self, res: MemberResults, x: np.ndarray, L: float):
         raise NotImplementedError
 
+    @staticmethod
+    def _add_poly(out: np.ndarray, x: np.ndarray, c: Tuple[float], tmp: np.ndarray):
+        """
+        Adds the polynomial `c[0] + c[1]*x + c[2]*x**2 + ...` to `out` in place,
+        evaluated by Horner's rule in the scratch array `tmp`.
+        """
+        tmp.fill(c[-1])
+        for ci in c[-2::-1]:
+            tmp *= x
+            tmp += ci
+        out += tmp
+
+    @staticmethod
+    def _add_mb(
+        out: np.ndarray, x: np.ndarray, a: float, p: int, k: float, tmp: np.ndarray
+    ):
+        """
+        Adds the Macaulay term `k*<x-a>**p` to `out` in place, evaluated in the
+        scratch array `tmp`. For `p=0` this is the Heaviside step, zero at `x=a`.
+        """
+        if p == 0:
+            np.greater(x, a, out=tmp)
+        else:
+            np.subtract(x, a, out=tmp)
+            np.maximum(tmp, 0.0, out=tmp)
+            if p > 1:
+                np.power(tmp, p, out=tmp)
+        tmp *= k
+        out += tmp
+
     def MB(self, v: np.ndarray) -> np.ndarray:
         """
         Macaulay bracket: clipping values less than zero to zero.
@@ -318,12 +420,15 @@ class LoadUDL(Load):
         )
         return cnl
 
-    def get_mbr_results(self, x: np.ndarray, L: float) -> MemberResults:
+    def add_mbr_results_into(self, res: MemberResults, x: np.ndarray, L: float):
         """
-        Results along the member from UDL
+        Adds the results along the member from this load into existing results
 
         Parameters
         ----------
+        res : MemberResults
+            The :class:`pycba.load.MemberResults` object to which the results are
+            added in place. The shear and moment at its end points are not changed.
         x : np.ndarray
             Vector of points along the length of the member
         L : float
@@ -331,28 +436,19 @@ class LoadUDL(Load):
 
         Returns
         -------
-        res : MemberResults
-            A populated :class:`pycba.load.MemberResults` object
+        None
         """
 
-        npts = len(x)
-        res = MemberResults(vals=None, n=npts)
-        res.x = x
-
-        Va = self.w * L / 2
-        Ra = -self.w * L**3 / 24
-
-        res.V = Va - self.w * x
-        res.M = Va * x - self.w / 2 * x**2
-        res.R = (Va / 2) * x**2 - (self.w / 6) * x**3 + Ra
-        res.D = (Va / 6) * x**3 - (self.w / 24) * x**4 + Ra * x
-
-        res.V[0] = 0
-        res.V[npts - 1] = 0
-        res.M[0] = 0
-        res.M[npts - 1] = 0
+        w = self.w
+        Va = w * L / 2
+        Ra = -w * L**3 / 24
 
-        return res
+        tmp = np.empty_like(x)
+        xi, ti = x[1:-1], tmp[1:-1]
+        self._add_poly(res.V[1:-1], xi, (Va, -w), ti)
+        self._add_poly(res.M[1:-1], xi, (0, Va, -w / 2), ti)
+        self._add_poly(res.R, x, (Ra, 0, Va / 2, -w / 6), tmp)
+        self._add_poly(res.D, x, (0, Ra, 0, Va / 6, -w / 24), tmp)
 
 
 class LoadPL(Load):
@@ -414,12 +510,15 @@ class LoadPL(Load):
         )
         return cnl
 
-    def get_mbr_results(self, x: np.ndarray, L: float) -> MemberResults:
+    def add_mbr_results_into(self, res: MemberResults, x: np.ndarray, L: float):
         """
-        Results along the member from this load
+        Adds the results along the member from this load into existing results
 
         Parameters
         ----------
+        res : MemberResults
+            The :class:`pycba.load.MemberResults` object to which the results are
+            added in place. The shear and moment at its end points are not changed.
         x : np.ndarray
             Vector of points along the length of the member
         L : float
@@ -427,14 +526,9 @@ class LoadPL(Load):
 
         Returns
         -------
-        res : MemberResults
-            A populated :class:`pycba.load.MemberResults` object
+        None
         """
 
-        npts = len(x)
-        res = MemberResults(vals=None, n=npts)
-        res.x = x
-
         P = self.P
         a = self.a
         b = max(L - a, 0)
@@ -442,17 +536,16 @@ class LoadPL(Load):
         Va = P * b / L
         Ra = P * b * (b**2 - L**2) / (6 * L)
 
-        res.V = Va - P * self.H(x - a)
-        res.M = Va * x - P * self.MB(x - a)
-        res.R = (Va / 2) * x**2 - (P / 2) * self.MB(x - a) ** 2 + Ra
-        res.D = (Va / 6) * x**3 - (P / 6) * self.MB(x - a) ** 3 + Ra * x
-
-        res.V[0] = 0
-        res.V[npts - 1] = 0
-        res.M[0] = 0
-        res.M[npts - 1] = 0
-
-        return res
+        tmp = np.empty_like(x)
+        xi, ti = x[1:-1], tmp[1:-1]
+        self._add_poly(res.V[1:-1], xi, (Va,), ti)
+        self._add_mb(res.V[1:-1], xi, a, 0, -P, ti)
+        self._add_poly(res.M[1:-1], xi, (0, Va), ti)
+        self._add_mb(res.M[1:-1], xi, a, 1, -P, ti)
+        self._add_poly(res.R, x, (Ra, 0, Va / 2), tmp)
+        self._add_mb(res.R, x, a, 2, -P / 2, tmp)
+        self._add_poly(res.D, x, (0, Ra, 0, Va / 6), tmp)
+        self._add_mb(res.D, x, a, 3, -P / 6, tmp)
 
 
 class LoadPUDL(Load):
@@ -509,12 +602,15 @@ class LoadPUDL(Load):
         # implicit conversion to tuple in correct order
         return cnl
 
-    def get_mbr_results(self, x: np.ndarray, L: float) -> MemberResults:
+    def add_mbr_results_into(self, res: MemberResults, x: np.ndarray, L: float):
         """
-        Results along the member from this load
+        Adds the results along the member from this load into existing results
 
         Parameters
         ----------
+        res : MemberResults
+            The :class:`pycba.load.MemberResults` object to which the results are
+            added in place. The shear and moment at its end points are not changed.
         x : np.ndarray
             Vector of points along the length of the member
         L : float
@@ -522,14 +618,9 @@ class LoadPUDL(Load):
 
         Returns
         -------
-        res : MemberResults
-            A populated :class:`pycba.load.MemberResults` object
+        None
         """
 
-        npts = len(x)
-        res = MemberResults(vals=None, n=npts)
-        res.x = x
-
         a = self.a
         c = self.c
         w = self.w
@@ -540,29 +631,20 @@ class LoadPUDL(Load):
             -((Va / 6) * L**3 + (w / 24) * (L - b) ** 4 - (w / 24) * (L - a) ** 4) / L
         )
 
-        res.V = Va - w * self.MB(x - a) + w * self.MB(x - b)
-        res.M = (
-            Va * x - (w / 2) * (self.MB(x - a)) ** 2 + (w / 2) * (self.MB(x - b)) ** 2
-        )
-        res.R = (
-            (Va / 2) * x**2
-            - (w / 6) * (self.MB(x - a)) ** 3
-            + (w / 6) * (self.MB(x - b)) ** 3
-            + Ra
-        )
-        res.D = (
-            (Va / 6) * x**3
-            - (w / 24) * (self.MB(x - a)) ** 4
-            + (w / 24) * (self.MB(x - b)) ** 4
-            + Ra * x
-        )
-
-        res.V[0] = 0
-        res.V[npts - 1] = 0
-        res.M[0] = 0
-        res.M[npts - 1] = 0
-
-        return res
+        tmp = np.empty_like(x)
+        xi, ti = x[1:-1], tmp[1:-1]
+        self._add_poly(res.V[1:-1], xi, (Va,), ti)
+        self._add_mb(res.V[1:-1], xi, a, 1, -w, ti)
+        self._add_mb(res.V[1:-1], xi, b, 1, w, ti)
+        self._add_poly(res.M[1:-1], xi, (0, Va), ti)
+        self._add_mb(res.M[1:-1], xi, a, 2, -w / 2, ti)
+        self._add_mb(res.M[1:-1], xi, b, 2, w / 2, ti)
+        self._add_poly(res.R, x, (Ra, 0, Va / 2), tmp)
+        self._add_mb(res.R, x, a, 3, -w / 6, tmp)
+        self._add_mb(res.R, x, b, 3, w / 6, tmp)
+        self._add_poly(res.D, x, (0, Ra, 0, Va / 6), tmp)
+        self._add_mb(res.D, x, a, 4, -w / 24, tmp)
+        self._add_mb(res.D, x, b, 4, w / 24, tmp)
 
 
 class LoadMaMb(Load):
@@ -605,12 +687,15 @@ class LoadMaMb(Load):
         )
         return cnl
 
-    def get_mbr_results(self, x: np.ndarray, L: float) -> MemberResults:
+    def add_mbr_results_into(self, res: MemberResults, x: np.ndarray, L: float):
         """
-        Results along the member from this load
+        Adds the results along the member from this load into existing results
 
         Parameters
         ----------
+        res : MemberResults
+            The :class:`pycba.load.MemberResults` object to which the results are
+            added in place. The shear and moment at its end points are not changed.
         x : np.ndarray
             Vector of points along the length of the member
         L : float
@@ -618,31 +703,21 @@ class LoadMaMb(Load):
 
         Returns
         -------
-        res : MemberResults
-            A populated :class:`pycba.load.MemberResults` object
+        None
         """
 
-        npts = len(x)
-        res = MemberResults(vals=None, n=npts)
-        res.x = x
-
         Ma = self.Ma
         Mb = self.Mb
 
         Va = (Ma + Mb) / L
         Ra = Ma * L / 3 - Mb * L / 6
 
-        res.V = Va * np.ones(npts)
-        res.M = Va * x - Ma
-        res.R = (Va / 2) * x**2 - Ma * x + Ra
-        res.D = (Va / 6) * x**3 - (Ma / 2) * x**2 + Ra * x
-
-        res.V[0] = 0.0
-        res.V[npts - 1] = 0.0
-        res.M[0] = 0.0
-        res.M[npts - 1] = 0.0
-
-        return res
+        tmp = np.empty_like(x)
+        xi, ti = x[1:-1], tmp[1:-1]
+        res.V[1:-1] += Va
+        self._add_poly(res.M[1:-1], xi, (-Ma, Va), ti)
+        self._add_poly(res.R, x, (Ra, -Ma, Va / 2), tmp)
+        self._add_poly(res.D, x, (0, Ra, -Ma / 2, Va / 6), tmp)
 
 
 class LoadML(Load):
@@ -686,12 +761,15 @@ class LoadML(Load):
         )
         return cnl
 
-    def get_mbr_results(self, x: np.ndarray, L: float) -> MemberResults:
+    def add_mbr_results_into(self, res: MemberResults, x: np.ndarray, L: float):
         """
-        Results along the member from this load
+        Adds the results along the member from this load into existing results
 
         Parameters
         ----------
+        res : MemberResults
+            The :class:`pycba.load.MemberResults` object to which the results are
+            added in place. The shear and moment at its end points are not changed.
         x : np.ndarray
             Vector of points along the length of the member
         L : float
@@ -699,14 +777,9 @@ class LoadML(Load):
 
         Returns
         -------
-        res : MemberResults
-            A populated :class:`pycba.load.MemberResults` object
+        None
         """
 
-        npts = len(x)
-        res = MemberResults(vals=None, n=npts)
-        res.x = x
-
         m = self.M
         a = self.a
         b = L - a
@@ -714,34 +787,26 @@ class LoadML(Load):
         Va = m / L
         Ra = (m / 6) * (3 * b**2 / L - L)
 
-        # # For moment we must insert an additional point to properly capture the step
-        # idx = np.searchsorted(x, a)
-        # if not np.any(np.isclose(x, a)):
-        #     x = np.insert(x, idx, a)
-        # x = np.insert(x, idx, a)
-        # res.x = x
-
-        res.V = Va * np.ones(npts)
-
+        # Value of the step in moment at the load point
         if a == 0:
-            res.M = Va * x - m * self.H(x - a, 1)
+            h0 = 1.0
         elif a == L:
-            res.M = Va * x - m * self.H(x - a, 0)
+            h0 = 0.0
         else:
-            res.M = Va * x - m * self.H(x - a, 0.5)
-
-        # res.M = np.array(
-        #     [Va * xi - m if i > idx else Va * xi for i, xi in enumerate(x)]
-        # )
-        res.R = (Va / 2) * x**2 - m * self.MB(x - a) + Ra
-        res.D = (Va / 6) * x**3 - (m / 2) * self.MB(x - a) ** 2 + Ra * x
-
-        res.V[0] = 0.0
-        res.V[npts - 1] = 0.0
-        res.M[0] = 0.0
-        res.M[npts - 1] = 0.0
-
-        return res
+            h0 = 0.5
+
+        tmp = np.empty_like(x)
+        xi, ti = x[1:-1], tmp[1:-1]
+        res.V[1:-1] += Va
+        self._add_poly(res.M[1:-1], xi, (0, Va), ti)
+        np.subtract(xi, a, out=ti)
+        np.heaviside(ti, h0, out=ti)
+        ti *= m
+        res.M[1:-1] -= ti
+        self._add_poly(res.R, x, (Ra, 0, Va / 2), tmp)
+        self._add_mb(res.R, x, a, 1, -m, tmp)
+        self._add_poly(res.D, x, (0, Ra, 0, Va / 6), tmp)
+        self._add_mb(res.D, x, a, 2, -m / 2, tmp)
 
 
 def parse_LM(LM: LoadMatrix) -> List[Load]:
@@ -792,6 +857,258 @@ def parse_LM(LM: LoadMatrix) -> List[Load]:
     return loads
 
 
+class LoadTable:
+    """
+    A compiled, columnar (structure-of-arrays) form of one or more load matrices.
+
+    Each load is a row in the columns of span (0-based), load type, value, and
+    distances `a` and `c`, as well as the index of the load matrix (i.e. load
+    case) it came from. Rows are grouped by span, and the loads on span `i` are
+    at `offsets[i]:offsets[i + 1]`. Loads of unknown type or on spans that do
+    not exist are discarded, as they have no effect on the analysis.
+
+    The Consistent Nodal Loads and Released End Forces of all loads are
+    computed with one vectorized expression per load type, with no
+    :class:`pycba.load.Load` objects created.
+    """
+
+    def __init__(self, LMs: List[LoadMatrix], no_spans: int):
+        """
+        Compiles the load matrices into the table
+
+        Parameters
+        ----------
+        LMs : List[LoadMatrix]
+            The load matrices, one for each load case.
+        no_spans : int
+            The number of spans of the beam.
+
+        Raises
+        ------
+        ValueError
+            If a load matrix is not a list of lists.
+
+        Returns
+        -------
+        None.
+        """
+        rows = []
+        cases = []
+        for icase, LM in enumerate(LMs):
+            if not all(isinstance(load, list) for load in LM):
+                raise ValueError("Load Matrix must be a list of lists")
+            # Pad any omitted distances with zeros
+            rows += [(load + [0, 0, 0])[:5] for load in LM]
+            cases += [icase] * len(LM)
+        tbl = np.array(rows, dtype=float).reshape(-1, 5)
+        case = np.array(cases, dtype=int)
+
+        span = tbl[:, 0].astype(int) - 1
+        ltype = tbl[:, 1].astype(int)
+        keep = (span >= 0) & (span < no_spans) & np.isin(ltype, [1, 2, 3, 4])
+        # Stable sort keeps the load case and load matrix order within spans
+        order = np.argsort(span[keep], kind="stable")
+
+        self.no_cases = len(LMs)
+        self.no_spans = no_spans
+        self.case = case[keep][order]
+        self.span = span[keep][order]
+        self.ltype = ltype[keep][order]
+        self.value = tbl[keep, 2][order]
+        self.a = tbl[keep, 3][order]
+        self.c = tbl[keep, 4][order]
+        self.offsets = np.searchsorted(self.span, np.arange(no_spans + 1))
+
+    @classmethod
+    def from_LM(cls, LM: LoadMatrix, no_spans: int) -> LoadTable:
+        """
+        Compiles a single load matrix into a table
+
+        Parameters
+        ----------
+        LM : LoadMatrix
+            The load matrix.
+        no_spans : int
+            The number of spans of the beam.
+
+        Returns
+        -------
+        LoadTable
+            The compiled table.
+        """
+        return cls([LM], no_spans)
+
+    def __len__(self) -> int:
+        return len(self.span)
+
+    def span_slice(self, i_span: int) -> slice:
+        """
+        Returns the slice of the table rows for the loads on a span
+
+        Parameters
+        ----------
+        i_span : int
+            The index (0-based) of the span
+
+        Returns
+        -------
+        slice
+            The slice of rows
+        """
+        return slice(self.offsets[i_span], self.offsets[i_span + 1])
+
+    def get_loads(self, i_span: int) -> List[Load]:
+        """
+        Creates the :class:`pycba.load.Load` objects for the loads on a span
+
+        Parameters
+        ----------
+        i_span : int
+            The index (0-based) of the span
+
+        Returns
+        -------
+        loads : List[Load]
+            A list of Load objects
+        """
+        loads = []
+        for k in range(self.offsets[i_span], self.offsets[i_span + 1]):
+            ltype = self.ltype[k]
+            w, a, c = self.value[k], self.a[k], self.c[k]
+            if ltype == 1:
+                loads.append(LoadUDL(i_span, w))
+            elif ltype == 2:
+                loads.append(LoadPL(i_span, w, a))
+            elif ltype == 3:
+                loads.append(LoadPUDL(i_span, w, a, c))
+            else:
+                loads.append(LoadML(i_span, w, a))
+        return loads
+
+    def get_cnl(self, L: np.ndarray, rows: slice = slice(None)) -> np.ndarray:
+        """
+        Returns the Consistent Nodal Loads for all loads
+
+        Parameters
+        ----------
+        L : np.ndarray
+            The vector of the lengths of the members, indexed by span
+        rows : slice, optional
+            The rows of the table for which the CNLs are required, e.g. from
+            :meth:`span_slice`. The default is all rows.
+
+        Returns
+        -------
+        cnl : np.ndarray
+            The `(no_loads, 4)` matrix of CNLs, columns ordered as
+            :class:`pycba.load.LoadCNL`.
+        """
+        ltype = self.ltype[rows]
+        w, a, c = self.value[rows], self.a[rows], self.c[rows]
+        L = np.asarray(L, dtype=float)[self.span[rows]]
+
+        cnl = np.zeros((len(ltype), 4))
+        for lt, func in (
+            (1, self._cnl_udl),
+            (2, self._cnl_pl),
+            (3, self._cnl_pudl),
+            (4, self._cnl_ml),
+        ):
+            mask = ltype == lt
+            if mask.any():
+                cnl[mask] = func(w[mask], a[mask], c[mask], L[mask])
+        return cnl
+
+    def get_ref(
+        self, L: np.ndarray, eType: np.ndarray, rows: slice = slice(None)
+    ) -> np.ndarray:
+        """
+        Returns the Released End Forces for all loads: the Consistent Nodal Loads
+        modified for the element type of the span of each load.
+
+        Parameters
+        ----------
+        L : np.ndarray
+            The vector of the lengths of the members, indexed by span
+        eType : np.ndarray
+            The vector of the member element types, indexed by span
+        rows : slice, optional
+            The rows of the table for which the REFs are required, e.g. from
+            :meth:`span_slice`. The default is all rows.
+
+        Returns
+        -------
+        ref : np.ndarray
+            The `(no_loads, 4)` matrix of released end forces
+        """
+        cnl = self.get_cnl(L, rows)
+        et = np.asarray(eType)[self.span[rows]]
+        L = np.asarray(L, dtype=float)[self.span[rows]]
+        Ma = cnl[:, 1]
+        Mb = cnl[:, 3]
+        fm = 6 / (4 * L)  # flexibility coeff for moment
+
+        ref = np.zeros_like(cnl)
+        mask = et == 2  # DOF = moment at j node
+        ref[mask] = np.column_stack([fm * Mb, 0.5 * Mb, -fm * Mb, Mb])[mask]
+        mask = et == 3  # DOF = moment at i node
+        ref[mask] = np.column_stack([fm * Ma, Ma, -fm * Ma, 0.5 * Ma])[mask]
+        mask = et == 4  # keep only vertical, remove moments
+        V = (Ma + Mb) / L
+        ref[mask] = np.column_stack([-V, Ma, V, Mb])[mask]
+        # now superimpose the released forces
+        return cnl - ref
+
+    @staticmethod
+    def _cnl_udl(w, a, c, L):
+        return np.column_stack(
+            [w * L / 2.0, w * L**2 / 12.0, w * L / 2.0, -w * L**2 / 12.0]
+        )
+
+    @staticmethod
+    def _cnl_pl(P, a, c, L):
+        b = np.maximum(L - a, 0)
+        return np.column_stack(
+            [
+                P / L**3 * (b * L**2 - a**2 * b + a * b**2),
+                P * a * b**2 / L**2,
+                P / L**3 * (a * L**2 + a**2 * b - a * b**2),
+                -P * a**2 * b / L**2,
+            ]
+        )
+
+    @staticmethod
+    def _cnl_pudl(w, a, c, L):
+        # If cover hangs off span, adjust it
+        c = c + np.minimum(L - (a + c), 0)
+        s = a + c / 2
+        t = L - s
+        Va = (w * c / L**3) * ((2 * s + L) * t**2 + (s - t) * c**2 / 4)
+        cnl = np.column_stack(
+            [
+                Va,
+                (w * c / L**2) * (s * t**2 + (s - 2 * t) * c**2 / 12),
+                w * c - Va,
+                -(w * c / L**2) * (t * s**2 + (t - 2 * s) * c**2 / 12),
+            ]
+        )
+        # Check if on span, if not, zero
+        cnl[a > L] = 0.0
+        return cnl
+
+    @staticmethod
+    def _cnl_ml(m, a, c, L):
+        b = L - a
+        return np.column_stack(
+            [
+                6 * m * a * b / L**3,
+                (m * b / L**2) * (2 * a - b),
+                -6 * m * a * b / L**3,
+                (m * a / L**2) * (2 * b - a),
+            ]
+        )
+
+
 def add_LM(LM1: LoadMatrix, LM2: LoadMatrix) -> LoadMatrix:
     """
     Adds two load matrices and returns the sum; this enables superposition
@@ -3,13 +3,13 @@ PyCBA - Beam Results module
 """
 
 from __future__ import annotations  # https://bit.ly/3KYiL2o
-from typing import List, Tuple
+from typing import List, Tuple, Optional, Dict
 import numpy as np
 import matplotlib.pyplot as plt
 from scipy import integrate
 from .beam import Beam
-from .load import MemberResults, LoadMaMb, LoadCNL
-from copy import deepcopy
+from .load import MemberResults, LoadTable, LoadMaMb, LoadCNL
+from copy import copy, deepcopy
 
 
 class BeamResults:
@@ -17,10 +17,22 @@ class BeamResults:
     BeamResults Class for processing and containing the results for each member
     """
 
-    def __init__(self, beam: Beam, d: np.ndarray, r: np.ndarray, npts: int = 100):
+    def __init__(
+        self,
+        beam: Beam,
+        d: np.ndarray,
+        r: np.ndarray,
+        npts: int = 100,
+        spans: Optional[List[int]] = None,
+        ends: bool = True,
+    ):
         """
         Initialize member results from global results
 
+        The nodal displacements and reactions are available immediately, while
+        the load effects along the members are only calculated, and then kept,
+        when they are first accessed through :attr:`vRes` or :attr:`results`.
+
         Parameters
         ----------
         beam : Beam
@@ -32,56 +44,99 @@ class BeamResults:
         npts : int, optional
             The number of points along the member at which to calculate the load
             effects. The default is 100.
+        spans : Optional[List[int]]
+            The indices (0-based) of the members for which the load effects are to
+            be calculated. The default is all members.
+        ends : bool, optional
+            Whether or not to keep the duplicated sample points at each member end,
+            at which the moment and shear are zero to close the diagrams. If False,
+            each member has `npts+1` points instead of `npts+3`. The default is True.
+
+        Raises
+        ------
+        ValueError
+            If a span index is not on the beam, or is repeated.
 
         Returns
         -------
         None.
         """
         self.npts = npts
-        self.vRes = self._member_analysis(beam, d)
+        self.ends = ends
         self.D = d  # nodal displacements
         self.R = r  # reactions
-        self.results = self._concatenate_results()
 
-    def _concatenate_results(self):
+        if spans is None:
+            spans = range(beam.no_spans)
+        self.spans = [int(i) for i in spans]
+        if any(i < 0 or i >= beam.no_spans for i in self.spans):
+            raise ValueError("Span index is not on the beam")
+        if len(set(self.spans)) != len(self.spans):
+            raise ValueError("Span indices must not be repeated")
+
+        # Shallow copy so later changes to the beam loads do not change the results
+        self._beam = copy(beam)
+        self._vRes = {}
+        self._results = None
+
+        # Rows x, M, V, R, D of all members, filled in place as they are calculated
+        self._nmbr = npts + 3 if ends else npts + 1
+        self._buffer = np.empty((5, len(self.spans) * self._nmbr))
+        self._slot = {i: k for k, i in enumerate(self.spans)}
+
+    @property
+    def vRes(self) -> List[MemberResults]:
+        """
+        The :class:`pycba.MemberResults` objects for each of the result members,
+        calculated on first access. These are views into :attr:`results`.
         """
-        Assemble the vector of results by member into a long vector of each result
-        and store in a :class:`pycba.MemberResults` object.
+        return [self.get_member_results(i) for i in self.spans]
+
+    @property
+    def results(self) -> MemberResults:
+        """
+        The results along the whole beam as if it were a notional member,
+        calculated on first access.
+        """
+        if self._results is None:
+            for i in self.spans:
+                self.get_member_results(i)
+            self._results = MemberResults(vals=tuple(self._buffer))
+        return self._results
+
+    def get_member_results(self, i_span: int) -> MemberResults:
+        """
+        Returns the results for a single member, calculating them if necessary.
 
         Parameters
         ----------
-        None
+        i_span : int
+            The index (0-based) of the member along the beam.
+
+        Raises
+        ------
+        ValueError
+            If the results for the member were not requested.
 
         Returns
         -------
         MemberResults
-            Stores all results along the whole beam as if it were a notional
-            member.
-
-        """
-        x = []  # global coordinate along member
-        M = []  # bending moment
-        V = []  # shear force
-        R = []  # rotation
-        D = []  # deflection
-
-        for res in self.vRes:
-            x.append(res.x)
-            M.append(res.M)
-            V.append(res.V)
-            R.append(res.R)
-            D.append(res.D)
-        x = np.concatenate(x)
-        M = np.concatenate(M)
-        V = np.concatenate(V)
-        R = np.concatenate(R)
-        D = np.concatenate(D)
-
-        return MemberResults(vals=(x, M, V, R, D))
-
-    def _member_analysis(self, beam: Beam, d: np.ndarray) -> List[MemberResults]:
+            The load effects values along the member.
         """
-        Establish the results for each member from the stiffness method results.
+        if i_span not in self._vRes:
+            if i_span not in self._slot:
+                raise ValueError(f"Results for span {i_span} were not requested")
+            k = self._slot[i_span] * self._nmbr
+            out = self._buffer[:, k : k + self._nmbr]
+            self._member_analysis(self._beam, self.D, i_span, out)
+            self._vRes[i_span] = MemberResults(vals=tuple(out))
+        return self._vRes[i_span]
+
+    def _member_analysis(
+        self, beam: Beam, d: np.ndarray, i: int, out: np.ndarray
+    ) -> np.ndarray:
+        """
+        Establish the results for a member from the stiffness method results.
 
         Parameters
         ----------
@@ -89,32 +144,42 @@ class BeamResults:
             The :class:`pycba.beam.Beam` object for which the results are required.
         d : np.ndarray
             The vector of nodal displacements from the stiffness analysis.
+        i : int
+            The index (0-based) of the member along the beam.
+        out : np.ndarray
+            The `(5, n)` array into which the rows `x, M, V, R, D` of the member
+            results are written.
 
         Returns
         -------
-        List[MemberResults]
-            A list of the :class:`pycba.MemberResults` objects for each member.
+        np.ndarray
+            The `out` array.
         """
 
-        vRes = []
-        sumL = 0
-        for i in range(beam.no_spans):
-            kb = beam.get_span_k(i)
-            dof_i = 2 * i
-            dmbr = d[dof_i : dof_i + 4]
-            fmbr = np.zeros(4)
-            for j in range(4):
-                fmbr[j] = np.sum(kb[j][:] * dmbr[:])
-            fmbr += beam.get_ref(i)
+        kb = beam.get_span_k(i)
+        dof_i = 2 * i
+        dmbr = d[dof_i : dof_i + 4]
+        fmbr = kb @ dmbr
+        fmbr += beam.get_ref(i)
+        if self.ends:
+            # Superimpose the results directly in the buffer
+            out[1:] = 0.0
+            self._member_values(beam, i, fmbr, dmbr, MemberResults(vals=tuple(out)))
+        else:
             res = self._member_values(beam, i, fmbr, dmbr)
-            # Shift x vals by location of mbr starting point
-            res.x += sumL
-            sumL += beam.mbr_lengths[i]
-            vRes.append(res)
-        return vRes
+            for row, v in zip(out, (res.x, res.M, res.V, res.R, res.D)):
+                row[:] = v[1:-1]
+        # Shift x vals by location of mbr starting point
+        out[0] += beam._terminal_coords[i]
+        return out
 
     def _member_values(
-        self, beam: Beam, i_span: int, f: List[float], d: List[float]
+        self,
+        beam: Beam,
+        i_span: int,
+        f: List[float],
+        d: List[float],
+        res: Optional[MemberResults] = None,
     ) -> MemberResults:
         """
         Calculate the load effects along a single member given its nodal
@@ -130,6 +195,9 @@ class BeamResults:
             The vector of nodal forces from the stiffness analysis.
         d : List[float]
             The vector of nodal displacements from the stiffness analysis.
+        res : Optional[MemberResults]
+            Zeroed results of `npts+3` points into which the load effects are
+            written. The default is None, when they are created.
 
         Returns
         -------
@@ -141,22 +209,23 @@ class BeamResults:
         EI = beam.mbr_EIs[i_span]
         etype = beam.mbr_eletype[i_span]
 
+        if res is None:
+            res = MemberResults(vals=None, n=self.npts + 3)
         dx = L / self.npts
-        x = np.zeros(self.npts + 3)
+        x = res.x
+        x[0] = 0.0
         x[1 : self.npts + 2] = dx * np.arange(0, self.npts + 1)
         x[self.npts + 2] = L
 
         # Get the results for the end moments alone
         MaMb = LoadMaMb(i_span=i_span, Ma=f[1], Mb=f[3])
-        res = MaMb.get_mbr_results(x, L)
+        MaMb.add_mbr_results_into(res, x, L)
 
         # Now get the results for all the applied loads on a simple span
         Ma = 0
         Mb = 0
-        for load in beam._loads:
-            if load.i_span != i_span:
-                continue
-            res += load.get_mbr_results(x, L)
+        for load in beam.get_span_loads(i_span):
+            load.add_mbr_results_into(res, x, L)
             cnl = load.get_cnl(L, etype)
             Ma += cnl.Ma
             Mb += cnl.Mb
@@ -178,13 +247,233 @@ class BeamResults:
 
         res.R[1:-1] = R
         res.D[1:-1] = D
+        # The duplicated end points repeat the member end values
+        res.R[[0, -1]] = R[[0, -1]]
+        res.D[[0, -1]] = D[[0, -1]]
 
         return res
 
 
+class BatchResults:
+    """
+    BatchResults Class for containing the results of many load cases on the same
+    beam as stacked arrays, without a :class:`pycba.results.BeamResults` object
+    for each load case.
+    """
+
+    def __init__(
+        self,
+        beam: Beam,
+        d: np.ndarray,
+        r: np.ndarray,
+        table: LoadTable,
+        npts: int = 100,
+    ):
+        """
+        Initialize the stacked member results from the global results
+
+        Parameters
+        ----------
+        beam : Beam
+            The :class:`pycba.beam.Beam` object for which the results are to be stored.
+        d : np.ndarray
+            The `(ncases, nDOF)` matrix of nodal displacements.
+        r : np.ndarray
+            The `(ncases, nsup)` matrix of reactions.
+        table : LoadTable
+            The compiled loads of all load cases.
+        npts : int, optional
+            The number of points along the member at which to calculate the load
+            effects. The default is 100.
+
+        Returns
+        -------
+        None.
+        """
+        self.npts = npts
+        self.ncases = len(d)
+        self.D = d  # nodal displacements
+        self.R = r  # reactions
+        self.results = self._member_analysis(beam, d, table)
+
+    @classmethod
+    def from_arrays(
+        cls, d: np.ndarray, r: np.ndarray, results: MemberResults, npts: int
+    ) -> BatchResults:
+        """
+        Creates the batch results from previously calculated arrays, such as those
+        loaded from a file, without any analysis.
+
+        Parameters
+        ----------
+        d : np.ndarray
+            The `(ncases, nDOF)` matrix of nodal displacements.
+        r : np.ndarray
+            The `(ncases, nsup)` matrix of reactions.
+        results : MemberResults
+            The results along the whole beam, with the load effects as
+            `(ncases, n)` arrays.
+        npts : int
+            The number of points along each member of the results.
+
+        Returns
+        -------
+        BatchResults
+            The batch results object.
+        """
+        obj = cls.__new__(cls)
+        obj.npts = npts
+        obj.ncases = len(d)
+        obj.D = d
+        obj.R = r
+        obj.results = results
+        return obj
+
+    def _member_analysis(
+        self, beam: Beam, d: np.ndarray, table: LoadTable
+    ) -> MemberResults:
+        """
+        Establish the results along the beam for all load cases from the stiffness
+        method results.
+
+        Parameters
+        ----------
+        beam : Beam
+            The :class:`pycba.beam.Beam` object for which the results are required.
+        d : np.ndarray
+            The matrix of nodal displacements from the stiffness analysis.
+        table : LoadTable
+            The compiled loads of all load cases.
+
+        Returns
+        -------
+        MemberResults
+            Stores all results along the whole beam as if it were a notional
+            member, with the load effects as `(ncases, n)` arrays.
+        """
+
+        nx = self.npts + 3
+        n = beam.no_spans * nx
+        x = np.zeros(n)
+        M = np.zeros((self.ncases, n))
+        V = np.zeros((self.ncases, n))
+        R = np.zeros((self.ncases, n))
+        D = np.zeros((self.ncases, n))
+
+        sumL = 0
+        for i in range(beam.no_spans):
+            dof_i = 2 * i
+            dmbr = d[:, dof_i : dof_i + 4]
+            fmbr = dmbr @ beam.get_span_k(i).T
+            sl = slice(i * nx, (i + 1) * nx)
+            x[sl], M[:, sl], V[:, sl], R[:, sl], D[:, sl] = self._member_values(
+                beam, i, fmbr, dmbr, table
+            )
+            # Shift x vals by location of mbr starting point
+            x[sl] += sumL
+            sumL += beam.mbr_lengths[i]
+
+        return MemberResults(vals=(x, M, V, R, D))
+
+    def _member_values(
+        self,
+        beam: Beam,
+        i_span: int,
+        f: np.ndarray,
+        d: np.ndarray,
+        table: LoadTable,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Calculate the load effects along a single member for all load cases given
+        its nodal displacements and the stiffness forces.
+
+        Parameters
+        ----------
+        beam : Beam
+            The :class:`pycba.beam.Beam` object for which the results are required.
+        i_span : : int
+            The index of the member along the beam.
+        f : np.ndarray
+            The `(ncases, 4)` matrix of member forces due to the nodal displacements.
+        d : np.ndarray
+            The `(ncases, 4)` matrix of member nodal displacements.
+        table : LoadTable
+            The compiled loads of all load cases.
+
+        Returns
+        -------
+        (x, M, V, R, D) : Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+            The vector of local positions and the `(ncases, npts + 3)` load effects.
+        """
+        L = beam.mbr_lengths[i_span]
+        EI = beam.mbr_EIs[i_span]
+        etype = beam.mbr_eletype[i_span]
+
+        dx = L / self.npts
+        x = np.zeros(self.npts + 3)
+        x[1 : self.npts + 2] = dx * np.arange(0, self.npts + 1)
+        x[self.npts + 2] = L
+
+        # Released end forces of the applied loads complete the member forces,
+        # while their CNLs are needed for the releases
+        rows = table.span_slice(i_span)
+        cases = table.case[rows]
+        f = f.copy()
+        np.add.at(f, cases, table.get_ref(beam.mbr_lengths, beam.mbr_eletype, rows))
+        cnl = np.zeros((self.ncases, 4))
+        np.add.at(cnl, cases, table.get_cnl(beam.mbr_lengths, rows))
+
+        # Get the results for the end moments alone
+        Ma = f[:, 1:2]
+        Mb = f[:, 3:4]
+        Va = (Ma + Mb) / L
+        Ra = Ma * L / 3 - Mb * L / 6
+        V = Va * np.ones_like(x)
+        M = Va * x - Ma
+        R = (Va / 2) * x**2 - Ma * x + Ra
+        D = (Va / 6) * x**3 - (Ma / 2) * x**2 + Ra * x
+        V[:, [0, -1]] = 0.0
+        M[:, [0, -1]] = 0.0
+
+        # Now superimpose the results for all the applied loads on a simple span
+        for icase, load in zip(cases, table.get_loads(i_span)):
+            res = MemberResults(vals=(x, M[icase], V[icase], R[icase], D[icase]))
+            load.add_mbr_results_into(res, x, L)
+
+        # If no releases, the rotation at i is easy
+        R0 = d[:, 1]
+
+        # Otherwise, check account for releases
+        if etype > 1:
+            theta = (d[:, 2] - d[:, 0]) / L
+            phi = (L / (3 * EI)) * (
+                -(f[:, 1] - 0.5 * f[:, 3]) + (cnl[:, 1] - 0.5 * cnl[:, 3])
+            )
+            R0 = theta - phi
+
+        # And superimpose end displacements using Moment-Area
+        h = L / self.npts
+
+        Ri = integrate.cumulative_trapezoid(M[:, 1:-1], dx=h, axis=1, initial=0)
+        Ri = Ri / EI + R0[:, np.newaxis]
+        Di = integrate.cumulative_trapezoid(Ri, dx=h, axis=1, initial=0)
+        Di += d[:, 0:1]
+
+        R[:, 1:-1] = Ri
+        D[:, 1:-1] = Di
+        R[:, [0, -1]] = Ri[:, [0, -1]]
+        D[:, [0, -1]] = Di[:, [0, -1]]
+
+        return x, M, V, R, D
+
+
 class Envelopes:
     """
     Envelopes load effects from a vector of BeamResults
+
+    Along with each envelope, :attr:`idx` holds the index of the analysis that
+    gives it at every point (or reaction): the first analysis to give the extreme
+    value, or -1 where no analysis exceeds the zero of the envelope.
     """
 
     def __init__(self, vResults: List[MemberResults]):
@@ -208,15 +497,210 @@ class Envelopes:
         self.nres = len(vResults)
         self.nsup = len(vResults[0].R)
 
+        # Indices of the analyses giving the extremes, found with the envelopes
+        self.idx = {}
         self.Vmax, self.Vmin = self._get_envelope_V()
         self.Mmax, self.Mmin = self._get_envelope_M()
         self.Rmax, self.Rmin = self._get_envelope_R()
         self.Rmaxval = self.Rmax.max(axis=1)
         self.Rminval = self.Rmin.min(axis=1)
+        self.idx["Rmax"] = self._extreme_indices(self.Rmax.T)[0]
+        self.idx["Rmin"] = self._extreme_indices(self.Rmin.T)[1]
+
+    def scaled(self, factor: float) -> Envelopes:
+        """
+        Returns a copy of the envelopes with all load effects scaled by a factor,
+        as for the same loads scaled by it.
+
+        Parameters
+        ----------
+        factor : float
+            The positive scale factor.
+
+        Raises
+        ------
+        ValueError
+            If the factor is not positive.
+
+        Returns
+        -------
+        Envelopes
+            The scaled envelopes. The results of each analysis, :attr:`vResults`,
+            are only kept for a factor of one.
+        """
+        if factor <= 0:
+            raise ValueError("The scale factor must be positive")
+        env = copy(self)
+        for attr in ["Vmax", "Vmin", "Mmax", "Mmin", "Rmax", "Rmin"]:
+            setattr(env, attr, factor * getattr(self, attr))
+        env.Rmaxval = factor * self.Rmaxval
+        env.Rminval = factor * self.Rminval
+        if self.idx is not None:
+            env.idx = {key: idx.copy() for key, idx in self.idx.items()}
+        env.vResults = list(self.vResults) if factor == 1 else []
+        return env
+
+    @staticmethod
+    def _extreme_indices(vals: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the indices of the first maximum and minimum of stacked results
+        along their first axis, or -1 where these do not exceed zero.
+
+        Parameters
+        ----------
+        vals : np.ndarray
+            The `(nres, n)` matrix of the results of each analysis.
+
+        Returns
+        -------
+        imax : np.ndarray
+            The vector of the indices of the maximum values.
+        imin : np.ndarray
+            The vector of the indices of the minimum values.
+        """
+        imax = np.where(vals.max(axis=0) > 0, vals.argmax(axis=0), -1)
+        imin = np.where(vals.min(axis=0) < 0, vals.argmin(axis=0), -1)
+        return (imax, imin)
+
+    @classmethod
+    def streaming(cls, x: np.ndarray, nsup: int) -> Envelopes:
+        """
+        Creates zeroed envelopes to be updated with one analysis at a time by
+        :meth:`update`, without keeping the results of each analysis. Memory is
+        then independent of the number of analyses, and so the history of
+        reactions is not kept: :attr:`Rmax` and :attr:`Rmin` have no columns.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            The vector of points along the beam.
+        nsup : int
+            The number of reactions.
+
+        Returns
+        -------
+        Envelopes
+            The zeroed envelopes.
+        """
+        env = cls.__new__(cls)
+        env.vResults = []
+        env.x = x
+        env.npts = len(x)
+        env.nres = 0
+        env.nsup = nsup
+
+        env.Vmax = np.zeros(env.npts)
+        env.Vmin = np.zeros(env.npts)
+        env.Mmax = np.zeros(env.npts)
+        env.Mmin = np.zeros(env.npts)
+        env.Rmax = np.zeros((nsup, 0))
+        env.Rmin = np.zeros((nsup, 0))
+        env.Rmaxval = np.zeros(nsup)
+        env.Rminval = np.zeros(nsup)
+
+        # -1 until an analysis exceeds the zero of the envelope
+        env.idx = {
+            "Mmax": np.full(env.npts, -1),
+            "Mmin": np.full(env.npts, -1),
+            "Vmax": np.full(env.npts, -1),
+            "Vmin": np.full(env.npts, -1),
+            "Rmax": np.full(nsup, -1),
+            "Rmin": np.full(nsup, -1),
+        }
+        return env
+
+    def update(self, res: BeamResults):
+        """
+        Updates streaming envelopes with the results of the next analysis,
+        recording the index of the analysis giving each extreme value. The first
+        analysis to give an extreme is kept.
+
+        Parameters
+        ----------
+        res : BeamResults
+            The results of the analysis.
+
+        Raises
+        ------
+        ValueError
+            If the envelopes are not streaming, or the results are inconsistent.
+
+        Returns
+        -------
+        None.
+        """
+        if self.idx is None or self.Rmax.shape[1] != 0:
+            raise ValueError("Only streaming envelopes can be updated")
+        if len(res.results.x) != self.npts or len(res.R) != self.nsup:
+            raise ValueError("Cannot update with inconsistent results")
+
+        i = self.nres
+        for env_vals, key, vals in [
+            (self.Mmax, "Mmax", res.results.M),
+            (self.Mmin, "Mmin", res.results.M),
+            (self.Vmax, "Vmax", res.results.V),
+            (self.Vmin, "Vmin", res.results.V),
+            (self.Rmaxval, "Rmax", res.R),
+            (self.Rminval, "Rmin", res.R),
+        ]:
+            if key.endswith("max"):
+                mask = vals > env_vals
+            else:
+                mask = vals < env_vals
+            env_vals[mask] = vals[mask]
+            self.idx[key][mask] = i
+        self.nres += 1
+
+    def merge(self, env: Envelopes):
+        """
+        Merges streaming envelopes with those of the analyses that follow on
+        from its own, such as those of another part of a traverse. The indices of
+        the extremes of `env` are offset by the number of analyses so far, and
+        the first analysis to give an extreme is kept, so that merging is
+        associative and gives the same result as updating with all analyses in
+        turn.
+
+        Parameters
+        ----------
+        env : Envelopes
+            The streaming envelopes of the following analyses.
+
+        Raises
+        ------
+        ValueError
+            If the envelopes are not streaming, or are inconsistent.
+
+        Returns
+        -------
+        None.
+        """
+        if self.idx is None or env.idx is None:
+            raise ValueError("Only streaming envelopes can be merged")
+        if self.Rmax.shape[1] != 0 or env.Rmax.shape[1] != 0:
+            raise ValueError("Only streaming envelopes can be merged")
+        if self.npts != env.npts or self.nsup != env.nsup:
+            raise ValueError("Cannot merge inconsistent envelopes")
+
+        for key, env_vals, vals in [
+            ("Mmax", self.Mmax, env.Mmax),
+            ("Mmin", self.Mmin, env.Mmin),
+            ("Vmax", self.Vmax, env.Vmax),
+            ("Vmin", self.Vmin, env.Vmin),
+            ("Rmax", self.Rmaxval, env.Rmaxval),
+            ("Rmin", self.Rminval, env.Rminval),
+        ]:
+            if key.endswith("max"):
+                mask = vals > env_vals
+            else:
+                mask = vals < env_vals
+            env_vals[mask] = vals[mask]
+            self.idx[key][mask] = env.idx[key][mask] + self.nres
+        self.nres += env.nres
 
     def _get_envelope_V(self) -> Tuple[np.ndarray, np.ndarray]:
         """
-        Creates the envelopes for shear.
+        Creates the envelopes for shear, recording the index of the first
+        analysis giving each extreme in :attr:`idx`.
 
         Parameters
         ----------
@@ -231,15 +715,24 @@ class Envelopes:
         """
         Vmax = np.zeros(self.npts)
         Vmin = np.zeros(self.npts)
+        imax = np.full(self.npts, -1)
+        imin = np.full(self.npts, -1)
 
-        for res in self.vResults:
-            Vmax = np.maximum(Vmax, res.results.V)
-            Vmin = np.minimum(Vmin, res.results.V)
+        for i, res in enumerate(self.vResults):
+            vals = res.results.V
+            mask = vals > Vmax
+            Vmax[mask] = vals[mask]
+            imax[mask] = i
+            mask = vals < Vmin
+            Vmin[mask] = vals[mask]
+            imin[mask] = i
+        self.idx["Vmax"], self.idx["Vmin"] = imax, imin
         return (Vmax, Vmin)
 
     def _get_envelope_M(self) -> Tuple[np.ndarray, np.ndarray]:
         """
-        Creates the envelopes for moment.
+        Creates the envelopes for moment, recording the index of the first
+        analysis giving each extreme in :attr:`idx`.
 
         Parameters
         ----------
@@ -254,10 +747,18 @@ class Envelopes:
         """
         Mmax = np.zeros(self.npts)
         Mmin = np.zeros(self.npts)
+        imax = np.full(self.npts, -1)
+        imin = np.full(self.npts, -1)
 
-        for res in self.vResults:
-            Mmax = np.maximum(Mmax, res.results.M)
-            Mmin = np.minimum(Mmin, res.results.M)
+        for i, res in enumerate(self.vResults):
+            vals = res.results.M
+            mask = vals > Mmax
+            Mmax[mask] = vals[mask]
+            imax[mask] = i
+            mask = vals < Mmin
+            Mmin[mask] = vals[mask]
+            imin[mask] = i
+        self.idx["Mmax"], self.idx["Mmin"] = imax, imin
         return (Mmax, Mmin)
 
     def _get_envelope_R(self) -> Tuple[np.ndarray, np.ndarray]:
@@ -290,6 +791,71 @@ class Envelopes:
             Rmin[:, i] = np.minimum(zero, res.R)  # remove positives
         return (Rmax, Rmin)
 
+    @classmethod
+    def from_arrays(
+        cls,
+        x: np.ndarray,
+        Vmax: np.ndarray,
+        Vmin: np.ndarray,
+        Mmax: np.ndarray,
+        Mmin: np.ndarray,
+        R: np.ndarray,
+        idx: Optional[Dict[str, np.ndarray]] = None,
+    ) -> Envelopes:
+        """
+        Creates the envelopes from already enveloped load effects, such as those
+        found without a vector of :class:`pycba.results.BeamResults`. As for the
+        constructor, the envelopes include zero.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            The vector of points along the beam.
+        Vmax : np.ndarray
+            The vector of maximum shears.
+        Vmin : np.ndarray
+            The vector of minimum shears.
+        Mmax : np.ndarray
+            The vector of maximum moments.
+        Mmin : np.ndarray
+            The vector of minimum moments.
+        R : np.ndarray
+            The `(nres, nsup)` matrix of the reactions of each analysis.
+        idx : Optional[Dict[str, np.ndarray]], optional
+            The indices of the analyses giving the moment and shear envelopes, by
+            the envelope name, `Mmax` etc. Those of the reactions are found from
+            `R`. The default is None, for envelopes without indices.
+
+        Returns
+        -------
+        Envelopes
+            The envelopes object, of which :attr:`vResults` is empty.
+        """
+        env = cls.__new__(cls)
+        env.vResults = []
+        env.x = x
+        env.npts = len(x)
+        env.nres, env.nsup = R.shape
+
+        env.Vmax = np.maximum(Vmax, 0.0)
+        env.Vmin = np.minimum(Vmin, 0.0)
+        env.Mmax = np.maximum(Mmax, 0.0)
+        env.Mmin = np.minimum(Mmin, 0.0)
+        env.Rmax = np.maximum(R.T, 0.0)
+        env.Rmin = np.minimum(R.T, 0.0)
+        env.Rmaxval = env.Rmax.max(axis=1)
+        env.Rminval = env.Rmin.min(axis=1)
+
+        env.idx = None
+        if idx is not None:
+            # The index is -1 where the envelope is the zero bound
+            env.idx = {
+                key: np.where(getattr(env, key) != 0, idx[key], -1)
+                for key in ["Mmax", "Mmin", "Vmax", "Vmin"]
+            }
+            env.idx["Rmax"], env.idx["Rmin"] = env._extreme_indices(R)
+        return env
+
     @classmethod
     def zero_like(cls, env: Envelopes) -> Envelopes:
         """
@@ -314,11 +880,12 @@ class Envelopes:
         zero_env.Vmin = np.zeros(env.npts)
         zero_env.Mmax = np.zeros(env.npts)
         zero_env.Mmin = np.zeros(env.npts)
-        for i in range(env.nsup):
-            zero_env.Rmax[i] = np.zeros(env.nres)
-            zero_env.Rmin[i] = np.zeros(env.nres)
+        zero_env.Rmax = np.zeros_like(env.Rmax)
+        zero_env.Rmin = np.zeros_like(env.Rmin)
         zero_env.Rmaxval = np.zeros(env.nsup)
         zero_env.Rminval = np.zeros(env.nsup)
+        if env.idx is not None:
+            zero_env.idx = {k: np.full_like(v, -1) for k, v in env.idx.items()}
         return zero_env
 
     def augment(self, env: Envelopes):
@@ -358,7 +925,10 @@ class Envelopes:
         self.Rmaxval = np.maximum(self.Rmaxval, env.Rmaxval)
         self.Rminval = np.minimum(self.Rminval, env.Rminval)
 
-        if self.nres == env.nres:
+        # The indices of the extremes are no longer of a single set of analyses
+        self.idx = None
+
+        if self.Rmax.shape == env.Rmax.shape:
             self.Rmax = np.maximum(self.Rmax, env.Rmax)
             self.Rmin = np.minimum(self.Rmin, env.Rmin)
         else:
@@ -412,3 +982,135 @@ class Envelopes:
                 axs[1].plot(self.x, res.results.V, "b", lw=0.5)
 
         return fig, ax
+
+
+class FleetEnvelopes:
+    """
+    The envelopes of the load effects of each vehicle of a fleet crossing a bridge,
+    as arrays with a row for each vehicle
+    """
+
+    def __init__(
+        self,
+        x: np.ndarray,
+        pos: List[np.ndarray],
+        Vmax: np.ndarray,
+        Vmin: np.ndarray,
+        Mmax: np.ndarray,
+        Mmin: np.ndarray,
+        Rmaxval: np.ndarray,
+        Rminval: np.ndarray,
+        idx: Dict[str, np.ndarray],
+    ):
+        """
+        Constructs the fleet envelopes from the envelopes of each vehicle.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            The vector of points along the beam.
+        pos : List[np.ndarray]
+            The vector of the positions of each vehicle.
+        Vmax : np.ndarray
+            The `(nveh, npts)` matrix of the maximum shears of each vehicle.
+        Vmin : np.ndarray
+            The `(nveh, npts)` matrix of the minimum shears of each vehicle.
+        Mmax : np.ndarray
+            The `(nveh, npts)` matrix of the maximum moments of each vehicle.
+        Mmin : np.ndarray
+            The `(nveh, npts)` matrix of the minimum moments of each vehicle.
+        Rmaxval : np.ndarray
+            The `(nveh, nsup)` matrix of the maximum reactions of each vehicle.
+        Rminval : np.ndarray
+            The `(nveh, nsup)` matrix of the minimum reactions of each vehicle.
+        idx : Dict[str, np.ndarray]
+            The matrices of the indices of the positions giving each envelope, by
+            its name, as for :attr:`pycba.results.Envelopes.idx`.
+
+        Returns
+        -------
+        None.
+        """
+        self.x = x
+        self.pos = pos
+        self.Vmax = Vmax
+        self.Vmin = Vmin
+        self.Mmax = Mmax
+        self.Mmin = Mmin
+        self.Rmaxval = Rmaxval
+        self.Rminval = Rminval
+        self.idx = idx
+        self.nveh, self.npts = Mmax.shape
+        self.nsup = Rmaxval.shape[1]
+
+    def get_envelopes(self, i: int) -> Envelopes:
+        """
+        Returns the envelopes of a vehicle, as streaming envelopes, without the
+        history of reactions.
+
+        Parameters
+        ----------
+        i : int
+            The index of the vehicle.
+
+        Returns
+        -------
+        Envelopes
+            The envelopes of the vehicle.
+        """
+        env = Envelopes.streaming(self.x, self.nsup)
+        env.nres = len(self.pos[i])
+        env.Vmax[:] = self.Vmax[i]
+        env.Vmin[:] = self.Vmin[i]
+        env.Mmax[:] = self.Mmax[i]
+        env.Mmin[:] = self.Mmin[i]
+        env.Rmaxval[:] = self.Rmaxval[i]
+        env.Rminval[:] = self.Rminval[i]
+        for key in env.idx:
+            env.idx[key][:] = self.idx[key][i]
+        return env
+
+    def critical_values(self) -> Dict[str, Dict[str, np.ndarray]]:
+        """
+        Returns the extreme values of each vehicle, their locations, and the
+        position of the vehicle for each, as for
+        :meth:`pycba.bridge.BridgeAnalysis.critical_values`.
+
+        Returns
+        -------
+        crit_values : Dict[str, Dict[str, np.ndarray]]
+            A dictionary of dictionaries of the vectors of the critical values of
+            each vehicle. The position of a moment or shear is NaN where the
+            vehicle does not cause the extreme, and that of a reaction is then the
+            first position.
+        """
+        iveh = np.arange(self.nveh)
+
+        def position(i: np.ndarray) -> np.ndarray:
+            return np.array(
+                [p[j] if j >= 0 else np.nan for p, j in zip(self.pos, i.tolist())]
+            )
+
+        crit_values = {}
+        for key, vals in zip(
+            ["Mmax", "Mmin", "Vmax", "Vmin"],
+            [self.Mmax, self.Mmin, self.Vmax, self.Vmin],
+        ):
+            j = vals.argmax(axis=1) if key.endswith("max") else vals.argmin(axis=1)
+            crit_values[key] = {
+                "val": vals[iveh, j],
+                "at": self.x[j],
+                "pos": position(self.idx[key][iveh, j]),
+            }
+        crit_values["nsup"] = self.nsup
+        for i in range(self.nsup):
+            # The first position if a reaction is never non-zero
+            crit_values[f"Rmax{i}"] = {
+                "val": self.Rmaxval[:, i],
+                "pos": position(np.maximum(self.idx["Rmax"][:, i], 0)),
+            }
+            crit_values[f"Rmin{i}"] = {
+                "val": self.Rminval[:, i],
+                "pos": position(np.maximum(self.idx["Rmin"][:, i], 0)),
+            }
+        return crit_values
@@ -127,6 +127,129 @@ def make_train(vehicles: List[Vehicle], spacings: np.ndarray):
     return Vehicle(new_vehicle_spaces[1:], new_vehicle_axles)
 
 
+class VehicleFleet:
+    """
+    A fleet of many vehicles for a batched bridge crossing analysis, stored as
+    arrays with a row for each vehicle, padded with zeros to the greatest number
+    of axles
+    """
+
+    def __init__(
+        self,
+        axle_spacings: np.ndarray,
+        axle_weights: np.ndarray,
+        n_axles: Optional[np.ndarray] = None,
+    ):
+        """
+        Constructs the :class:`pycba.vehicle.VehicleFleet` object from the padded
+        arrays of the axle spacings and weights of each vehicle.
+
+        Parameters
+        ----------
+        axle_spacings : np.ndarray
+            The `(nveh, nmax-1)` matrix of the axle spacings of each vehicle,
+            padded with zeros after its last spacing.
+        axle_weights : np.ndarray
+            The `(nveh, nmax)` matrix of the axle weights of each vehicle, padded
+            with zeros after its last axle.
+        n_axles : Optional[np.ndarray], optional
+            The vector of the number of axles of each vehicle. The default is
+            None, for all vehicles to have `nmax` axles.
+
+        Raises
+        ------
+        ValueError
+            If the shapes of the arrays are inconsistent, a number of axles is
+            out of range, or the padding is not zero.
+
+        Returns
+        -------
+        None.
+        """
+        self.axs = np.atleast_2d(np.asarray(axle_spacings, dtype=float))
+        self.axw = np.atleast_2d(np.asarray(axle_weights, dtype=float))
+        nveh, nmax = self.axw.shape
+
+        if self.axs.shape != (nveh, nmax - 1):
+            raise ValueError("Inconsistent axle spacing and weight counts")
+        if n_axles is None:
+            n_axles = np.full(nveh, nmax)
+        self.NoAxles = np.asarray(n_axles, dtype=int)
+        if self.NoAxles.shape != (nveh,):
+            raise ValueError("Inconsistent vehicle and axle counts")
+        if np.any(self.NoAxles < 1) or np.any(self.NoAxles > nmax):
+            raise ValueError("Axle counts must be from one to the padded count")
+
+        iax = np.arange(nmax)
+        pad = iax >= self.NoAxles[:, np.newaxis]
+        if np.any(self.axw[pad] != 0) or np.any(self.axs[pad[:, 1:]] != 0):
+            raise ValueError("Padded axle spacings and weights must be zero")
+
+        self.NoVehicles = nveh
+        self.axle_coords = np.zeros((nveh, nmax))
+        self.axle_coords[:, 1:] = np.cumsum(self.axs, axis=1)
+        self.L = self.axle_coords[:, -1].copy()
+        self.W = self.axw.sum(axis=1)
+
+    @classmethod
+    def from_vehicles(cls, vehicles: List[Vehicle]) -> VehicleFleet:
+        """
+        Creates a fleet from a list of :class:`pycba.vehicle.Vehicle` objects,
+        keeping their directions.
+
+        Parameters
+        ----------
+        vehicles : List[Vehicle]
+            The vehicles of the fleet.
+
+        Raises
+        ------
+        ValueError
+            If the list is empty.
+
+        Returns
+        -------
+        VehicleFleet
+            The fleet object.
+        """
+        if len(vehicles) == 0:
+            raise ValueError("A fleet needs at least one vehicle")
+        n_axles = np.array([veh.NoAxles for veh in vehicles])
+        nmax = n_axles.max()
+        axs = np.zeros((len(vehicles), nmax - 1))
+        axw = np.zeros((len(vehicles), nmax))
+        for i, veh in enumerate(vehicles):
+            axs[i, : veh.NoAxles - 1] = veh.axs
+            axw[i, : veh.NoAxles] = veh.axw
+        fleet = cls(axs, axw, n_axles)
+        # Any reversed vehicles
+        for i, veh in enumerate(vehicles):
+            fleet.axle_coords[i, : veh.NoAxles] = veh.axle_coords
+        return fleet
+
+    def __len__(self) -> int:
+        return self.NoVehicles
+
+    def get_vehicle(self, i: int) -> Vehicle:
+        """
+        Returns a vehicle of the fleet.
+
+        Parameters
+        ----------
+        i : int
+            The index of the vehicle.
+
+        Returns
+        -------
+        Vehicle
+            The :class:`pycba.vehicle.Vehicle` object.
+        """
+        n = self.NoAxles[i]
+        veh = Vehicle(self.axs[i, : n - 1].copy(), self.axw[i, :n].copy())
+        veh.axle_coords = self.axle_coords[i, :n].copy()
+        return veh
+
+
 class VehicleLibrary:
     """
     A repository of some useful vehicles for analysis
@@ -0,0 +1,319 @@
+"""
+PyCBA - Continuous Beam Analysis - Weigh-in-Motion Module
+"""
+
+from __future__ import annotations  # https://bit.ly/3KYiL2o
+from typing import Optional, Union, Iterable, Iterator, Tuple, TextIO
+from itertools import chain, islice
+import struct
+import numpy as np
+from .bridge import BridgeAnalysis
+from .vehicle import VehicleFleet
+
+# The size of the header of a fleet file, so that it can be rewritten in place
+_HEADER_SIZE = 1024
+
+
+def fleet_dtype(max_axles: int) -> np.dtype:
+    """
+    Returns the structured dtype of the records of a fleet file: the timestamp,
+    number of axles, and the axle spacings and weights padded with zeros.
+
+    Parameters
+    ----------
+    max_axles : int
+        The greatest number of axles of a vehicle.
+
+    Returns
+    -------
+    np.dtype
+        The dtype of a record.
+    """
+    return np.dtype(
+        [
+            ("timestamp", "datetime64[ms]"),
+            ("n_axles", "<i4"),
+            ("axs", "<f8", (max_axles - 1,)),
+            ("axw", "<f8", (max_axles,)),
+        ]
+    )
+
+
+def read_wim_csv(
+    path: str,
+    chunk_size: int = 100000,
+    max_axles: Optional[int] = None,
+    header: bool = True,
+) -> Iterator[Tuple[np.ndarray, VehicleFleet]]:
+    """
+    Reads a CSV file of weigh-in-motion records in chunks, so that the memory
+    needed does not depend on the size of the file.
+
+    Each line is a record of a vehicle: its ISO 8601 timestamp, its number of
+    axles `n`, its `n-1` axle spacings, and its `n` axle weights. The numbers
+    of fields are checked against the numbers of axles for the whole chunk at
+    once.
+
+    Parameters
+    ----------
+    path : str
+        The path of the CSV file.
+    chunk_size : int, optional
+        The number of records in each chunk. The default is 100000.
+    max_axles : Optional[int], optional
+        The greatest number of axles of a vehicle, to which the fleet arrays are
+        padded. The default is None, for the greatest of each chunk.
+    header : bool, optional
+        Whether or not the first line is a header to skip. The default is True.
+
+    Raises
+    ------
+    ValueError
+        If any record has a number of fields inconsistent with its number of
+        axles, or more axles than `max_axles`.
+
+    Yields
+    ------
+    timestamps : np.ndarray
+        The vector of the timestamps of the vehicles of the chunk.
+    fleet : VehicleFleet
+        The :class:`pycba.vehicle.VehicleFleet` of the vehicles of the chunk.
+    """
+    with open(path) as f:
+        nline = 0
+        if header:
+            next(f, None)
+            nline += 1
+        while True:
+            lines = list(islice(f, chunk_size))
+            if not lines:
+                break
+            (timestamps, fleet) = _parse_wim_lines(lines, nline, max_axles)
+            nline += len(lines)
+            if len(fleet):
+                yield timestamps, fleet
+
+
+def _parse_wim_lines(
+    lines: list, nline: int, max_axles: Optional[int]
+) -> Tuple[np.ndarray, VehicleFleet]:
+    """
+    Parses a chunk of lines of a weigh-in-motion CSV file, validating the
+    records together.
+    """
+    rows = [line.split(",") for line in lines if line.strip()]
+    lineno = [nline + i + 1 for i, line in enumerate(lines) if line.strip()]
+    if not rows:
+        nmax = 1 if max_axles is None else max_axles
+        return (
+            np.array([], dtype="datetime64[ms]"),
+            VehicleFleet(np.zeros((0, nmax - 1)), np.zeros((0, nmax)), []),
+        )
+    timestamps = np.array([r[0].strip() for r in rows], dtype="datetime64[ms]")
+    nfields = np.array([len(r) - 1 for r in rows])
+    vals = np.array(list(chain.from_iterable(r[1:] for r in rows)), dtype=float)
+
+    # Each record is n, then n-1 spacings and n weights: 2n fields
+    start = np.concatenate(([0], np.cumsum(nfields)[:-1]))
+    n = np.zeros(len(rows))
+    n[nfields > 0] = vals[start[nfields > 0]]
+    bad = (n != np.round(n)) | (n < 1) | (nfields != 2 * n)
+    if max_axles is not None:
+        bad |= n > max_axles
+    if bad.any():
+        lines_bad = np.array(lineno)[bad][:10].tolist()
+        raise ValueError(
+            f"Inconsistent axle counts in WIM records at lines {lines_bad}"
+        )
+
+    n = n.astype(int)
+    nmax = n.max() if max_axles is None else max_axles
+    iax = np.arange(nmax)
+    on_w = iax < n[:, np.newaxis]
+    on_s = on_w[:, 1:]
+    axs = np.zeros((len(n), nmax - 1))
+    axw = np.zeros((len(n), nmax))
+    axs[on_s] = vals[(start[:, np.newaxis] + 1 + iax[:-1])[on_s]]
+    axw[on_w] = vals[((start + n)[:, np.newaxis] + iax)[on_w]]
+    return timestamps, VehicleFleet(axs, axw, n)
+
+
+def save_fleet(
+    path: str,
+    records: Iterable[Tuple[np.ndarray, VehicleFleet]],
+    max_axles: int,
+) -> int:
+    """
+    Saves chunks of vehicles to a fleet file, a `.npy` file of a structured array
+    (see :func:`fleet_dtype`) that can be opened memory-mapped by
+    :func:`load_fleet`. The chunks are written as they are given, such as from
+    :func:`read_wim_csv`, so the whole fleet is never in memory.
+
+    Parameters
+    ----------
+    path : str
+        The path of the fleet file.
+    records : Iterable[Tuple[np.ndarray, VehicleFleet]]
+        The chunks of the timestamps and fleets of the vehicles.
+    max_axles : int
+        The greatest number of axles of a vehicle.
+
+    Raises
+    ------
+    ValueError
+        If a vehicle has more than `max_axles` axles.
+
+    Returns
+    -------
+    int
+        The number of vehicles saved.
+    """
+    dtype = fleet_dtype(max_axles)
+    count = 0
+    with open(path, "wb") as f:
+        f.write(_npy_header(dtype, 0))
+        for timestamps, fleet in records:
+            if fleet.NoAxles.max() > max_axles:
+                raise ValueError(f"Vehicles have more than {max_axles} axles")
+            nmax = min(fleet.axw.shape[1], max_axles)
+            rec = np.zeros(len(fleet), dtype=dtype)
+            rec["timestamp"] = timestamps
+            rec["n_axles"] = fleet.NoAxles
+            rec["axs"][:, : nmax - 1] = fleet.axs[:, : nmax - 1]
+            rec["axw"][:, :nmax] = fleet.axw[:, :nmax]
+            f.write(rec.tobytes())
+            count += len(rec)
+        # The header is the same size for the final count
+        f.seek(0)
+        f.write(_npy_header(dtype, count))
+    return count
+
+
+def _npy_header(dtype: np.dtype, count: int) -> bytes:
+    """
+    Returns the `.npy` format header of a vector of records, padded to a fixed
+    size.
+    """
+    d = {
+        "descr": np.lib.format.dtype_to_descr(dtype),
+        "fortran_order": False,
+        "shape": (count,),
+    }
+    hlen = _HEADER_SIZE - 10
+    header = repr(d).encode("latin1")
+    header += b" " * (hlen - len(header) - 1) + b"\n"
+    return np.lib.format.magic(1, 0) + struct.pack("<H", hlen) + header
+
+
+def open_fleet(path: str) -> np.ndarray:
+    """
+    Opens a fleet file memory-mapped and read-only.
+
+    Parameters
+    ----------
+    path : str
+        The path of the fleet file.
+
+    Raises
+    ------
+    ValueError
+        If the file is not a fleet file.
+
+    Returns
+    -------
+    np.ndarray
+        The memory-mapped structured vector of the records.
+    """
+    rec = np.load(path, mmap_mode="r", allow_pickle=False)
+    names = ("timestamp", "n_axles", "axs", "axw")
+    if rec.dtype.names is None or rec.dtype.names != names:
+        raise ValueError(f"{path} is not a fleet file")
+    return rec
+
+
+def load_fleet(
+    path: str, chunk_size: int = 100000
+) -> Iterator[Tuple[np.ndarray, VehicleFleet]]:
+    """
+    Reads a fleet file in chunks, from its memory map, without parsing.
+
+    Parameters
+    ----------
+    path : str
+        The path of the fleet file.
+    chunk_size : int, optional
+        The number of records in each chunk. The default is 100000.
+
+    Yields
+    ------
+    timestamps : np.ndarray
+        The vector of the timestamps of the vehicles of the chunk.
+    fleet : VehicleFleet
+        The :class:`pycba.vehicle.VehicleFleet` of the vehicles of the chunk.
+    """
+    rec = open_fleet(path)
+    for i in range(0, len(rec), chunk_size):
+        chunk = rec[i : i + chunk_size]
+        fleet = VehicleFleet(chunk["axs"], chunk["axw"], chunk["n_axles"])
+        yield chunk["timestamp"], fleet
+
+
+def run_wim(
+    bridge: BridgeAnalysis,
+    records: Iterable[Tuple[np.ndarray, VehicleFleet]],
+    step: float,
+    out: Union[str, TextIO],
+) -> int:
+    """
+    Runs each chunk of vehicles over the bridge with
+    :meth:`pycba.bridge.BridgeAnalysis.run_fleet`, writing the critical values
+    of each vehicle to a CSV file as each chunk is done, so that neither the
+    vehicles nor their results are all kept.
+
+    Each line of the output is the timestamp of a vehicle, then the value,
+    location, and vehicle position of its maximum and minimum moment and shear,
+    and the value and vehicle position of its maximum and minimum reaction at
+    each support.
+
+    Parameters
+    ----------
+    bridge : BridgeAnalysis
+        The :class:`pycba.bridge.BridgeAnalysis` of the bridge.
+    records : Iterable[Tuple[np.ndarray, VehicleFleet]]
+        The chunks of the timestamps and fleets of the vehicles, such as from
+        :func:`read_wim_csv` or :func:`load_fleet`.
+    step : float
+        The distance increment to move each vehicle.
+    out : Union[str, TextIO]
+        The path of the output file, or an open text file.
+
+    Returns
+    -------
+    int
+        The number of vehicles run.
+    """
+    if isinstance(out, str):
+        with open(out, "w") as f:
+            return run_wim(bridge, records, step, f)
+
+    count = 0
+    for timestamps, fleet in records:
+        cvals = bridge.run_fleet(fleet, step).critical_values()
+        cols = []
+        names = []
+        for key in ["Mmax", "Mmin", "Vmax", "Vmin"]:
+            for item in ["val", "at", "pos"]:
+                cols.append(cvals[key][item])
+                names.append(f"{key}_{item}")
+        for i in range(cvals["nsup"]):
+            for key in [f"Rmax{i}", f"Rmin{i}"]:
+                for item in ["val", "pos"]:
+                    cols.append(cvals[key][item])
+                    names.append(f"{key}_{item}")
+        if count == 0:
+            out.write(",".join(["timestamp"] + names) + "\n")
+        data = np.column_stack(cols)
+        for ts, row in zip(np.datetime_as_string(timestamps), data):
+            out.write(ts + "," + ",".join(f"{v:.10g}" for v in row) + "\n")
+        count += len(fleet)
+    return count
@@ -552,3 +552,356 @@ def test_envelopes():
         [np.min(env.Vmin[i * (n + 3) : (i + 1) * (n + 3)]) for i in range(nspans)]
     )
     assert np.allclose(Vmin, np.array([-180.23, -123.94, -131.10]), atol=1e-2)
+
+
+@pytest.mark.parametrize(
+    "L, R, eType",
+    [
+        ([5, 5, 10], [-1, -1, 0, 0, -1, 0, -1, 0], [2, 1, 1]),
+        ([6, 8, 6], [-1, 486e9, -1, 486e9, -1, 486e9, -1, 486e9], [1, 1, 1]),
+        ([15, 15, 15], [-1, 0, 1e8, 0, 1e8, 0, -1, 0], [1, 1, 1]),
+        ([10, 5, 5], [-1, -1, -1, 0, 0, 0, -1, -1], [1, 1, 3]),
+        ([10], [-1, -1, -1, -1], [4]),
+    ],
+)
+def test_banded_solver(L, R, eType):
+    """
+    The banded solver must reproduce the dense solver results
+    """
+    EI = 30 * 600e7 * np.ones(len(L)) * 1e-6
+    LM = [[1, 2, 20, 2.5, 0], [len(L), 1, 10, 0, 0]]
+
+    dense = cba.BeamAnalysis(L, EI, R, LM, eType)
+    dense.analyze()
+    banded = cba.BeamAnalysis(L, EI, R, LM, eType, solver="banded")
+    banded.analyze()
+
+    assert banded.beam_results.R == pytest.approx(dense.beam_results.R)
+    assert banded.beam_results.D == pytest.approx(dense.beam_results.D)
+    assert banded.beam_results.results.M == pytest.approx(
+        dense.beam_results.results.M
+    )
+
+
+def test_banded_solver_many_spans():
+    """
+    A 10,000-span beam solved without forming the dense stiffness matrix
+    """
+    n = 10000
+    w = 10.0
+    L = 20.0 * np.ones(n)
+    R = [-1, 0] * (n + 1)
+    LM = [[i + 1, 1, w, 0, 0] for i in range(n)]
+
+    beam_analysis = cba.BeamAnalysis(L, 1e6, R, LM, solver="banded")
+    beam_analysis.npts = 10
+    out = beam_analysis.analyze()
+    assert out == 0
+
+    r = beam_analysis.beam_results.R
+    assert sum(r) == pytest.approx(w * L.sum())
+    # Interior supports of a long uniformly-loaded beam tend to w * L
+    assert r[n // 2] == pytest.approx(w * 20.0)
+
+    with pytest.raises(ValueError):
+        cba.BeamAnalysis(L, 1e6, R, solver="sparse")
+
+
+def test_dof_partition():
+    """
+    Free and restrained DOFs are partitioned once, springs counting as free
+    """
+    L = [15, 15, 15]
+    EI = 30 * np.array([500e8, 500e8, 500e8]) * 1e-6  # kNm2
+    R = [-1, 0, 1e8, 0, 1e8, 0, -1, -1]
+    LM = [[1, 1, 20, 0, 0], [2, 1, 20, 0, 0], [3, 1, 20, 0, 0]]
+
+    beam_analysis = cba.BeamAnalysis(L, EI, R, LM)
+    beam = beam_analysis.beam
+    assert beam.fixed_dofs.tolist() == [0, 6, 7]
+    assert beam.free_dofs.tolist() == [1, 2, 3, 4, 5]
+    assert beam.springs.tolist() == [0, 1e8, 0, 1e8, 0]
+
+    beam_analysis.analyze()
+    d = beam_analysis.beam_results.D
+    assert d[beam.fixed_dofs] == pytest.approx([0, 0, 0])
+
+    # Reactions and spring forces equilibrate the applied load
+    r = beam_analysis.beam_results.R
+    spring_forces = -1e8 * d[[2, 4]]
+    assert sum(r[:2]) + sum(spring_forces) == pytest.approx(20 * 45)
+
+
+@pytest.mark.parametrize("solver", ["dense", "banded"])
+def test_factorization_cache(solver):
+    """
+    The stiffness factorization is reused across load changes and refreshed
+    when the beam stiffness definition changes
+    """
+    L = [7.5, 7.0]
+    EI = 30 * 600e7 * 1e-6  # kNm2
+    R = [-1, 0, -1, 0, -1, 0]
+    LM = [[1, 1, 20, 0, 0], [2, 1, 20, 0, 0]]
+
+    beam_analysis = cba.BeamAnalysis(L, EI, R, solver=solver)
+    beam_analysis.set_loads([[1, 2, 50, 3.0, 0]])
+    beam_analysis.analyze()
+    lu = beam_analysis._kff_lu
+
+    beam_analysis.set_loads(LM)
+    beam_analysis.analyze()
+    assert beam_analysis._kff_lu is lu
+    assert beam_analysis.beam_results.R == pytest.approx(
+        [57.41666667, 181.42261905, 51.16071429]
+    )
+
+    # Changing the restraints invalidates the factorization
+    R2 = [-1, 0, -1, 0, -1, -1]
+    beam_analysis.beam.restraints = R2
+    beam_analysis.analyze()
+    assert beam_analysis._kff_lu is not lu
+    fresh = cba.BeamAnalysis(L, EI, R2, LM, solver=solver)
+    fresh.analyze()
+    assert beam_analysis.beam_results.R == pytest.approx(fresh.beam_results.R)
+
+    # As does an in-place change of EI
+    lu = beam_analysis._kff_lu
+    beam_analysis.beam.mbr_EIs[1] *= 2
+    beam_analysis.analyze()
+    assert beam_analysis._kff_lu is not lu
+    fresh = cba.BeamAnalysis(L, [EI, 2 * EI], R2, LM, solver=solver)
+    fresh.analyze()
+    assert beam_analysis.beam_results.R == pytest.approx(fresh.beam_results.R)
+
+
+@pytest.mark.parametrize("solver", ["dense", "banded"])
+def test_analyze_many(solver):
+    """
+    Batched analysis of load cases matches one analysis per load case
+    """
+    L = [5, 5, 10]
+    EI = 30 * 600e7 * np.ones(len(L)) * 1e-6
+    eType = [2, 1, 1]
+    R = [-1, -1, 0, 0, -1, 0, -1, 0]
+    LMs = [
+        [[3, 2, 20, 5, 0], [1, 1, 3]],
+        [[1, 3, 5, 1, 2], [2, 4, 10, 2.5]],
+        [],
+        [[2, 2, 1, 0.0]],
+    ]
+
+    beam_analysis = cba.BeamAnalysis(L, EI, R, eletype=eType, solver=solver)
+    batch = beam_analysis.analyze_many(LMs, npts=50)
+
+    npts = 3 * (50 + 3)
+    assert batch.ncases == 4
+    assert batch.results.M.shape == (4, npts)
+    assert batch.D.shape == (4, 8)
+    assert batch.R.shape == (4, 4)
+
+    for i, LM in enumerate(LMs):
+        beam_analysis.set_loads(LM)
+        beam_analysis.analyze(npts=50)
+        res = beam_analysis.beam_results
+        assert batch.R[i] == pytest.approx(res.R, abs=1e-9)
+        assert batch.D[i] == pytest.approx(res.D, abs=1e-12)
+        assert batch.results.x == pytest.approx(res.results.x)
+        assert batch.results.M[i] == pytest.approx(res.results.M, abs=1e-9)
+        assert batch.results.V[i] == pytest.approx(res.results.V, abs=1e-9)
+        assert batch.results.D[i] == pytest.approx(res.results.D, abs=1e-12)
+
+
+def test_element_k_tensor():
+    """
+    The vectorized member stiffness tensor matches the per-span matrices
+    """
+    L = [3, 4, 5, 6]
+    EI = [1e4, 2e4, 3e4, 4e4]
+    R = [-1, -1, 0, 0, -1, 0, 0, 0, -1, -1]
+    beam = cba.Beam(L=L, EI=EI, R=R, eletype=[1, 2, 3, 4])
+
+    assert isinstance(beam.mbr_lengths, np.ndarray)
+    assert beam._terminal_coords == pytest.approx([0, 3, 7, 12, 18])
+
+    k = beam.get_element_k()
+    assert k.shape == (4, 4, 4)
+    for i in range(beam.no_spans):
+        assert k[i] == pytest.approx(beam.get_span_k(i))
+
+
+def test_load_table():
+    """
+    The vectorized CNLs and REFs of the load table match the Load objects
+    """
+    L = np.array([5.0, 6.0, 7.0, 8.0])
+    eType = np.array([1, 2, 3, 4])
+    LM = [
+        [2, 1, 10],
+        [1, 2, 20, 1.5],
+        [4, 3, 5, 2.0, 3.0],
+        [3, 3, -5, 5.0, 4.0],  # hangs off the span
+        [2, 4, 30, 2.5],
+        [3, 2, 15, 7.0, 0],
+        [4, 2, 15, 0.0, 0],
+        [9, 1, 10],  # no such span
+    ]
+    table = cba.LoadTable.from_LM(LM, len(L))
+    assert len(table) == 7
+    assert table.offsets.tolist() == [0, 1, 3, 5, 7]
+
+    cnl = table.get_cnl(L)
+    ref = table.get_ref(L, eType)
+    for i in range(len(L)):
+        rows = table.span_slice(i)
+        for k, load in zip(range(rows.start, rows.stop), table.get_loads(i)):
+            assert cnl[k] == pytest.approx(load.get_cnl(L[i], eType[i]))
+            assert ref[k] == pytest.approx(load.get_ref(L[i], eType[i]))
+
+
+def test_local_span_coords_array():
+    """
+    Check the vectorized span lookup against the scalar one
+    """
+    L = [7.5, 7.0, 7.0, 7.5]
+    beam = cba.Beam(L, 30 * 600e7 * 1e-6, [-1, 0] * 5, eletype=[1, 1, 1, 1])
+    pos = np.array([-1.0, 0.0, 3.2, 7.5, 14.5, 20.0, 29.0, 29.5])
+    ispan, pos_in_span = beam.get_local_span_coords_array(pos)
+
+    assert ispan.tolist() == [-1, 0, 0, 1, 2, 2, 3, -1]
+    assert pos_in_span == pytest.approx([0.0, 0.0, 3.2, 0.0, 0.0, 5.5, 7.5, 0.0])
+    for p, i, x in zip(pos, ispan, pos_in_span):
+        assert beam.get_local_span_coords(p) == (i, pytest.approx(x))
+
+
+def test_lazy_beam_results():
+    """
+    Member results are only calculated when accessed, and are unaffected by later
+    changes to the loads on the analysis
+    """
+    L = [7.5, 7.0, 7.0, 7.5]
+    EI = 30 * 600e7 * 1e-6
+    R = [-1, 0, -1, 0, -1, 0, -1, 0, -1, 0]
+    LM = [[1, 1, 10, 0, 0], [3, 2, 50, 3.5, 0]]
+
+    ba = cba.BeamAnalysis(L, EI, R, LM)
+    ba.analyze()
+    res = ba.beam_results
+    assert res._results is None and not res._vRes
+    R0 = res.R.copy()
+
+    ba.set_loads([[2, 1, 20, 0, 0]])
+    ba.analyze()
+    assert res.R == pytest.approx(R0)
+
+    ref = cba.BeamAnalysis(L, EI, R, LM)
+    ref.analyze()
+    assert res.results.M == pytest.approx(ref.beam_results.results.M)
+    assert res.results.D == pytest.approx(ref.beam_results.results.D)
+
+    part = cba.BeamResults(ref.beam, ref.beam_results.D, ref.beam_results.R, spans=[2])
+    assert len(part.vRes) == 1
+    assert part.vRes[0].M == pytest.approx(ref.beam_results.vRes[2].M)
+    assert part.results.x[0] == pytest.approx(14.5)
+
+    with pytest.raises(ValueError):
+        cba.BeamResults(ref.beam, ref.beam_results.D, ref.beam_results.R, spans=[4])
+
+    ba = cba.BeamAnalysis(L, EI, R, LM)
+    ba.analyze(spans=[2, 0])
+    res = ba.beam_results
+    assert res.R == pytest.approx(ref.beam_results.R)
+    assert [len(v.x) for v in res.vRes] == [ref.npts + 3] * 2
+    assert res.vRes[0].M == pytest.approx(ref.beam_results.vRes[2].M)
+    assert res.vRes[1].V == pytest.approx(ref.beam_results.vRes[0].V)
+    with pytest.raises(ValueError):
+        ba.analyze(spans=[1, 1])
+
+
+def test_beam_results_buffer():
+    """
+    Member results are views into the one buffer, optionally without the
+    duplicated member end points
+    """
+    L = [7.5, 7.0, 7.0, 7.5]
+    EI = 30 * 600e7 * 1e-6
+    R = [-1, 0, -1, 0, -1, 0, -1, 0, -1, 0]
+    LM = [[1, 1, 10, 0, 0], [3, 2, 50, 3.5, 0]]
+    npts = 50
+
+    ba = cba.BeamAnalysis(L, EI, R, LM)
+    ba.analyze(npts)
+    full = ba.beam_results
+    assert len(full.results.x) == 4 * (npts + 3)
+    assert np.shares_memory(full.vRes[1].M, full.results.M)
+
+    ba.analyze(npts, ends=False)
+    trim = ba.beam_results
+    assert len(trim.results.x) == 4 * (npts + 1)
+    for res_full, res_trim in zip(full.vRes, trim.vRes):
+        assert res_trim.x == pytest.approx(res_full.x[1:-1])
+        assert res_trim.M == pytest.approx(res_full.M[1:-1])
+        assert res_trim.D == pytest.approx(res_full.D[1:-1])
+
+
+def test_member_results_in_place():
+    """
+    In-place superposition of member results matches the sum of the separate
+    load results
+    """
+    L = 10.0
+    x = np.zeros(53)
+    x[1:-1] = np.linspace(0, L, 51)
+    x[-1] = L
+    loads = [
+        cba.LoadUDL(0, 5.0),
+        cba.LoadPL(0, 20.0, 3.0),
+        cba.LoadPUDL(0, 10.0, 2.0, 4.0),
+        cba.LoadML(0, 15.0, 6.0),
+        cba.LoadMaMb(0, 12.0, -8.0),
+    ]
+
+    total = cba.MemberResults(n=len(x))
+    total.x = x
+    for load in loads:
+        total = total + load.get_mbr_results(x, L)
+
+    res = cba.MemberResults(n=len(x))
+    res.x = x
+    res.accumulate(loads, L)
+    for attr in ("M", "V", "R", "D"):
+        assert getattr(res, attr) == pytest.approx(getattr(total, attr))
+
+    res += loads[0].get_mbr_results(x, L)
+    assert res.R == pytest.approx(total.R + loads[0].get_mbr_results(x, L).R)
+
+    with pytest.raises(AttributeError):
+        res.other = 1.0
+    with pytest.raises(ValueError):
+        res += cba.MemberResults(n=len(x))
+    with pytest.raises(ValueError):
+        res + cba.MemberResults(n=len(x))
+
+
+def test_factorize_partition(capfd):
+    """
+    A beam without free DOFs needs no factorization, and restraints changed in
+    place are partitioned again
+    """
+    for solver in ["dense", "banded"]:
+        beam_analysis = cba.BeamAnalysis([10.0], 1e4, [-1, -1, -1, -1], solver=solver)
+        beam_analysis.add_udl(1, 12.0)
+        assert beam_analysis.analyze() == 0
+        assert beam_analysis.beam_results.R == pytest.approx([60, 100, 60, -100])
+        assert capfd.readouterr().err == ""
+
+        beam_analysis = cba.BeamAnalysis(
+            [10.0, 10.0], 1e4, [-1, 0, -1, 0, -1, 0], solver=solver
+        )
+        beam_analysis.add_udl(1, 10.0)
+        beam_analysis.analyze()
+        assert len(beam_analysis.beam_results.R) == 3
+        beam_analysis.beam.restraints[5] = -1
+        beam_analysis.analyze()
+        assert beam_analysis.beam_results.R == pytest.approx(
+            [42.857143, 67.857143, -10.714286, 35.714286]
+        )
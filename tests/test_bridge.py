@@ -1,10 +1,28 @@
 # -*- coding: utf-8 -*-
 
+import tracemalloc
 import pytest
 import numpy as np
 import pycba as cba
 
 
+def make_bridge(static_loads: bool = True, **kwargs) -> cba.BridgeAnalysis:
+    """
+    The three-span bridge, with a spring support and a hinge, and the vehicle
+    of the traverse tests
+    """
+    L = [20, 30, 25]
+    EI = 30 * 1e11 * np.ones(len(L)) * 1e-6
+    R = [-1, -1, -1, 0, 500.0, 0, -1, 0]
+    LM = [[1, 1, 10, 0, 0], [2, 2, 50, 3, 0]] if static_loads else None
+    bridge = cba.BeamAnalysis(L, EI, R, LM, eletype=[1, 2, 1])
+    vehicle = cba.Vehicle(
+        axle_spacings=np.array([3.17, 1.2, 7.77]),
+        axle_weights=np.array([100, 120, 120, 90]),
+    )
+    return cba.BridgeAnalysis(bridge, vehicle, **kwargs)
+
+
 def test_maxvals():
     """
     Single span bridge with M1600 load
@@ -100,3 +118,470 @@ def test_make_train():
         [708.09969787, 1606.84763766, 694.89625861], abs=1e-6
     )
     assert envenv.Rminval == pytest.approx([-41.9197831, 0.0, -47.23971016], abs=1e-6)
+
+
+def test_run_vehicle_influence():
+    """
+    The influence line and fft methods give the same envelopes as the static
+    method, including with static loads
+    """
+    envs = []
+    cvals = []
+    for method in ["static", "influence", "fft"]:
+        bridge_analysis = make_bridge()
+        envs.append(bridge_analysis.run_vehicle(0.25, method=method))
+        cvals.append(bridge_analysis.critical_values(envs[-1]))
+
+    # The FFTs round to within a small part of the greatest effects
+    tols = [1e-9, 1e-6]
+    env_s = envs[0]
+    for env_i, cvals_i, tol in zip(envs[1:], cvals[1:], tols):
+        assert env_i.vResults == []
+        for attr in ["Mmax", "Mmin", "Vmax", "Vmin", "Rmax", "Rmin"]:
+            assert getattr(env_i, attr) == pytest.approx(getattr(env_s, attr), abs=tol)
+        for key in ["Mmax", "Mmin", "Vmax", "Vmin", "Rmax0", "Rmin2"]:
+            assert cvals_i[key]["val"] == pytest.approx(cvals[0][key]["val"])
+            assert cvals_i[key]["pos"] == pytest.approx(cvals[0][key]["pos"])
+
+    # Axles on the points of the results, where the shears step, at whole
+    # steps apart, and a train of irregular axles
+    rng = np.random.default_rng(1)
+    for axs, axw in [
+        ([1.5, 2.25, 4.0], [80, 120, 120, 60]),
+        (rng.uniform(0.7, 9.0, 11), rng.uniform(20, 120, 12)),
+    ]:
+        bridge_analysis.set_vehicle(cba.Vehicle(axs, axw))
+        env_s = bridge_analysis.run_vehicle(0.25)
+        for method, tol in zip(["influence", "fft"], tols):
+            env_i = bridge_analysis.run_vehicle(0.25, method=method)
+            assert bridge_analysis.pos == pytest.approx(0.25 * np.arange(env_i.nres))
+            for attr in ["Mmax", "Mmin", "Vmax", "Vmin", "Rmax", "Rmin"]:
+                assert getattr(env_i, attr) == pytest.approx(
+                    getattr(env_s, attr), abs=tol
+                )
+
+    with pytest.raises(ValueError):
+        bridge_analysis.run_vehicle(0.25, method="fast")
+    with pytest.raises(ValueError):
+        bridge_analysis.run_vehicle(0.25, method="fft", plot_all=True)
+
+
+def test_run_vehicle_streaming():
+    """
+    Streaming envelopes match those from the stored results, without them
+    """
+    envs = []
+    cvals = []
+    for keep in [True, False]:
+        bridge_analysis = make_bridge()
+        envs.append(bridge_analysis.run_vehicle(0.25, keep_results=keep))
+        cvals.append(bridge_analysis.critical_values(envs[-1]))
+
+    (env_k, env_s) = envs
+    assert env_s.vResults == [] and bridge_analysis.vResults == []
+    assert env_s.Rmax.shape == (env_s.nsup, 0)
+    assert env_s.nres == len(bridge_analysis.pos)
+    for attr in ["Mmax", "Mmin", "Vmax", "Vmin", "Rmaxval", "Rminval"]:
+        assert getattr(env_s, attr) == pytest.approx(getattr(env_k, attr))
+    for key in ["Mmax", "Mmin", "Vmax", "Vmin", "Rmax0", "Rmin2"]:
+        assert cvals[1][key]["val"] == pytest.approx(cvals[0][key]["val"])
+        assert cvals[1][key]["pos"] == pytest.approx(cvals[0][key]["pos"])
+
+    with pytest.raises(ValueError):
+        env_k.update(bridge_analysis.ba.beam_results)
+
+
+def test_iter_run():
+    """
+    The results yielded for each position, singly or in blocks, match those of
+    the static analyses
+    """
+    bridge_analysis = make_bridge()
+    bridge_analysis.run_vehicle(0.5)
+    vResults = bridge_analysis.vResults
+
+    buffers = set()
+    for i, (pos, res) in enumerate(bridge_analysis.iter_run(0.5)):
+        assert pos == pytest.approx(bridge_analysis.pos[i])
+        assert res.results.M == pytest.approx(vResults[i].results.M, abs=1e-9)
+        assert res.results.D == pytest.approx(vResults[i].results.D, abs=1e-12)
+        assert res.R == pytest.approx(vResults[i].R, abs=1e-9)
+        assert res.D == pytest.approx(vResults[i].D, abs=1e-12)
+        buffers.add(res.results.V.__array_interface__["data"][0])
+    assert i == len(vResults) - 1
+    assert len(buffers) == 1
+
+    npos = 0
+    for pos, res in bridge_analysis.iter_run(0.5, chunk=64):
+        assert res.results.V.shape == (len(pos), len(vResults[0].results.x))
+        for j in range(len(pos)):
+            V = vResults[npos + j].results.V
+            assert res.results.V[j] == pytest.approx(V, abs=1e-9)
+        npos += len(pos)
+    assert npos == len(vResults)
+
+    # Each block is written into the one buffer, without allocating the results
+    # or their parts again
+    it = bridge_analysis.iter_run(0.1, chunk=16)
+    (pos, res) = next(it)
+    M = res.results.M
+    nbytes = sum(getattr(res.results, k).nbytes for k in "MVRD")
+    tracemalloc.start()
+    for pos, res in it:
+        assert np.shares_memory(res.results.M, M)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert peak < nbytes
+
+    with pytest.raises(ValueError):
+        next(bridge_analysis.iter_run(0.5, chunk=0))
+
+
+@pytest.mark.parametrize("keep_results", [True, False])
+def test_run_vehicle_workers(keep_results):
+    """
+    The envelopes of a traverse shared over processes are exactly the serial ones
+    """
+    envs = []
+    cvals = []
+    for workers in [None, 2]:
+        bridge_analysis = make_bridge()
+        envs.append(
+            bridge_analysis.run_vehicle(
+                0.25, keep_results=keep_results, workers=workers, chunksize=37
+            )
+        )
+        cvals.append(bridge_analysis.critical_values(envs[-1]))
+
+    (env_s, env_p) = envs
+    assert env_p.nres == env_s.nres
+    for attr in ["Mmax", "Mmin", "Vmax", "Vmin", "Rmax", "Rmin", "Rmaxval"]:
+        assert np.array_equal(getattr(env_p, attr), getattr(env_s, attr))
+    for key in env_s.idx:
+        assert np.array_equal(env_p.idx[key], env_s.idx[key])
+    assert cvals[1] == cvals[0]
+
+    with pytest.raises(ValueError):
+        bridge_analysis.run_vehicle(0.25, workers=2, chunksize=0)
+
+
+def test_envelope_indices():
+    """
+    Each method gives the same positions of the extremes at every point
+    """
+    bridge_analysis = make_bridge(static_loads=False)
+    env = bridge_analysis.run_vehicle(0.25)
+
+    # The index of each point is of the first result giving the envelope
+    M = np.array([res.results.M for res in env.vResults])
+    for key, vals in [("Mmax", env.Mmax), ("Mmin", env.Mmin)]:
+        idx = env.idx[key]
+        on = idx >= 0
+        assert np.array_equal(M[idx[on], on], vals[on])
+        assert np.all(vals[~on] == 0)
+        for j in np.nonzero(on)[0][::50]:
+            assert np.all(M[: idx[j], j] != vals[j])
+
+    # The first position is looked up, and every near-tie is found on request,
+    # as it is for envelopes without indices
+    cvals = bridge_analysis.critical_values(env)
+    i = env.idx["Mmax"][env.Mmax.argmax()]
+    assert cvals["Mmax"]["pos"] == [bridge_analysis.pos[i]]
+    ties = bridge_analysis.critical_values(env, ties=True)
+    ext = M.max(axis=1)
+    assert ties["Mmax"]["pos"] == [
+        bridge_analysis.pos[i] for i in np.nonzero(np.isclose(ext, ext.max()))[0]
+    ]
+    assert ties["Mmax"]["pos"][0] == cvals["Mmax"]["pos"][0]
+    env_a = env.zero_like(env)
+    env_a.augment(env)
+    assert env_a.idx is None
+    assert bridge_analysis.critical_values(env_a) == ties
+
+    # Near-ties may resolve differently, but must give the same extremes
+    V = np.array([res.results.V for res in env.vResults])
+    env_i = bridge_analysis.run_vehicle(0.25, method="influence")
+    for key, vals in [("Mmax", M), ("Mmin", M), ("Vmax", V), ("Vmin", V)]:
+        idx = env_i.idx[key]
+        on = idx >= 0
+        ext = getattr(env, key)[on]
+        assert vals[idx[on], on] == pytest.approx(ext, abs=1e-9)
+
+    env_s = bridge_analysis.run_vehicle(0.25, keep_results=False)
+    for key in env.idx:
+        assert np.array_equal(env_s.idx[key], env.idx[key])
+
+    with pytest.raises(ValueError):
+        bridge_analysis.run_vehicle(0.5)
+        bridge_analysis.critical_values(env)
+
+
+def test_vehicle_fleet():
+    """
+    The padded fleet arrays round trip the vehicles, and invalid padding fails
+    """
+    vehicles = [
+        cba.Vehicle(axle_spacings=np.array([3.0]), axle_weights=np.array([50, 80])),
+        cba.VehicleLibrary.get_example_permit(),
+        cba.VehicleLibrary.get_abag_semitrailer(1).reverse(in_place=False),
+    ]
+    vehicles[1].reverse()
+    fleet = cba.VehicleFleet.from_vehicles(vehicles)
+    assert len(fleet) == 3
+    assert fleet.axw.shape == (3, 10)
+    assert fleet.NoAxles.tolist() == [2, 10, 6]
+    for i, veh in enumerate(vehicles):
+        veh_i = fleet.get_vehicle(i)
+        assert veh_i.axle_coords == pytest.approx(veh.axle_coords)
+        assert veh_i.axw == pytest.approx(veh.axw)
+        assert fleet.L[i] == pytest.approx(veh.L)
+
+    with pytest.raises(ValueError):
+        cba.VehicleFleet([[3.0, 1.0]], [[50, 80, 0]], n_axles=[2])
+    with pytest.raises(ValueError):
+        cba.VehicleFleet([[3.0]], [[50, 80]], n_axles=[3])
+
+
+def test_run_fleet():
+    """
+    The envelopes and critical values of each vehicle of a fleet are those of
+    running each vehicle alone
+    """
+    vehicles = [
+        cba.Vehicle(
+            axle_spacings=np.array([3.17, 1.2, 7.77]),
+            axle_weights=np.array([100, 120, 120, 90]),
+        ),
+        cba.Vehicle(axle_spacings=np.array([4.3]), axle_weights=np.array([60, 90])),
+        cba.VehicleLibrary.get_example_permit(),
+    ]
+    vehicles[2].reverse()
+    fleet = cba.VehicleFleet.from_vehicles(vehicles)
+
+    bridge_analysis = make_bridge()
+    fleet_env = bridge_analysis.run_fleet(fleet, 0.25, chunk=2)
+    fleet_cvals = fleet_env.critical_values()
+    assert fleet_env.Mmax.shape == (3, fleet_env.npts)
+
+    for i, veh in enumerate(vehicles):
+        bridge_analysis.set_vehicle(veh)
+        env = bridge_analysis.run_vehicle(0.25)
+        cvals = bridge_analysis.critical_values(env)
+        env_i = fleet_env.get_envelopes(i)
+        for attr in ["Mmax", "Mmin", "Vmax", "Vmin", "Rmaxval", "Rminval"]:
+            assert getattr(env_i, attr) == pytest.approx(getattr(env, attr), abs=1e-9)
+        for key in ["Mmax", "Mmin", "Vmax", "Vmin", "Rmax0", "Rmin2"]:
+            assert fleet_cvals[key]["val"][i] == pytest.approx(cvals[key]["val"])
+            # One of the positions giving the extreme, to within tolerance
+            pos = np.atleast_1d(cvals[key]["pos"])
+            assert np.isclose(pos, fleet_cvals[key]["pos"][i]).any()
+
+
+def test_wim(tmp_path):
+    """
+    WIM records are read in chunks, saved to and reloaded from a fleet file,
+    and run over a bridge with the critical values written as they are found
+    """
+    lines = [
+        "timestamp,n_axles,spacings,weights",
+        "2024-03-01T08:00:00.250,2,4.3,60,90",
+        "2024-03-01T08:00:01,4,3.17,1.2,7.77,100,120,120,90",
+        "",
+        "2024-03-01T08:00:02,3,3.6,1.2,50,80,80",
+    ]
+    csv = tmp_path / "wim.csv"
+    csv.write_text("\n".join(lines) + "\n")
+
+    chunks = list(cba.read_wim_csv(str(csv), chunk_size=2))
+    assert [len(fleet) for _, fleet in chunks] == [2, 1]
+    (timestamps, fleet) = chunks[0]
+    assert str(timestamps[0]) == "2024-03-01T08:00:00.250"
+    assert fleet.NoAxles.tolist() == [2, 4]
+    assert fleet.axs[1] == pytest.approx([3.17, 1.2, 7.77])
+    assert fleet.axw[0] == pytest.approx([60, 90, 0, 0])
+
+    # A chunk of only blank lines gives no vehicles
+    blank = tmp_path / "blank.csv"
+    blank.write_text("\n".join(lines[:3]) + "\n\n")
+    chunks = list(cba.read_wim_csv(str(blank), chunk_size=2))
+    assert [len(fleet) for _, fleet in chunks] == [2]
+
+    npy = tmp_path / "wim.npy"
+    count = cba.save_fleet(str(npy), cba.read_wim_csv(str(csv), chunk_size=2), 5)
+    assert count == 3
+    rec = cba.open_fleet(str(npy))
+    assert len(rec) == 3 and rec["axw"].shape == (3, 5)
+    (timestamps, fleet) = next(cba.load_fleet(str(npy)))
+    assert fleet.NoAxles.tolist() == [2, 4, 3]
+    assert fleet.axs[2] == pytest.approx([3.6, 1.2, 0, 0])
+
+    bridge_analysis = make_bridge(static_loads=False)
+    out = tmp_path / "crit.csv"
+    assert cba.run_wim(bridge_analysis, cba.load_fleet(str(npy), 2), 0.5, str(out)) == 3
+    out_lines = out.read_text().splitlines()
+    assert len(out_lines) == 4
+    assert out_lines[0].startswith("timestamp,Mmax_val,Mmax_at,Mmax_pos")
+    cvals = bridge_analysis.run_fleet(fleet, 0.5).critical_values()
+    row = out_lines[2].split(",")
+    assert row[0] == "2024-03-01T08:00:01.000"
+    assert float(row[1]) == pytest.approx(cvals["Mmax"]["val"][1])
+
+    bad = tmp_path / "bad.csv"
+    bad.write_text("\n".join(lines[:2] + ["2024-03-01T08:00:03,3,3.6,50,80,80"]))
+    with pytest.raises(ValueError, match=r"lines \[3\]"):
+        list(cba.read_wim_csv(str(bad)))
+
+
+def test_run_vehicle_cache():
+    """
+    Repeated crossings, including of vehicles differing only by a weight
+    factor, are returned from the cache with the same envelopes
+    """
+    bridge_analysis = make_bridge(static_loads=False, cache_size=2)
+    axs = np.array([3.17, 1.2, 7.77])
+    axw = np.array([100, 120, 120, 90])
+
+    bridge_analysis.set_vehicle(cba.Vehicle(axs, axw))
+    env = bridge_analysis.run_vehicle(0.25, keep_results=False)
+    cvals = bridge_analysis.critical_values(env)
+    env.augment(env.scaled(2.0))  # must not change the cached envelopes
+    bridge_analysis.set_vehicle(cba.Vehicle(axs, 1.5 * axw))
+    env_hit = bridge_analysis.run_vehicle(0.25, keep_results=False)
+    assert (bridge_analysis.cache_hits, bridge_analysis.cache_misses) == (1, 1)
+    env_new = bridge_analysis.run_vehicle(0.25, method="influence")
+    assert env_hit.Mmax == pytest.approx(env_new.Mmax, abs=1e-9)
+    cvals_hit = bridge_analysis.critical_values(env_hit)
+    assert cvals_hit["Mmax"]["val"] == pytest.approx(1.5 * cvals["Mmax"]["val"])
+    assert cvals_hit["Mmax"]["pos"] == cvals["Mmax"]["pos"]
+
+    # Kept results are not scaled, so the weights are part of the key
+    env = bridge_analysis.run_vehicle(0.25)
+    env_hit = bridge_analysis.run_vehicle(0.25)
+    assert len(env_hit.vResults) == len(bridge_analysis.pos) == env.nres
+    bridge_analysis.set_vehicle(cba.Vehicle(axs, axw))
+    bridge_analysis.run_vehicle(0.25)
+    assert (bridge_analysis.cache_hits, bridge_analysis.cache_misses) == (2, 4)
+    assert len(bridge_analysis._cache) == 2
+
+    bridge_analysis.clear_cache()
+    assert len(bridge_analysis._cache) == 0 and bridge_analysis.cache_hits == 0
+
+
+def test_critical_positions():
+    """
+    The exact critical vehicle positions give the effects of a static analysis
+    there, and bound a fine-step traverse, which refined coarse envelopes match
+    """
+    L = [20, 25]
+    EI = 30 * 1e11 * np.ones(len(L)) * 1e-6
+    R = [-1, 0, -1, 0, -1, 0]
+    bridge = cba.BeamAnalysis(L, EI, R)
+    bridge.add_udl(2, 10.0)
+    bridge_analysis = cba.BridgeAnalysis(bridge)
+    bridge_analysis.set_vehicle(cba.Vehicle([3.17, 1.2, 7.77], [100, 120, 120, 90]))
+    env = bridge_analysis.run_vehicle(0.01, method="influence")
+
+    for poi, load_effect, key in [
+        (8.0, "M", "max"),
+        (20.0, "M", "min"),
+        (31.0, "V", "max"),
+    ]:
+        crit = bridge_analysis.critical_positions(poi, load_effect)[key]
+        j = np.nonzero(np.isclose(env.x, poi))[0][-1]
+        fine = getattr(env, load_effect + key)[j]
+        sign = 1 if key == "max" else -1
+        assert -1e-9 <= sign * (crit["val"] - fine) <= 1.0
+        if load_effect == "M":
+            res = bridge_analysis.static_vehicle(crit["pos"])
+            assert res.results.M[j] == pytest.approx(crit["val"])
+
+    crit = bridge_analysis.critical_positions(20.0, "R")["max"]
+    assert 0 <= crit["val"] - env.Rmaxval[1] <= 1e-3
+    res = bridge_analysis.static_vehicle(crit["pos"])
+    assert res.R[1] == pytest.approx(crit["val"])
+    with pytest.raises(ValueError):
+        bridge_analysis.critical_positions(10.0, "X")
+
+    coarse = bridge_analysis.run_vehicle(1.0, method="influence")
+    refined = bridge_analysis.refine_envelopes(coarse)
+    assert np.all(refined.Mmax >= coarse.Mmax) and refined.idx is None
+    assert refined.Mmax == pytest.approx(env.Mmax, abs=1.0)
+    assert refined.Mmin == pytest.approx(env.Mmin, abs=1.0)
+    assert refined.Rmaxval == pytest.approx(env.Rmaxval, abs=1e-3)
+
+
+def test_run_vehicle_adaptive():
+    """
+    The adaptive traverse finds the envelopes to within its tolerance, whether
+    or not the results are kept, with fewer analyses than a uniform traverse of
+    the same accuracy, and without holding the results of every position
+    """
+    L = [20, 30, 25]
+    EI = 30 * 1e11 * np.ones(len(L)) * 1e-6
+    R = [-1, 0, -1, 0, -1, 0, -1, 0]
+    bridge = cba.BeamAnalysis(L, EI, R)
+    bridge_analysis = cba.BridgeAnalysis(bridge)
+    bridge_analysis.set_vehicle(cba.Vehicle([3.17, 1.2, 7.77], [100, 120, 120, 90]))
+    fine = bridge_analysis.run_vehicle(0.001, method="influence")
+
+    def error(env):
+        # The greatest error of each effect, relative to its greatest magnitude
+        err = 0.0
+        for attrs in [("Mmax", "Mmin"), ("Vmax", "Vmin"), ("Rmaxval", "Rminval")]:
+            refs = [getattr(fine, attr) for attr in attrs]
+            scale = max(np.abs(ref).max() for ref in refs)
+            for attr, ref in zip(attrs, refs):
+                err = max(err, np.abs(getattr(env, attr) - ref).max() / scale)
+        return err
+
+    # The number of analyses of the coarsest uniform traverse as accurate
+    uniform = []
+    for step in np.geomspace(0.5, 0.005, 41):
+        env = bridge_analysis.run_vehicle(step, method="influence")
+        uniform.append((error(env), len(bridge_analysis.pos)))
+
+    def nuniform(err):
+        return min(n for e, n in uniform if e <= err)
+
+    envs = []
+    for keep in [True, False]:
+        envs.append(
+            bridge_analysis.run_vehicle(
+                2.0, method="adaptive", tol=1e-3, keep_results=keep
+            )
+        )
+        pos = bridge_analysis.pos
+        assert envs[-1].nres == len(pos)
+        assert np.all(np.diff(pos) > 0) and pos[-1] >= sum(L) + 12.14
+        assert len(bridge_analysis.vResults) == (len(pos) if keep else 0)
+    nadapt = len(pos)
+
+    (env_k, env_s) = envs
+    for attr in ["Mmax", "Mmin", "Vmax", "Vmin", "Rmaxval", "Rminval"]:
+        assert getattr(env_s, attr) == pytest.approx(getattr(env_k, attr))
+    assert bridge_analysis.critical_values(env_s)["Mmax"]["pos"] == (
+        bridge_analysis.critical_values(env_k)["Mmax"]["pos"]
+    )
+    err = error(env_s)
+    assert err <= 1e-3
+    assert nadapt < nuniform(err) / 2
+
+    # A coarser tolerance is met as it is, still with fewer analyses, and with
+    # much less memory if the results are not kept
+    peaks = []
+    for keep in [True, False]:
+        tracemalloc.start()
+        env = bridge_analysis.run_vehicle(
+            2.0, method="adaptive", tol=1e-2, keep_results=keep
+        )
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    err = error(env)
+    assert err <= 1e-2
+    assert len(bridge_analysis.pos) < nuniform(err)
+    assert peaks[1] < peaks[0] / 2
+
+    with pytest.raises(ValueError):
+        bridge_analysis.run_vehicle(2.0, method="adaptive", tol=0.0)
+    with pytest.raises(ValueError):
+        bridge_analysis.run_vehicle(2.0, method="adaptive", plot_all=True)
@@ -1,8 +1,10 @@
 # -*- coding: utf-8 -*-
 
+import os
 import pytest
 import numpy as np
 import pycba as cba
+from scipy.integrate import trapezoid
 
 
 def test_basic_il():
@@ -189,3 +191,151 @@ def test_discretization():
     ils.create_ils(step=0.1)
     (x, y) = ils.get_il(7.0, "M")
     assert np.linalg.norm(y) >= 5.7
+
+
+def test_il_matrix():
+    """
+    The influence matrix rows are the results of the load at each position
+    """
+    L = [5, 5, 10]
+    EI = 30 * 600e7 * np.ones(len(L)) * 1e-6
+    eType = [2, 1, 1]
+    R = [-1, -1, 0, 0, -1, 0, -1, 0]
+
+    ils = cba.InfluenceLines(L, EI, R, eType)
+    ils.create_ils(step=0.5)
+    pos, x, eta = ils.get_il_matrix("M")
+    assert eta.shape == (len(pos), len(x))
+
+    ba = cba.BeamAnalysis(L, EI, R, eletype=eType)
+    for i in [3, 12, 27]:
+        ispan, a = ba.beam.get_local_span_coords(pos[i])
+        ba.set_loads([[ispan + 1, 2, 1.0, a, 0]])
+        ba.analyze()
+        assert eta[i] == pytest.approx(ba.beam_results.results.M)
+        assert ils.get_il_matrix("D")[2][i] == pytest.approx(ba.beam_results.results.D)
+        assert ils.get_il_matrix("R")[2][i] == pytest.approx(ba.beam_results.R)
+
+    (xp, y) = ils.get_il(12.5, "M")
+    idx = np.where(np.isclose(x, 12.5))[0][0]
+    assert y == pytest.approx(eta[:, idx])
+    assert isinstance(xp, np.ndarray) and isinstance(pos, np.ndarray)
+
+    # Every point of the grid is found directly, as the first of any duplicates
+    dx = x[2] - x[1]
+    for poi in x:
+        idx = np.where(np.abs(x - poi) <= dx * 1e-6)[0][0]
+        assert ils._point_index(poi) == idx
+    with pytest.raises(ValueError):
+        ils.get_il(12.55, "M")
+
+    # The results of each position are still available as a list
+    assert isinstance(ils.pos, list) and len(ils.vResults) == len(pos)
+    res = ils.vResults[12]
+    assert res.results.M == pytest.approx(eta[12])
+    assert res.R == pytest.approx(ils.get_il_matrix("R")[2][12])
+    assert ils.vResults is ils.vResults
+
+
+@pytest.mark.parametrize(
+    "L, eType, R",
+    [
+        ([5, 5, 10], [2, 1, 1], [-1, -1, 0, 0, -1, 0, -1, 0]),
+        ([10, 10, 10], [1, 2, 1], [-1, -1, -1, 0, 500.0, 0, -1, -1]),
+    ],
+)
+def test_il_muller_breslau(L, eType, R):
+    """
+    The single-solve ILs match those from the matrix of load positions
+    """
+    ils = cba.InfluenceLines(L, 30e4, R, eType)
+    ils.create_ils(step=0.5)
+    x = ils.il_results.results.x
+    pois = [x[i] for i in (11, 50, 160, 222, 280)]  # off the nodes
+
+    for poi in pois:
+        for load_effect in ["M", "V", "R", "MR"]:
+            (pos, y) = ils.get_il(poi, load_effect)
+            (pos_mb, y_mb) = ils.get_il(poi, load_effect, method="muller-breslau")
+            assert y_mb == pytest.approx(y, abs=1e-9)
+
+    # Any poi on the beam
+    (pos, y) = ils.get_il_mb(4.321, "M", pos=[0.0, 2.0, 4.321, 4.5])
+    assert len(y) == 4
+    with pytest.raises(ValueError):
+        ils.get_il_mb(sum(L) + 1.0, "V")
+
+
+def test_il_function():
+    """
+    The piecewise-cubic influence line is exact
+    """
+    L = [5, 5, 10]
+    EI = 30 * 600e7 * np.ones(len(L)) * 1e-6
+    eType = [2, 1, 1]
+    R = [-1, -1, 0, 0, -1, 0, -1, 0]
+    ils = cba.InfluenceLines(L, EI, R, eType)
+
+    x = np.linspace(0, 20, 20001)
+    for poi, load_effect in [(3.3, "M"), (12.7, "V"), (0.0, "MR")]:
+        f = ils.get_il_function(poi, load_effect)
+        (pos, y) = ils.get_il_mb(poi, load_effect, pos=x)
+        assert f(x) == pytest.approx(y, abs=1e-12)
+        assert f.integrate() == pytest.approx(trapezoid(y, x), abs=1e-3)
+        (apos, aneg) = f.areas()
+        assert apos + aneg == pytest.approx(f.integrate())
+        assert apos == pytest.approx(trapezoid(y.clip(0), x), abs=1e-3)
+
+    # Exact extrema, including at the step in a shear IL
+    f = ils.get_il_function(12.7, "V")
+    ((xmax, vmax), (xmin, vmin)) = f.extrema()
+    assert xmax == pytest.approx(12.7)
+    assert vmax - vmin == pytest.approx(1.0)
+    f = ils.get_il_function(3.3, "M")
+    ((xmax, mmax), (xmin, mmin)) = f.extrema()
+    (pos, y) = ils.get_il_mb(3.3, "M", pos=x)
+    assert xmax == pytest.approx(x[y.argmax()], abs=1e-3)
+    assert mmax == pytest.approx(y.max())
+    assert mmin == pytest.approx(-1.275)
+
+
+def test_il_cache(tmp_path):
+    """
+    Influence lines are stored in, and then opened from, the on-disk cache
+    """
+    L = [5, 5, 10]
+    EI = 30 * 600e7 * np.ones(len(L)) * 1e-6
+    eType = [2, 1, 1]
+    R = [-1, -1, 0, 0, -1, 0, -1, 0]
+    cache = cba.ILCache(tmp_path / "ils", max_entries=2)
+
+    ils = cba.InfluenceLines(L, EI, R, eType)
+    ils.create_ils(step=0.5, cache=cache)
+    assert (cache.hits, cache.misses) == (0, 1)
+    (x, y) = ils.get_il(15.0, "V")
+
+    ils2 = cba.InfluenceLines(L, EI, R, eType)
+    ils2.create_ils(step=0.5, cache=cache)
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert isinstance(ils2.il_results.results.M, np.memmap)
+    (x2, y2) = ils2.get_il(15.0, "V")
+    assert x2 == pytest.approx(x)
+    assert y2 == pytest.approx(y)
+    assert ils2.get_il(0, "R")[1] == pytest.approx(ils.get_il(0, "R")[1])
+
+    # An entry left partial is a miss, and is calculated and stored again
+    key = cache.key(ils.ba.beam, 0.5, ils.ba.npts, 1.0)
+    os.remove(os.path.join(cache.path, key, "pos.npy"))
+    ils2.create_ils(step=0.5, cache=cache)
+    assert (cache.hits, cache.misses) == (1, 2)
+    assert ils2.get_il(15.0, "V")[1] == pytest.approx(y)
+    assert cache.load(key) is not None
+
+    # A different discretization is a different entry; the oldest is evicted
+    ils.create_ils(step=0.25, cache=cache)
+    ils.create_ils(step=0.1, cache=cache)
+    assert len(cache._entries()) == 2
+    ils.create_ils(step=0.5, cache=cache)
+    assert cache.misses == 5
+    cache.clear()
+    assert cache.nbytes == 0